@@ -0,0 +1,205 @@
+"""Chunked, concurrent execution of Dataverse bulk operations."""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Collection, Sequence, TypeVar
+
+from .logconfig import HOT
+from .metrics import CHUNK_DURATION, CHUNK_RECORDS, CHUNKS, RECORDS, RECORDS_PER_SECOND
+
+logger = logging.getLogger("dataverse_mcp_server.batching")
+
+T = TypeVar("T")
+
+
+def chunked(items: Sequence[T], size: int) -> list[Sequence[T]]:
+    """Split ``items`` into consecutive slices of at most ``size`` elements."""
+    if size < 1:
+        raise ValueError("chunk size must be at least 1")
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+@dataclass
+class ChunkResult:
+    index: int
+    offset: int
+    size: int
+    succeeded: bool
+    result: Any = None
+    error: str | None = None
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        summary: dict[str, Any] = {
+            "index": self.index,
+            "offset": self.offset,
+            "size": self.size,
+            "status": "succeeded" if self.succeeded else "failed",
+            "elapsed_ms": round(self.elapsed_ms, 1),
+        }
+        if self.error:
+            summary["error"] = self.error
+        return summary
+
+
+@dataclass
+class BatchResult:
+    operation: str
+    total: int
+    chunk_size: int
+    chunks: list[ChunkResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(chunk.size for chunk in self.chunks if chunk.succeeded)
+
+    @property
+    def failed(self) -> int:
+        return sum(chunk.size for chunk in self.chunks if not chunk.succeeded)
+
+    def results(self) -> list[Any]:
+        """Return the handler results of successful chunks in input order."""
+        return [chunk.result for chunk in self.chunks if chunk.succeeded]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "operation": self.operation,
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "chunk_size": self.chunk_size,
+            "chunks": [chunk.to_dict() for chunk in self.chunks],
+        }
+
+
+def _run_chunk(
+    operation: str,
+    index: int,
+    offset: int,
+    chunk: Sequence[T],
+    handler: Callable[[Sequence[T]], Any],
+    on_chunk: Callable[[ChunkResult], None] | None,
+    cancel: threading.Event | None,
+) -> ChunkResult | None:
+    if cancel is not None and cancel.is_set():
+        return None
+    started = time.perf_counter()
+    try:
+        result = handler(chunk)
+    except Exception as exc:  # a failed chunk must not abort its siblings
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.warning(
+            "%s chunk %d failed offset=%d size=%d error=%s",
+            operation,
+            index,
+            offset,
+            len(chunk),
+            exc,
+            extra=HOT,
+        )
+        chunk_result = ChunkResult(
+            index=index,
+            offset=offset,
+            size=len(chunk),
+            succeeded=False,
+            error=f"{type(exc).__name__}: {exc}",
+            elapsed_ms=elapsed_ms,
+        )
+    else:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.debug(
+            "%s chunk %d succeeded size=%d elapsed_ms=%.1f", operation, index, len(chunk), elapsed_ms, extra=HOT
+        )
+        chunk_result = ChunkResult(
+            index=index,
+            offset=offset,
+            size=len(chunk),
+            succeeded=True,
+            result=result,
+            elapsed_ms=elapsed_ms,
+        )
+    outcome = "success" if chunk_result.succeeded else "failure"
+    CHUNKS.inc(operation=operation, outcome=outcome)
+    CHUNK_RECORDS.observe(len(chunk), operation=operation)
+    CHUNK_DURATION.observe(elapsed_ms / 1000, operation=operation)
+    RECORDS.inc(len(chunk), operation=operation, outcome=outcome)
+    if on_chunk is not None:
+        on_chunk(chunk_result)
+    return chunk_result
+
+
+def run_batches(
+    operation: str,
+    items: Sequence[T],
+    handler: Callable[[Sequence[T]], Any],
+    chunk_size: int,
+    max_workers: int,
+    skip: Collection[int] = (),
+    on_chunk: Callable[[ChunkResult], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> BatchResult:
+    """Run ``handler`` over ``items`` in chunks using a bounded worker pool.
+
+    Each chunk succeeds or fails independently; failures are captured on the
+    returned :class:`BatchResult` instead of being raised. Chunk indexes in
+    ``skip`` are not sent, ``on_chunk`` is called as each chunk finishes, and
+    chunks that have not started when ``cancel`` is set are dropped.
+    """
+    chunks = [
+        (index, chunk)
+        for index, chunk in enumerate(chunked(items, chunk_size))
+        if index not in skip
+    ]
+    batch = BatchResult(operation=operation, total=len(items), chunk_size=chunk_size)
+    if not chunks:
+        return batch
+
+    workers = max(1, min(max_workers, len(chunks)))
+    logger.info(
+        "%s dispatching records=%d chunks=%d chunk_size=%d workers=%d skipped=%d",
+        operation,
+        len(items),
+        len(chunks),
+        chunk_size,
+        workers,
+        len(skip),
+    )
+
+    started = time.perf_counter()
+    if workers == 1:
+        results = [
+            _run_chunk(operation, index, index * chunk_size, chunk, handler, on_chunk, cancel)
+            for index, chunk in chunks
+        ]
+    else:
+        results = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"dv-{operation}") as pool:
+            # Each chunk runs in a copy of the caller's context so its log lines keep the request/job IDs.
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    _run_chunk,
+                    operation,
+                    index,
+                    index * chunk_size,
+                    chunk,
+                    handler,
+                    on_chunk,
+                    cancel,
+                )
+                for index, chunk in chunks
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+    batch.chunks = sorted((chunk for chunk in results if chunk is not None), key=lambda chunk: chunk.index)
+    elapsed = time.perf_counter() - started
+    if elapsed > 0:
+        RECORDS_PER_SECOND.set(batch.succeeded / elapsed, operation=operation)
+    return batch
@@ -0,0 +1 @@
+"""Offline benchmarks for the bulk tools against a local fake Dataverse Web API."""
@@ -0,0 +1,133 @@
+"""Command-line entry point: ``python -m dataverse_mcp_server.benchmark``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import replace
+from itertools import product
+from pathlib import Path
+
+from .fake_dataverse import FaultProfile
+from .harness import SCENARIOS, TOOLS, BenchmarkConfig, compare, run_config
+
+
+def _ints(value: str) -> list[int]:
+    try:
+        numbers = [int(item) for item in value.split(",") if item.strip()]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got '{value}'") from exc
+    if not numbers or any(number < 1 for number in numbers):
+        raise argparse.ArgumentTypeError("values must be positive integers")
+    return numbers
+
+
+def _tools(value: str) -> list[str]:
+    tools = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = sorted(set(tools) - set(TOOLS))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown tools {', '.join(unknown)}; choose from {', '.join(TOOLS)}")
+    return tools
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m dataverse_mcp_server.benchmark",
+        description="Benchmark the bulk MCP tools against a local fake Dataverse Web API.",
+    )
+    parser.add_argument("--tools", type=_tools, default=list(TOOLS), help="comma-separated tools to benchmark")
+    parser.add_argument("--records", type=_ints, default=[1000], help="records per tool call")
+    parser.add_argument("--chunk-sizes", type=_ints, default=[100, 500], help="chunk sizes to compare")
+    parser.add_argument("--workers", type=_ints, default=[4], help="max_workers values to compare")
+    parser.add_argument("--concurrency", type=_ints, default=[1], help="simultaneous tool calls per iteration")
+    parser.add_argument("--iterations", type=int, default=3, help="timed rounds per configuration")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="base latency of every fake API request")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="uniform jitter added to the base latency")
+    parser.add_argument("--per-record-ms", type=float, default=0.05, help="extra latency per record in bulk actions")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on injected 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for jitter and fault injection")
+    parser.add_argument(
+        "--no-scenarios",
+        action="store_true",
+        help=f"skip the extra fault scenarios ({', '.join(SCENARIOS)}) added to the matrix",
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="earlier --output file to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="fractional throughput drop or p95 rise versus --baseline that fails the run",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    for noisy in ("httpx", "mcp.client"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+    profile = FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        per_record_ms=args.per_record_ms,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    runs = [
+        (BenchmarkConfig(tool, records, chunk_size, workers, concurrency, args.iterations), profile)
+        for tool, records, chunk_size, workers, concurrency in product(
+            args.tools, args.records, args.chunk_sizes, args.workers, args.concurrency
+        )
+    ]
+    if not args.no_scenarios:
+        for scenario, (tool, overrides) in SCENARIOS.items():
+            if tool in args.tools:
+                config = BenchmarkConfig(
+                    tool, args.records[0], args.chunk_sizes[0], args.workers[0], 1, args.iterations, scenario
+                )
+                runs.append((config, replace(profile, **overrides)))
+    results = [run_config(config, run_profile).to_dict() for config, run_profile in runs]
+
+    print(f"{'configuration':<90} {'rec/s':>9} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'rss MB':>8}  status")
+    for entry in results:
+        latency = entry["latency_seconds"]
+        status = "ok" if entry["status"] == "ok" else f"FAILED ({entry['records_failed']} records)"
+        print(
+            f"{entry['name']:<90} {entry['records_per_second']:>9.1f} "
+            f"{latency['p50'] or 0:>8.3f} {latency['p95'] or 0:>8.3f} {latency['p99'] or 0:>8.3f} "
+            f"{entry['peak_rss_mb'] or 0:>8.1f}  {status}"
+        )
+    if args.output:
+        args.output.write_text(
+            json.dumps({"profile": vars(profile), "results": results}, indent=2),
+            encoding="utf-8",
+        )
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline.get("results", []), args.max_regression)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['name']} {regression['metric']}: "
+                f"baseline={regression['baseline']} current={regression['current']}",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    # Throttling must be retried away, so any failure counts unless errors were injected on purpose.
+    failed = [entry["name"] for entry in results if entry["status"] != "ok"]
+    if failed and not args.error_rate:
+        print(f"FAILED {len(failed)} configuration(s) had failed calls or records: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
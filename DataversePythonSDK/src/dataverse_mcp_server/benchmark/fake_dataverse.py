@@ -0,0 +1,256 @@
+"""A local stand-in for the Dataverse Web API with latency, throttling and error injection."""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+API_ROOT = "/api/data/v9.2"
+
+_ENTITY_RE = re.compile(r"^EntityDefinitions\(LogicalName='([^']+)'\)(/Attributes(?:/(.+))?)?$")
+_LOGICAL_NAME_RE = re.compile(r"LogicalName eq '([^']+)'")
+_RECORD_RE = re.compile(r"^(\w+)\(([0-9a-fA-F-]{36})\)$")
+_BOUND_ACTION_RE = re.compile(r"^(\w+)/Microsoft\.Dynamics\.CRM\.(CreateMultiple|UpdateMultiple|UpsertMultiple)$")
+
+
+@dataclass
+class FaultProfile:
+    """How the fake API misbehaves.
+
+    ``latency_ms`` is paid by every request and ``per_record_ms`` once per record
+    in bulk actions, so larger chunks take proportionally longer as they do against
+    a real org. ``throttle_rate`` and ``error_rate`` are per-request probabilities.
+    """
+
+    latency_ms: float = 20.0
+    jitter_ms: float = 5.0
+    per_record_ms: float = 0.05
+    throttle_rate: float = 0.0
+    retry_after_seconds: int = 1
+    error_rate: float = 0.0
+    seed: int | None = None
+
+
+@dataclass
+class FakeStats:
+    requests: dict[str, int] = field(default_factory=dict)
+    records: dict[str, int] = field(default_factory=dict)
+    throttled: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": dict(self.requests),
+            "records": dict(self.records),
+            "throttled": self.throttled,
+            "errors": self.errors,
+        }
+
+
+def _entity(logical_name: str) -> dict[str, Any]:
+    return {
+        "LogicalName": logical_name,
+        "EntitySetName": f"{logical_name}s",
+        "PrimaryIdAttribute": f"{logical_name}id",
+        "PrimaryNameAttribute": "name",
+    }
+
+
+def _attributes(logical_name: str) -> list[dict[str, Any]]:
+    def attribute(name: str, attribute_type: str, create: bool = True, update: bool = True) -> dict[str, Any]:
+        return {
+            "LogicalName": name,
+            "AttributeType": attribute_type,
+            "RequiredLevel": {"Value": "None"},
+            "IsValidForCreate": create,
+            "IsValidForUpdate": update,
+            "AttributeOf": None,
+        }
+
+    return [
+        attribute(f"{logical_name}id", "Uniqueidentifier", update=False),
+        attribute("name", "String"),
+        attribute("description", "Memo"),
+        attribute("amount", "Integer"),
+        attribute("price", "Money"),
+        attribute("active", "Boolean"),
+    ]
+
+
+class FakeDataverse:
+    """Serves the Web API routes the bulk tools use from an in-memory stub.
+
+    Every table exists and has ``name``, ``description``, ``amount``, ``price`` and
+    ``active`` columns; created rows are counted but not stored. Deleted record IDs
+    are remembered so a second delete of the same record returns 404.
+    """
+
+    def __init__(self, profile: FaultProfile | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.profile = profile or FaultProfile()
+        self.stats = FakeStats()
+        self._random = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._deleted: set[str] = set()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeDataverse":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-dataverse", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeDataverse":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _count(self, route: str, records: int = 0) -> None:
+        with self._lock:
+            self.stats.requests[route] = self.stats.requests.get(route, 0) + 1
+            if records:
+                self.stats.records[route] = self.stats.records.get(route, 0) + records
+
+    def _fault(self) -> tuple[int, dict[str, Any], dict[str, str]] | None:
+        with self._lock:
+            roll = self._random.random()
+            if roll < self.profile.throttle_rate:
+                self.stats.throttled += 1
+                return (
+                    429,
+                    {"error": {"code": "0x80072322", "message": "Number of requests exceeded the limit."}},
+                    {"Retry-After": str(self.profile.retry_after_seconds)},
+                )
+            if roll < self.profile.throttle_rate + self.profile.error_rate:
+                self.stats.errors += 1
+                return 500, {"error": {"code": "0x80040216", "message": "Injected failure."}}, {}
+        return None
+
+    def _delay(self, records: int) -> None:
+        profile = self.profile
+        with self._lock:
+            jitter = self._random.uniform(-profile.jitter_ms, profile.jitter_ms) if profile.jitter_ms else 0.0
+        delay_ms = max(0.0, profile.latency_ms + jitter) + profile.per_record_ms * records
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+    def handle(self, method: str, path: str, query: dict[str, str], body: Any) -> tuple[int, Any, dict[str, str]]:
+        """Route one request; returns ``(status, json body or None, extra headers)``."""
+        if not path.startswith(API_ROOT + "/"):
+            return 404, {"error": {"message": f"Unknown path {path}"}}, {}
+        resource = unquote(path[len(API_ROOT) + 1:])
+        records = len(body.get("Targets", [])) if isinstance(body, dict) else 0
+        self._delay(records)
+        fault = self._fault()
+        if fault is not None:
+            self._count("fault")
+            return fault
+
+        if method == "GET" and resource == "WhoAmI":
+            self._count("WhoAmI")
+            return 200, {"UserId": str(uuid.uuid4()), "BusinessUnitId": str(uuid.uuid4()), "OrganizationId": str(uuid.uuid4())}, {}
+        if method == "GET" and resource == "EntityDefinitions":
+            self._count("EntityDefinitions")
+            match = _LOGICAL_NAME_RE.search(query.get("$filter", ""))
+            return 200, {"value": [_entity(match.group(1))] if match else []}, {}
+        entity_match = _ENTITY_RE.match(resource)
+        if method == "GET" and entity_match:
+            logical_name, attributes_path, cast = entity_match.groups()
+            self._count("EntityDefinitions")
+            attributes = _attributes(logical_name)
+            if not attributes_path:
+                return 200, {**_entity(logical_name), "Attributes": attributes}, {}
+            if cast:
+                # MaxLength casts for String/Memo columns.
+                wanted = {"Microsoft.Dynamics.CRM.StringAttributeMetadata": "String"}.get(cast, "Memo")
+                return 200, {"value": [
+                    {"LogicalName": item["LogicalName"], "MaxLength": 4000}
+                    for item in attributes
+                    if item["AttributeType"] == wanted
+                ]}, {}
+            match = _LOGICAL_NAME_RE.search(query.get("$filter", ""))
+            selected = [item for item in attributes if match and item["LogicalName"] == match.group(1)]
+            return 200, {"value": selected}, {}
+        action_match = _BOUND_ACTION_RE.match(resource)
+        if method == "POST" and action_match:
+            action = action_match.group(2)
+            self._count(action, records)
+            if action == "UpdateMultiple":
+                return 204, None, {}
+            return 200, {"Ids": [str(uuid.uuid4()) for _ in range(records)]}, {}
+        if method == "POST" and resource == "BulkDelete":
+            self._count("BulkDelete")
+            return 200, {"JobId": str(uuid.uuid4())}, {}
+        record_match = _RECORD_RE.match(resource)
+        if record_match and method == "DELETE":
+            record_id = record_match.group(2).lower()
+            with self._lock:
+                already_deleted = record_id in self._deleted
+                self._deleted.add(record_id)
+            if already_deleted:
+                # Like a real org, deleting the same record twice fails.
+                self._count("DELETE missing")
+                return 404, {"error": {"code": "0x80040217", "message": f"Record {record_id} does not exist."}}, {}
+            self._count(method)
+            return 204, None, {}
+        if record_match and method == "PATCH":
+            self._count(method)
+            return 204, None, {}
+        if method == "POST" and "/" not in resource:
+            self._count("Create")
+            record_id = str(uuid.uuid4())
+            return 204, None, {"OData-EntityId": f"{self.url}{API_ROOT}/{resource}({record_id})"}
+        self._count("unhandled")
+        return 404, {"error": {"message": f"The fake API does not implement {method} {resource}"}}, {}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self) -> None:
+                parts = urlsplit(self.path)
+                query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = None
+                status, payload, headers = fake.handle(self.command, parts.path, query, body)
+                data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if data:
+                    self.send_header("Content-Type", "application/json; odata.metadata=minimal")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if data:
+                    self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,304 @@
+"""Drive the bulk tools over streamable-http against the fake API and summarise each run."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from .fake_dataverse import FakeDataverse, FaultProfile
+
+logger = logging.getLogger("dataverse_mcp_server.benchmark")
+
+TOOLS = ("create_multiple", "update_multiple", "delete_multiple")
+TABLE = "new_benchmark"
+
+# Extra runs added to the default matrix to exercise retry paths: name -> (tool, FaultProfile overrides).
+# Retry-After 0 keeps them fast; every record must still succeed.
+SCENARIOS: dict[str, tuple[str, dict[str, Any]]] = {
+    "throttled-delete": ("delete_multiple", {"throttle_rate": 0.05, "retry_after_seconds": 0}),
+}
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    tool: str
+    records: int
+    chunk_size: int
+    max_workers: int
+    concurrency: int = 1
+    iterations: int = 3
+    scenario: str | None = None
+
+    @property
+    def name(self) -> str:
+        name = (
+            f"{self.tool}/records={self.records}/chunk={self.chunk_size}"
+            f"/workers={self.max_workers}/concurrency={self.concurrency}"
+        )
+        return f"{name}/scenario={self.scenario}" if self.scenario else name
+
+
+@dataclass
+class BenchmarkResult:
+    config: BenchmarkConfig
+    calls: int = 0
+    failed_calls: int = 0
+    records_succeeded: int = 0
+    records_failed: int = 0
+    wall_seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    peak_rss_mb: float | None = None
+    fake_api: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> bool:
+        """True when any call or record failed; tool calls report per-record failures without erroring."""
+        return self.failed_calls > 0 or self.records_failed > 0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records_succeeded / self.wall_seconds if self.wall_seconds else 0.0
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        if len(self.latencies) == 1:
+            return self.latencies[0]
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[int(q) - 1]
+
+    def to_dict(self) -> dict[str, Any]:
+        def rounded(value: float | None) -> float | None:
+            return round(value, 4) if value is not None else None
+
+        return {
+            "name": self.config.name,
+            "config": asdict(self.config),
+            "status": "failed" if self.failed else "ok",
+            "calls": self.calls,
+            "failed_calls": self.failed_calls,
+            "records_succeeded": self.records_succeeded,
+            "records_failed": self.records_failed,
+            "wall_seconds": rounded(self.wall_seconds),
+            "records_per_second": round(self.records_per_second, 1),
+            "latency_seconds": {
+                "p50": rounded(self.percentile(50)),
+                "p95": rounded(self.percentile(95)),
+                "p99": rounded(self.percentile(99)),
+                "max": rounded(max(self.latencies) if self.latencies else None),
+            },
+            "peak_rss_mb": self.peak_rss_mb,
+            "fake_api": self.fake_api,
+        }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _peak_rss_mb(pid: int) -> float | None:
+    # VmHWM is the process's peak resident set size; only available on Linux.
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def _records(count: int) -> list[dict[str, Any]]:
+    return [
+        {"name": f"Benchmark {index}", "description": "x" * 64, "amount": index, "active": index % 2 == 0}
+        for index in range(count)
+    ]
+
+
+def _arguments(config: BenchmarkConfig) -> dict[str, Any]:
+    arguments: dict[str, Any] = {
+        "table": TABLE,
+        "chunk_size": config.chunk_size,
+        "max_workers": config.max_workers,
+    }
+    if config.tool == "create_multiple":
+        arguments["records"] = _records(config.records)
+    else:
+        arguments["record_ids"] = [str(uuid.uuid4()) for _ in range(config.records)]
+    if config.tool == "update_multiple":
+        arguments["data"] = {"amount": 1, "active": True}
+    if config.tool == "delete_multiple":
+        # Per-record deletes; BulkDelete only submits an async job, so it has no throughput to measure.
+        arguments["use_bulk_delete"] = False
+    return arguments
+
+
+def _warmup(config: BenchmarkConfig) -> dict[str, Any]:
+    if config.tool == "create_multiple":
+        return {"records": _records(1)}
+    return {"record_ids": [str(uuid.uuid4())]}
+
+
+def _payload(result: Any) -> dict[str, Any]:
+    if getattr(result, "structuredContent", None):
+        return dict(result.structuredContent)
+    for content in result.content:
+        text = getattr(content, "text", None)
+        if text:
+            try:
+                parsed = json.loads(text)
+            except ValueError:
+                return {"error": text}
+            return parsed if isinstance(parsed, dict) else {"result": parsed}
+    return {}
+
+
+class ServerProcess:
+    """The MCP server in a subprocess, pointed at the fake API with throwaway state directories."""
+
+    def __init__(self, dataverse_url: str, extra_env: dict[str, str] | None = None, startup_timeout: float = 30.0) -> None:
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._state = tempfile.TemporaryDirectory(prefix="dataverse-benchmark-")
+        state = Path(self._state.name)
+        self.env = {
+            **os.environ,
+            "DATAVERSE_URL": dataverse_url,
+            "FASTMCP_HOST": "127.0.0.1",
+            "FASTMCP_PORT": str(self.port),
+            "MCP_TRANSPORT": "streamable-http",
+            "DATAVERSE_JOB_DIR": str(state / "jobs"),
+            "DATAVERSE_IDEMPOTENCY_DB": str(state / "idempotency.sqlite3"),
+            "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+            **(extra_env or {}),
+        }
+        self.startup_timeout = startup_timeout
+        self.process: subprocess.Popen[bytes] | None = None
+
+    def __enter__(self) -> "ServerProcess":
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "dataverse_mcp_server.benchmark.serve"],
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self._state.cleanup()
+                raise RuntimeError(f"MCP server exited during startup with code {self.process.returncode}")
+            try:
+                with urllib.request.urlopen(f"{self.url}/health", timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"MCP server did not become healthy within {self.startup_timeout}s")
+
+    def peak_rss_mb(self) -> float | None:
+        return _peak_rss_mb(self.process.pid) if self.process else None
+
+    def __exit__(self, *exc: Any) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self._state.cleanup()
+
+
+async def _drive(mcp_url: str, config: BenchmarkConfig, result: BenchmarkResult) -> None:
+    async with streamablehttp_client(mcp_url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            # One untimed call warms metadata caches and the connection pool.
+            await session.call_tool(config.tool, {**_arguments(config), **_warmup(config)})
+            # Every call gets its own record IDs: deleting an ID twice fails, as it does against a real org.
+            # They are built up front so generating them is not timed.
+            calls = [[_arguments(config) for _ in range(config.concurrency)] for _ in range(config.iterations)]
+
+            async def call(arguments: dict[str, Any]) -> None:
+                started = time.perf_counter()
+                response = await session.call_tool(config.tool, arguments)
+                result.latencies.append(time.perf_counter() - started)
+                payload = _payload(response)
+                result.calls += 1
+                if response.isError or "succeeded" not in payload:
+                    result.failed_calls += 1
+                    result.records_failed += config.records
+                    logger.warning("Benchmark call failed config=%s payload=%s", config.name, str(payload)[:500])
+                    return
+                result.records_succeeded += int(payload.get("succeeded", 0))
+                result.records_failed += int(payload.get("failed", 0))
+
+            started = time.perf_counter()
+            for iteration in calls:
+                await asyncio.gather(*(call(arguments) for arguments in iteration))
+            result.wall_seconds = time.perf_counter() - started
+
+
+def run_config(
+    config: BenchmarkConfig,
+    profile: FaultProfile,
+    server_env: dict[str, str] | None = None,
+) -> BenchmarkResult:
+    """Benchmark one configuration against a fresh fake API and server process."""
+    result = BenchmarkResult(config=config)
+    with FakeDataverse(profile) as fake, ServerProcess(fake.url, server_env) as server:
+        mcp_path = server.env.get("FASTMCP_STREAMABLE_HTTP_PATH") or server.env.get("MCP_PATH") or "/mcp"
+        asyncio.run(_drive(f"{server.url}{mcp_path}", config, result))
+        result.peak_rss_mb = server.peak_rss_mb()
+        result.fake_api = fake.stats.to_dict()
+    logger.info(
+        "Benchmark completed config=%s records_per_second=%.1f p95=%s",
+        config.name,
+        result.records_per_second,
+        result.percentile(95),
+    )
+    if result.failed:
+        logger.warning(
+            "Benchmark had failures config=%s failed_calls=%d records_failed=%d",
+            config.name,
+            result.failed_calls,
+            result.records_failed,
+        )
+    return result
+
+
+def compare(
+    current: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    max_regression: float,
+) -> list[dict[str, Any]]:
+    """Return configurations whose throughput fell, or p95 latency rose, by more than ``max_regression``."""
+    previous = {entry["name"]: entry for entry in baseline}
+    regressions = []
+    for entry in current:
+        before = previous.get(entry["name"])
+        if before is None:
+            continue
+        old_rate, new_rate = before["records_per_second"], entry["records_per_second"]
+        if old_rate and new_rate < old_rate * (1 - max_regression):
+            regressions.append({"name": entry["name"], "metric": "records_per_second", "baseline": old_rate, "current": new_rate})
+        old_p95, new_p95 = before["latency_seconds"]["p95"], entry["latency_seconds"]["p95"]
+        if old_p95 and new_p95 and new_p95 > old_p95 * (1 + max_regression):
+            regressions.append({"name": entry["name"], "metric": "p95_seconds", "baseline": old_p95, "current": new_p95})
+    return regressions
@@ -0,0 +1,26 @@
+"""Run the MCP server with a static token so it can talk to the fake Dataverse API."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from azure.core.credentials import AccessToken
+
+from .. import server
+
+
+class StaticCredential:
+    """Token credential that never calls Entra ID; the fake API ignores the bearer token."""
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        return AccessToken("benchmark-token", int(time.time()) + 3600)
+
+
+def main() -> None:
+    server._build_credential = StaticCredential
+    server.main()
+
+
+if __name__ == "__main__":
+    main()
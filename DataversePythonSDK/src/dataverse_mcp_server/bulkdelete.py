@@ -0,0 +1,201 @@
+"""Server-side BulkDelete jobs driven by a FetchXML query instead of an ID list."""
+
+from __future__ import annotations
+
+import logging
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable
+
+from PowerPlatform.Dataverse.core.errors import HttpError
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+from . import webapi
+from .query import iter_fetchxml_pages
+from .throttling import is_throttle_error
+
+logger = logging.getLogger("dataverse_mcp_server.bulkdelete")
+
+# asyncoperation.statecode / statuscode values.
+_STATE_COMPLETED = 3
+_STATUS_NAMES = {
+    0: "waiting_for_resources",
+    10: "waiting",
+    20: "in_progress",
+    21: "pausing",
+    22: "canceling",
+    30: "succeeded",
+    31: "failed",
+    32: "canceled",
+}
+
+
+def _fetch_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return str(value)
+
+
+def conditions_to_fetchxml(table: str, conditions: dict[str, Any]) -> str:
+    """Build a FetchXML query matching every ``column == value`` pair (``None`` matches null)."""
+    if not conditions:
+        raise ValueError("conditions must not be empty; deleting every row requires an explicit FetchXML query")
+    fetch = ET.Element("fetch")
+    entity = ET.SubElement(fetch, "entity", name=table.lower())
+    criteria = ET.SubElement(entity, "filter", type="and")
+    for column, value in conditions.items():
+        if value is None:
+            ET.SubElement(criteria, "condition", attribute=column.lower(), operator="null")
+        else:
+            ET.SubElement(criteria, "condition", attribute=column.lower(), operator="eq", value=_fetch_value(value))
+    return ET.tostring(fetch, encoding="unicode")
+
+
+def fetchxml_entity(fetchxml: str) -> str:
+    """Return the logical name in the query's ``<entity name="...">``."""
+    try:
+        fetch = ET.fromstring(fetchxml)
+    except ET.ParseError as exc:
+        raise ValueError(f"fetchxml is not well-formed XML: {exc}") from exc
+    entity = fetch.find("entity")
+    if entity is None or not entity.get("name"):
+        raise ValueError("fetchxml must contain an <entity name=\"...\"> element")
+    return entity.get("name", "").lower()
+
+
+def _id_only_fetch(fetchxml: str, primary_id: str) -> ET.Element:
+    fetch = ET.fromstring(fetchxml)
+    entity = fetch.find("entity")
+    if entity is None:
+        raise ValueError("fetchxml must contain an <entity> element")
+    for child in list(entity):
+        if child.tag in {"attribute", "all-attributes", "order"}:
+            entity.remove(child)
+    entity.insert(0, ET.Element("attribute", name=primary_id))
+    for name in ("top", "count", "page", "paging-cookie", "aggregate"):
+        fetch.attrib.pop(name, None)
+    return fetch
+
+
+def count_matching(client: DataverseClient, table: str, fetchxml: str, primary_id: str) -> int:
+    """Count rows matched by ``fetchxml``.
+
+    Uses an aggregate query first; Dataverse caps aggregates at 50,000 rows, so
+    larger result sets fall back to paging through primary IDs.
+    """
+    fetch = _id_only_fetch(fetchxml, primary_id)
+    fetch.set("aggregate", "true")
+    attribute = fetch.find("entity/attribute")
+    attribute.set("aggregate", "count")
+    attribute.set("alias", "matching")
+    try:
+        body = webapi.request_json(
+            client,
+            "get",
+            webapi.entity_set_name(client, table),
+            params={"fetchXml": ET.tostring(fetch, encoding="unicode")},
+        )
+        rows = body.get("value") or [{}]
+        return int(rows[0].get("matching") or 0)
+    except HttpError as exc:
+        logger.info("Aggregate count failed, counting by paging table=%s error=%s", table, exc)
+    id_fetch = ET.tostring(_id_only_fetch(fetchxml, primary_id), encoding="unicode")
+    return sum(len(page) for page in iter_fetchxml_pages(client, table, id_fetch, 5000))
+
+
+def fetchxml_to_query_expression(client: DataverseClient, fetchxml: str) -> dict[str, Any]:
+    body = webapi.request_json(
+        client,
+        "get",
+        "FetchXmlToQueryExpression(FetchXml=@fetchxml)",
+        params={"@fetchxml": f"'{webapi.escape_odata(fetchxml)}'"},
+    )
+    query = body.get("Query")
+    if not isinstance(query, dict):
+        raise ValueError("FetchXmlToQueryExpression did not return a query")
+    return {"@odata.type": "Microsoft.Dynamics.CRM.QueryExpression", **query}
+
+
+def submit_bulk_delete(client: DataverseClient, table: str, query: dict[str, Any], job_name: str | None = None) -> str:
+    """Submit a BulkDelete job for ``query`` and return its asyncoperation ID."""
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+    body = webapi.request_json(
+        client,
+        "post",
+        "BulkDelete",
+        json={
+            "JobName": job_name or f"delete_by_query {table} @ {timestamp}",
+            "SendEmailNotification": False,
+            "ToRecipients": [],
+            "CCRecipients": [],
+            "RecurrencePattern": "",
+            "StartDateTime": timestamp,
+            "QuerySet": [query],
+        },
+        expected=(200, 202, 204),
+    )
+    job_id = body.get("JobId")
+    if not job_id:
+        raise ValueError("BulkDelete did not return a JobId")
+    return job_id
+
+
+def async_operation_status(client: DataverseClient, job_id: str) -> dict[str, Any]:
+    operation = webapi.request_json(
+        client,
+        "get",
+        f"asyncoperations({job_id})",
+        params={"$select": "statecode,statuscode,message,friendlymessage,completedon"},
+    )
+    status: dict[str, Any] = {
+        "job_id": job_id,
+        "completed": operation.get("statecode") == _STATE_COMPLETED,
+        "status": _STATUS_NAMES.get(operation.get("statuscode"), str(operation.get("statuscode"))),
+        "completed_on": operation.get("completedon"),
+    }
+    message = operation.get("friendlymessage") or operation.get("message")
+    if message:
+        status["message"] = message
+    counts = webapi.request_json(
+        client,
+        "get",
+        "bulkdeleteoperations",
+        params={
+            "$select": "successcount,failurecount",
+            "$filter": f"_asyncoperationid_value eq {job_id}",
+        },
+    )
+    for item in counts.get("value", [])[:1]:
+        status["deleted"] = item.get("successcount")
+        status["failed"] = item.get("failurecount")
+    return status
+
+
+def wait_for_async_operation(
+    client: DataverseClient,
+    job_id: str,
+    timeout_seconds: float,
+    poll_seconds: float,
+    call: Callable[..., Any] | None = None,
+) -> dict[str, Any]:
+    """Poll the asyncoperation until it completes or ``timeout_seconds`` elapses.
+
+    Polls go through ``call`` (e.g. a governor's ``call``). A poll that stays throttled
+    says nothing about the job, so it counts as still running rather than failing the wait.
+    """
+    call = call or (lambda fn, *args: fn(*args))
+    deadline = time.monotonic() + timeout_seconds
+    status: dict[str, Any] = {"job_id": job_id, "completed": False, "status": "unknown"}
+    while True:
+        try:
+            status = call(async_operation_status, client, job_id)
+        except Exception as exc:
+            if not is_throttle_error(exc):
+                raise
+            logger.info("bulk_delete poll throttled job_id=%s", job_id)
+        if status["completed"] or time.monotonic() >= deadline:
+            return status
+        time.sleep(poll_seconds)
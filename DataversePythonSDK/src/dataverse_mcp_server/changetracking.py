@@ -0,0 +1,186 @@
+"""Incremental table sync with Dataverse change tracking and persisted delta links."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+from . import webapi
+
+logger = logging.getLogger("dataverse_mcp_server.changetracking")
+
+SINK_FORMATS = ("jsonl", "parquet")
+UPSERT = "upsert"
+DELETE = "delete"
+
+_NEXT_LINK = "@odata.nextLink"
+_DELTA_LINK = "@odata.deltaLink"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS delta_links (
+    environment TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    selected TEXT NOT NULL,
+    delta_link TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (environment, table_name)
+);
+"""
+
+
+class DeltaLinkStore:
+    """Remembers the last delta link per environment and table.
+
+    The link encodes the query's ``$select``, so the selected columns are stored
+    with it and a sync with different columns must start over.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, environment: str, table: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT selected, delta_link, synced_at FROM delta_links WHERE environment = ? AND table_name = ?",
+                (environment, table.lower()),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"select": json.loads(row[0]), "delta_link": row[1], "synced_at": row[2]}
+
+    def save(self, environment: str, table: str, select: list[str] | None, delta_link: str) -> float:
+        synced_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO delta_links (environment, table_name, selected, delta_link, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (environment, table.lower(), json.dumps(select), delta_link, synced_at),
+            )
+        return synced_at
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _is_deleted(item: dict[str, Any]) -> bool:
+    # Deleted rows come back as {"@odata.context": "...$deletedEntity", "id": ..., "reason": "deleted"}.
+    return "$deletedEntity" in str(item.get("@odata.context", "")) or (item.get("reason") == "deleted" and "id" in item)
+
+
+def iter_changes(
+    client: DataverseClient,
+    table: str,
+    select: list[str] | None = None,
+    delta_link: str | None = None,
+    page_size: int | None = None,
+) -> Iterator[tuple[list[dict[str, Any]], str | None]]:
+    """Yield ``(changes, delta_link)`` per page; ``delta_link`` is set only on the last page.
+
+    Without ``delta_link`` every row is returned as an upsert (the initial full
+    sync). With it, only rows created, updated or deleted since that link was
+    issued are returned. Each change is ``{"change": "upsert"|"delete", "id", "record"}``.
+    """
+    primary_id = webapi.primary_id_attribute(client, table)
+    prefer = ["odata.track-changes"]
+    if page_size:
+        prefer.append(f"odata.maxpagesize={page_size}")
+    headers = {"Prefer": ",".join(prefer)}
+    if delta_link:
+        url, params = delta_link, None
+    else:
+        url = webapi.entity_set_name(client, table)
+        params = {"$select": ",".join(select)} if select else None
+    while url:
+        body = webapi.request_json(client, "get", url, params=params, headers=headers)
+        changes = []
+        for item in body.get("value", []):
+            if not isinstance(item, dict):
+                continue
+            if _is_deleted(item):
+                changes.append({"change": DELETE, "id": item.get("id"), "record": None})
+            else:
+                record = {key: value for key, value in item.items() if not key.startswith("@odata.")}
+                changes.append({"change": UPSERT, "id": record.get(primary_id), "record": record})
+        url, params = body.get(_NEXT_LINK), None
+        yield changes, None if url else body.get(_DELTA_LINK)
+
+
+def sink_format(path: str, requested: str | None = None) -> str:
+    if requested:
+        requested = requested.lower()
+        if requested not in SINK_FORMATS:
+            raise ValueError(f"Unsupported sink format '{requested}'; expected one of {', '.join(SINK_FORMATS)}")
+        return requested
+    return "parquet" if Path(path).suffix.lower() in {".parquet", ".pq"} else "jsonl"
+
+
+class ChangeSink:
+    """Writes changes to a temporary file and moves it into place only on ``commit``.
+
+    JSONL lines are ``{"change", "id", "record"}``. Parquet files have string
+    columns ``change``, ``id`` and ``record`` (the row as JSON), since the columns
+    a table returns can vary between pages and deleted rows have none.
+    """
+
+    def __init__(self, path: Path, format: str) -> None:
+        self.path = path
+        self.format = format
+        self._partial = path.with_name(path.name + ".partial")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Any = None
+        self._writer: Any = None
+        if format == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as exc:
+                raise ValueError("Writing Parquet files requires pyarrow: pip install pyarrow") from exc
+            self._pa = pa
+            self._schema = pa.schema([("change", pa.string()), ("id", pa.string()), ("record", pa.string())])
+            self._writer = pq.ParquetWriter(str(self._partial), self._schema)
+        else:
+            self._file = self._partial.open("w", encoding="utf-8")
+
+    def write(self, changes: list[dict[str, Any]]) -> None:
+        if not changes:
+            return
+        if self._writer is not None:
+            columns = {
+                "change": [item["change"] for item in changes],
+                "id": [item["id"] for item in changes],
+                "record": [json.dumps(item["record"]) if item["record"] is not None else None for item in changes],
+            }
+            self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+        else:
+            self._file.writelines(json.dumps(item) + "\n" for item in changes)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def commit(self) -> None:
+        self._close()
+        os.replace(self._partial, self.path)
+
+    def discard(self) -> None:
+        self._close()
+        self._partial.unlink(missing_ok=True)
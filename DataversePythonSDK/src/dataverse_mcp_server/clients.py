@@ -0,0 +1,204 @@
+"""Registry of Dataverse clients keyed by environment, with pooled connections and idle eviction."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from PowerPlatform.Dataverse.client import DataverseClient
+from PowerPlatform.Dataverse.core._http import _HttpClient
+
+logger = logging.getLogger("dataverse_mcp_server.clients")
+
+
+def normalize_url(url: str) -> str:
+    return url.strip().rstrip("/").lower()
+
+
+def parse_environments(spec: str | None) -> dict[str, str]:
+    """Parse ``"dev=https://a.crm.dynamics.com,prod=https://b.crm.dynamics.com"`` into ``{name: url}``."""
+    environments: dict[str, str] = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, url = item.partition("=")
+        if not sep or not name.strip() or not url.strip():
+            raise ValueError(f"Invalid environment entry '{item}'; expected name=https://<org>.crm.dynamics.com")
+        environments[name.strip().lower()] = normalize_url(url)
+    return environments
+
+
+class _PooledHttpClient(_HttpClient):
+    """SDK HTTP client that sends requests through a shared ``requests.Session``."""
+
+    def __init__(self, base: _HttpClient, session: requests.Session, on_request: Callable[[], None]) -> None:
+        super().__init__(retries=base.max_attempts, backoff=base.base_delay, timeout=base.default_timeout)
+        self.session = session
+        self._on_request = on_request
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        # Same timeout defaults and network-error retries as the SDK's client.
+        if "timeout" not in kwargs:
+            if self.default_timeout is not None:
+                kwargs["timeout"] = self.default_timeout
+            else:
+                kwargs["timeout"] = 120 if (method or "").lower() in ("post", "delete") else 10
+        self._on_request()
+        for attempt in range(self.max_attempts):
+            try:
+                return self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                if attempt == self.max_attempts - 1:
+                    raise
+                time.sleep(self.base_delay * (2**attempt))
+
+
+@dataclass
+class _Entry:
+    url: str
+    client: DataverseClient
+    session: requests.Session
+    created_at: float
+    last_used: float
+    requests: int = 0
+
+
+class ClientRegistry:
+    """Creates one :class:`DataverseClient` per environment on first use and reuses it.
+
+    Environments are addressed by configured name or by URL. Each client sends
+    its requests through its own pooled ``requests.Session``; clients that have
+    not sent a request for ``idle_seconds`` are closed and rebuilt on next use.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], DataverseClient],
+        environments: dict[str, str],
+        default: str | None = None,
+        idle_seconds: float = 1800.0,
+        pool_size: int = 32,
+        on_evict: Callable[[str], None] | None = None,
+    ) -> None:
+        self._factory = factory
+        self.environments = environments
+        self.default = default
+        self.idle_seconds = idle_seconds
+        self.pool_size = pool_size
+        self._on_evict = on_evict
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, environment: str | None = None) -> str:
+        """Return the org URL for an environment name or URL (``None`` means the default)."""
+        name = environment or self.default
+        if not name:
+            raise ValueError(
+                "No default Dataverse environment is configured; pass environment as one of: "
+                + ", ".join(sorted(self.environments))
+            )
+        key = name.strip().lower()
+        if key in self.environments:
+            return self.environments[key]
+        url = normalize_url(key)
+        if url in self.environments.values():
+            return url
+        # Arbitrary URLs are refused so callers cannot point the server's credential at other orgs.
+        raise ValueError(
+            f"Unknown Dataverse environment '{name}'. Configured environments: "
+            + ", ".join(sorted(self.environments))
+        )
+
+    def get(self, environment: str | None = None) -> DataverseClient:
+        url = self.resolve(environment)
+        self.evict_idle()
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                return entry.client
+        # Build outside the lock so a cold environment does not block the others.
+        created = self._create(url)
+        with self._lock:
+            entry = self._entries.setdefault(url, created)
+            entry.last_used = time.monotonic()
+        if entry is not created:
+            created.session.close()
+        return entry.client
+
+    def _create(self, url: str) -> _Entry:
+        logger.info("Creating DataverseClient for url=%s", url)
+        client = self._factory(url)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        now = time.monotonic()
+        entry = _Entry(url=url, client=client, session=session, created_at=now, last_used=now)
+
+        def touch() -> None:
+            entry.last_used = time.monotonic()
+            entry.requests += 1
+
+        odata = client._get_odata()
+        base = getattr(odata, "_http", None)
+        if not isinstance(base, _HttpClient):
+            # The SDK has no supported hook for a custom session; this relies on 0.1.0b3 internals.
+            session.close()
+            raise RuntimeError(
+                "Unsupported PowerPlatform-Dataverse-Client version: its OData client has no _http attribute "
+                "to pool connections through. Install the pinned version from pyproject.toml (0.1.0b3)."
+            )
+        odata._http = _PooledHttpClient(base, session, touch)
+        return entry
+
+    def evict_idle(self) -> list[str]:
+        """Close clients that have been idle for longer than ``idle_seconds``."""
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            evicted = [entry for entry in self._entries.values() if entry.last_used < cutoff]
+            for entry in evicted:
+                del self._entries[entry.url]
+        for entry in evicted:
+            self._close(entry)
+            logger.info("Evicted idle DataverseClient url=%s requests=%d", entry.url, entry.requests)
+        return [entry.url for entry in evicted]
+
+    def _close(self, entry: _Entry) -> None:
+        entry.session.close()
+        if self._on_evict is not None:
+            self._on_evict(entry.url)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        self.evict_idle()
+        now = time.monotonic()
+        names = {url: name for name, url in self.environments.items()}
+        with self._lock:
+            entries = dict(self._entries)
+        environments = []
+        for url in sorted(set(names) | set(entries)):
+            entry = entries.get(url)
+            environments.append(
+                {
+                    "name": names.get(url),
+                    "url": url,
+                    "default": self.default is not None and self.resolve() == url,
+                    "active": entry is not None,
+                    "idle_seconds": round(now - entry.last_used, 1) if entry else None,
+                    "requests": entry.requests if entry else 0,
+                }
+            )
+        return environments
+
+    def close(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close(entry)
@@ -0,0 +1,82 @@
+"""Thread offload for blocking Dataverse SDK calls made from async tool handlers."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from .logconfig import HOT, correlation, new_request_id
+from .metrics import TOOL_CALLS, TOOL_DURATION, TOOL_QUEUE_WAIT, TOOLS_IN_FLIGHT
+
+logger = logging.getLogger("dataverse_mcp_server.executor")
+
+R = TypeVar("R")
+
+
+class ToolExecutor:
+    """Runs blocking callables on a bounded thread pool with a per-tool concurrency limit.
+
+    Tools share one pool so the process never runs more than ``max_workers`` SDK calls
+    at once, while each tool gets its own semaphore so a burst of slow calls to one tool
+    cannot occupy every worker.
+    """
+
+    def __init__(self, max_workers: int, default_limit: int, limits: dict[str, int] | None = None) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if default_limit < 1:
+            raise ValueError("default_limit must be at least 1")
+        self.max_workers = max_workers
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dv-tool")
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def limit_for(self, tool: str) -> int:
+        return self.limits.get(tool, self.default_limit)
+
+    def _semaphore(self, tool: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(tool)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit_for(tool))
+            self._semaphores[tool] = semaphore
+        return semaphore
+
+    async def run(self, tool: str, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Run ``fn(*args, **kwargs)`` on the pool once a slot for ``tool`` is free.
+
+        Each call gets a fresh request ID, and the caller's context (with that ID) is
+        carried onto the worker thread so everything ``fn`` logs can be correlated.
+        """
+        with correlation(request_id=new_request_id(), tool=tool):
+            return await self._run(tool, fn, *args, **kwargs)
+
+    async def _run(self, tool: str, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        semaphore = self._semaphore(tool)
+        if semaphore.locked():
+            logger.info("%s waiting for a free slot limit=%d", tool, self.limit_for(tool), extra=HOT)
+        queued = time.perf_counter()
+        async with semaphore:
+            started = time.perf_counter()
+            TOOL_QUEUE_WAIT.observe(started - queued, tool=tool)
+            TOOLS_IN_FLIGHT.inc(tool=tool)
+            outcome = "error"
+            try:
+                loop = asyncio.get_running_loop()
+                # run_in_executor does not carry contextvars over to the worker thread on its own.
+                context = contextvars.copy_context()
+                result = await loop.run_in_executor(self._pool, functools.partial(context.run, fn, *args, **kwargs))
+                outcome = "success"
+                return result
+            finally:
+                TOOLS_IN_FLIGHT.dec(tool=tool)
+                TOOL_DURATION.observe(time.perf_counter() - started, tool=tool)
+                TOOL_CALLS.inc(tool=tool, outcome=outcome)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
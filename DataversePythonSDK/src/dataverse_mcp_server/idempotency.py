@@ -0,0 +1,158 @@
+"""SQLite-backed record of committed chunks so retried bulk creates are not sent twice."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+logger = logging.getLogger("dataverse_mcp_server.idempotency")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    job_id TEXT,
+    created_at REAL NOT NULL,
+    row_indexes TEXT
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    key TEXT NOT NULL REFERENCES requests(key) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (key, chunk_index)
+);
+"""
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of a request payload, used to detect a key reused for different rows."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """Remembers, per idempotency key, which chunks were committed and what they returned.
+
+    The first call with a key pins its payload fingerprint, chunk size and the
+    input rows that passed validation; a retry with the same key reuses them, so
+    chunk indexes line up (even if metadata changed in between) and committed chunks
+    can be skipped and answered from the store. Keys expire after ``ttl_seconds``.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float = 86400.0, wait_seconds: float = 600.0) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(requests)")}
+        if "row_indexes" not in columns:
+            # Databases created before row pinning was added.
+            self._conn.execute("ALTER TABLE requests ADD COLUMN row_indexes TEXT")
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._active: set[str] = set()
+        self.purge_expired()
+
+    def purge_expired(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM requests WHERE created_at < ?", (cutoff,)).rowcount
+        if deleted:
+            logger.info("Purged expired idempotency keys count=%d", deleted)
+        return deleted
+
+    def _begin(
+        self,
+        key: str,
+        request_fingerprint: str,
+        chunk_size: int,
+        row_indexes: Sequence[int] | None,
+    ) -> tuple[int, str | None, list[int] | None]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, chunk_size, job_id, created_at, row_indexes FROM requests WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[3] < time.time() - self.ttl_seconds:
+                self._conn.execute("DELETE FROM requests WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                pinned = list(row_indexes) if row_indexes is not None else None
+                self._conn.execute(
+                    "INSERT INTO requests (key, fingerprint, chunk_size, created_at, row_indexes) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        request_fingerprint,
+                        chunk_size,
+                        time.time(),
+                        json.dumps(pinned) if pinned is not None else None,
+                    ),
+                )
+                return chunk_size, None, pinned
+        if row[0] != request_fingerprint:
+            raise ValueError(f"idempotency_key '{key}' was already used for a different request")
+        return int(row[1]), row[2], json.loads(row[4]) if row[4] is not None else None
+
+    @contextmanager
+    def claim(
+        self,
+        key: str,
+        request_fingerprint: str,
+        chunk_size: int,
+        row_indexes: Sequence[int] | None = None,
+    ) -> Iterator[tuple[int, str | None, dict[int, Any], list[int] | None]]:
+        """Hold ``key`` for one request and yield ``(chunk_size, job_id, committed chunk results, row_indexes)``.
+
+        ``row_indexes`` are the input rows this attempt would send; the first attempt's
+        are stored and yielded on every retry. A second request with the same key while
+        the first is still running (typically a client retrying after a timeout) waits for
+        it, up to ``wait_seconds``, and then sees every chunk the first one committed.
+        """
+        deadline = time.monotonic() + self.wait_seconds
+        with self._released:
+            while key in self._active:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ValueError(f"A request with idempotency_key '{key}' is still in progress; retry later")
+                logger.info("Waiting for in-flight request idempotency_key=%s", key)
+                self._released.wait(remaining)
+            self._active.add(key)
+        try:
+            chunk_size, job_id, pinned = self._begin(key, request_fingerprint, chunk_size, row_indexes)
+            yield chunk_size, job_id, self.committed(key), pinned
+        finally:
+            with self._released:
+                self._active.discard(key)
+                self._released.notify_all()
+
+    def committed(self, key: str) -> dict[int, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT chunk_index, result FROM chunks WHERE key = ?", (key,)).fetchall()
+        return {int(index): json.loads(result) for index, result in rows}
+
+    def record(self, key: str, chunk_index: int, result: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chunks (key, chunk_index, result) VALUES (?, ?, ?)",
+                (key, chunk_index, json.dumps(result)),
+            )
+
+    def set_job(self, key: str, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE requests SET job_id = ? WHERE key = ?", (job_id, key))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,172 @@
+"""Streaming readers and type coercion for importing local files into Dataverse."""
+
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Union
+
+SUPPORTED_FORMATS = ("csv", "jsonl", "parquet")
+
+_TRUE_STRINGS = frozenset({"1", "true", "yes", "y", "t"})
+_FALSE_STRINGS = frozenset({"0", "false", "no", "n", "f"})
+_CHOICE_TYPES = frozenset({"Picklist", "State", "Status"})
+_INTEGER_TYPES = frozenset({"Integer", "BigInt"}) | _CHOICE_TYPES
+_FLOAT_TYPES = frozenset({"Decimal", "Double", "Money"})
+
+
+@dataclass(frozen=True)
+class RowError:
+    """Stands in for a row the reader could not parse, so row offsets stay aligned.
+
+    ``fatal`` means the reader cannot go past this point (an I/O error or a corrupt
+    Parquet batch); it is always the last item yielded.
+    """
+
+    reason: str
+    fatal: bool = False
+
+
+Row = Union[dict[str, Any], RowError]
+
+
+def detect_format(path: Path, file_format: str | None = None) -> str:
+    fmt = (file_format or path.suffix.lstrip(".")).lower()
+    if fmt in {"json", "ndjson"}:
+        fmt = "jsonl"
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file format '{fmt}'. Use one of: {', '.join(SUPPORTED_FORMATS)}")
+    return fmt
+
+
+def _iter_csv(path: Path) -> Iterator[Row]:
+    with path.open(newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                # The reader resumes at the next record after a malformed one.
+                yield RowError(f"line {reader.line_num}: {exc}")
+                continue
+            yield row
+
+
+def _iter_jsonl(path: Path) -> Iterator[Row]:
+    with path.open(encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield RowError(f"line {line_number}: invalid JSON ({exc})")
+                continue
+            if not isinstance(row, dict):
+                yield RowError(f"line {line_number}: not a JSON object")
+                continue
+            yield row
+
+
+def _iter_parquet(path: Path, batch_size: int = 10_000) -> Iterator[Row]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ValueError("Reading Parquet files requires pyarrow: pip install pyarrow") from exc
+
+    def rows() -> Iterator[Row]:
+        parquet_file = pq.ParquetFile(path)
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield from record_batch.to_pylist()
+
+    return rows()
+
+
+def _stop_on_error(rows: Iterable[Row]) -> Iterator[Row]:
+    # A reader that raises is finished; hand back what it failed on instead of losing the rows read so far.
+    try:
+        yield from rows
+    except Exception as exc:
+        yield RowError(f"{type(exc).__name__}: {exc}", fatal=True)
+
+
+def iter_rows(path: Path, file_format: str, start_offset: int = 0) -> Iterator[Row]:
+    """Yield rows from ``path`` one at a time, skipping the first ``start_offset`` rows.
+
+    Rows that cannot be parsed are yielded as :class:`RowError` in their place.
+    """
+    readers = {"csv": _iter_csv, "jsonl": _iter_jsonl, "parquet": _iter_parquet}
+    rows = readers[file_format](path)
+    return _stop_on_error(islice(rows, start_offset, None))
+
+
+def windows(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    """Group an iterator into lists of at most ``size`` rows."""
+    iterator = iter(rows)
+    while True:
+        window = list(islice(iterator, size))
+        if not window:
+            return
+        yield window
+
+
+def coerce_value(value: Any, attribute_type: str) -> Any:
+    """Convert a raw file value to the Python type Dataverse expects for ``attribute_type``."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        if value == "":
+            return None
+        if attribute_type == "Boolean":
+            lowered = value.strip().lower()
+            if lowered in _TRUE_STRINGS:
+                return True
+            if lowered in _FALSE_STRINGS:
+                return False
+            raise ValueError(f"'{value}' is not a boolean")
+        if attribute_type in _INTEGER_TYPES:
+            stripped = value.strip()
+            # Choice columns also accept labels, which the SDK resolves to option values.
+            if attribute_type in _CHOICE_TYPES and not stripped.lstrip("-").isdigit():
+                return value
+            return int(stripped)
+        if attribute_type in _FLOAT_TYPES:
+            return float(value.strip())
+        return value
+    if attribute_type in {"Integer", "BigInt"} and isinstance(value, float) and value.is_integer():
+        return int(value)
+    if attribute_type in {"String", "Memo"} and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+class RowMapper:
+    """Renames source columns and coerces values against table attribute types."""
+
+    def __init__(self, attribute_types: dict[str, str], column_map: dict[str, str] | None = None) -> None:
+        self.attribute_types = attribute_types
+        self.column_map = {source: target.lower() for source, target in (column_map or {}).items()}
+        self.ignored_columns: set[str] = set()
+
+    def map_row(self, row: dict[str, Any]) -> dict[str, Any]:
+        """Return the Dataverse payload for ``row``; raises ``ValueError`` on bad values."""
+        payload: dict[str, Any] = {}
+        for source, value in row.items():
+            target = self.column_map.get(source, str(source).lower())
+            attribute_type = self.attribute_types.get(target)
+            if attribute_type is None:
+                self.ignored_columns.add(str(source))
+                continue
+            try:
+                coerced = coerce_value(value, attribute_type)
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"column '{source}': {exc}") from exc
+            if coerced is not None:
+                payload[target] = coerced
+        return payload
@@ -0,0 +1,295 @@
+"""Background bulk jobs with on-disk checkpoints so they can be polled, cancelled and resumed."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from .batching import ChunkResult, run_batches
+from .logconfig import correlation
+
+logger = logging.getLogger("dataverse_mcp_server.jobs")
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+INTERRUPTED = "interrupted"
+
+RESUMABLE_STATUSES = frozenset({FAILED, CANCELLED, INTERRUPTED})
+
+# A planner turns (operation, table, params) into the items to chunk and the per-chunk handler.
+Planner = Callable[[str, str, dict[str, Any]], tuple[Sequence[Any], Callable[[Sequence[Any]], Any]]]
+
+
+@dataclass
+class Job:
+    job_id: str
+    operation: str
+    table: str
+    total: int
+    chunk_size: int
+    max_workers: int
+    status: str = PENDING
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    failed_chunks: dict[str, str] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def total_chunks(self) -> int:
+        return -(-self.total // self.chunk_size) if self.total else 0
+
+
+def _end_torn_line(path: Path) -> None:
+    """Terminate a final line left incomplete by a crash so the next append starts a fresh line."""
+    if not path.is_file() or path.stat().st_size == 0:
+        return
+    with path.open("rb+") as handle:
+        handle.seek(-1, os.SEEK_END)
+        if handle.read(1) != b"\n":
+            handle.write(b"\n")
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class JobManager:
+    """Runs bulk operations in the background and checkpoints every finished chunk.
+
+    Each job keeps three files in ``job_dir``: the request payload (written once),
+    the job state, and an append-only checkpoint log with one line per completed
+    chunk. Resuming a job replays the log and only sends chunks that never landed.
+    """
+
+    def __init__(self, job_dir: Path, planner: Planner, max_concurrent_jobs: int = 2) -> None:
+        self.job_dir = job_dir
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self._planner = planner
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent_jobs, thread_name_prefix="dv-job")
+        self._jobs: dict[str, Job] = {}
+        self._cancel_events: dict[str, threading.Event] = {}
+        # One lock per job guards its mutable state (status, failed_chunks) against status polls.
+        self._job_locks: dict[str, threading.RLock] = {}
+        self._lock = threading.Lock()
+
+    def _state_path(self, job_id: str) -> Path:
+        return self.job_dir / f"{job_id}.json"
+
+    def _payload_path(self, job_id: str) -> Path:
+        return self.job_dir / f"{job_id}.payload.json"
+
+    def _checkpoint_path(self, job_id: str) -> Path:
+        return self.job_dir / f"{job_id}.checkpoint.jsonl"
+
+    def _job_lock(self, job_id: str) -> threading.RLock:
+        with self._lock:
+            return self._job_locks.setdefault(job_id, threading.RLock())
+
+    def _save(self, job: Job) -> None:
+        with self._job_lock(job.job_id):
+            job.updated_at = time.time()
+            _write_json_atomic(self._state_path(job.job_id), asdict(job))
+
+    def _load(self, job_id: str) -> Job:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job
+            state_path = self._state_path(job_id)
+            if not state_path.is_file():
+                raise ValueError(f"Unknown job_id '{job_id}'")
+            job = Job(**json.loads(state_path.read_text(encoding="utf-8")))
+            # A job that was active in a previous process did not finish.
+            if job.status in {PENDING, RUNNING}:
+                job.status = INTERRUPTED
+            self._jobs[job_id] = job
+            return job
+
+    def _completed_chunks(self, job_id: str) -> dict[int, Any]:
+        completed: dict[int, Any] = {}
+        checkpoint_path = self._checkpoint_path(job_id)
+        if not checkpoint_path.is_file():
+            return completed
+        with checkpoint_path.open(encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can leave a torn final line; that chunk is simply re-sent.
+                    continue
+                completed[int(entry["index"])] = entry.get("result")
+        return completed
+
+    def submit(
+        self,
+        operation: str,
+        table: str,
+        params: dict[str, Any],
+        total: int,
+        chunk_size: int,
+        max_workers: int,
+    ) -> dict[str, Any]:
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            operation=operation,
+            table=table,
+            total=total,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+        )
+        _write_json_atomic(self._payload_path(job.job_id), params)
+        self._save(job)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._start(job)
+        logger.info(
+            "Job submitted job_id=%s operation=%s table=%s records=%d",
+            job.job_id,
+            operation,
+            table,
+            total,
+        )
+        return self.status(job.job_id)
+
+    def _start(self, job: Job, allowed_statuses: frozenset[str] | None = None) -> None:
+        """Hand ``job`` to the pool; the status check and claim happen under the lock so only one runner starts."""
+        cancel = threading.Event()
+        with self._lock:
+            if job.job_id in self._cancel_events:
+                raise ValueError(f"Job '{job.job_id}' is already running")
+            if allowed_statuses is not None and job.status not in allowed_statuses:
+                raise ValueError(f"Job '{job.job_id}' cannot be resumed from status '{job.status}'")
+            self._cancel_events[job.job_id] = cancel
+            job.status = PENDING
+            job.error = None
+        self._save(job)
+        self._pool.submit(contextvars.copy_context().run, self._run, job, cancel)
+
+    def _run(self, job: Job, cancel: threading.Event) -> None:
+        with correlation(job_id=job.job_id, tool=job.operation):
+            self._execute(job, cancel)
+
+    def _execute(self, job: Job, cancel: threading.Event) -> None:
+        job_lock = self._job_lock(job.job_id)
+        try:
+            if cancel.is_set():
+                job.status = CANCELLED
+                return
+            job.status = RUNNING
+            self._save(job)
+            params = json.loads(self._payload_path(job.job_id).read_text(encoding="utf-8"))
+            items, handler = self._planner(job.operation, job.table, params)
+            completed = self._completed_chunks(job.job_id)
+            with job_lock:
+                job.failed_chunks = {}
+
+            # Otherwise the first new entry would be glued onto the torn line and lost on the next read.
+            _end_torn_line(self._checkpoint_path(job.job_id))
+            with self._checkpoint_path(job.job_id).open("a", encoding="utf-8") as checkpoint:
+
+                def record(chunk: ChunkResult) -> None:
+                    with job_lock:
+                        if chunk.succeeded:
+                            checkpoint.write(json.dumps({"index": chunk.index, "result": chunk.result}) + "\n")
+                            checkpoint.flush()
+                            os.fsync(checkpoint.fileno())
+                        else:
+                            job.failed_chunks[str(chunk.index)] = chunk.error or "failed"
+                        self._save(job)
+
+                run_batches(
+                    job.operation,
+                    items,
+                    handler,
+                    chunk_size=job.chunk_size,
+                    max_workers=job.max_workers,
+                    skip=completed.keys(),
+                    on_chunk=record,
+                    cancel=cancel,
+                )
+
+            if cancel.is_set():
+                job.status = CANCELLED
+            elif job.failed_chunks:
+                job.status = FAILED
+            else:
+                job.status = SUCCEEDED
+        except Exception as exc:
+            logger.exception("Job failed job_id=%s", job.job_id)
+            job.status = FAILED
+            job.error = f"{type(exc).__name__}: {exc}"
+        finally:
+            with self._lock:
+                self._cancel_events.pop(job.job_id, None)
+            self._save(job)
+            logger.info("Job finished job_id=%s status=%s", job.job_id, job.status)
+
+    def status(self, job_id: str, include_results: bool = False) -> dict[str, Any]:
+        job = self._load(job_id)
+        with self._job_lock(job_id):
+            # Chunk workers update failed_chunks while the job runs; report a consistent snapshot.
+            job = replace(job, failed_chunks=dict(job.failed_chunks))
+        completed = self._completed_chunks(job_id)
+        succeeded = sum(
+            min(job.chunk_size, job.total - index * job.chunk_size) for index in completed
+        )
+        summary: dict[str, Any] = {
+            "job_id": job.job_id,
+            "operation": job.operation,
+            "table": job.table,
+            "status": job.status,
+            "total": job.total,
+            "chunk_size": job.chunk_size,
+            "total_chunks": job.total_chunks,
+            "completed_chunks": len(completed),
+            "succeeded": succeeded,
+            "failed_chunks": [
+                {
+                    "index": int(index),
+                    "offset": int(index) * job.chunk_size,
+                    "size": min(job.chunk_size, job.total - int(index) * job.chunk_size),
+                    "error": error,
+                }
+                for index, error in sorted(job.failed_chunks.items(), key=lambda item: int(item[0]))
+            ],
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+        }
+        if job.error:
+            summary["error"] = job.error
+        if include_results:
+            summary["results"] = [completed[index] for index in sorted(completed)]
+        return summary
+
+    def cancel(self, job_id: str) -> dict[str, Any]:
+        job = self._load(job_id)
+        with self._lock:
+            cancel = self._cancel_events.get(job_id)
+        if cancel is None:
+            raise ValueError(f"Job '{job_id}' is not running (status={job.status})")
+        cancel.set()
+        logger.info("Job cancellation requested job_id=%s", job_id)
+        return self.status(job_id)
+
+    def resume(self, job_id: str) -> dict[str, Any]:
+        job = self._load(job_id)
+        self._start(job, RESUMABLE_STATUSES)
+        logger.info("Job resumed job_id=%s", job_id)
+        return self.status(job_id)
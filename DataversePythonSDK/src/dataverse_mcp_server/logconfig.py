@@ -0,0 +1,167 @@
+"""Structured, sampled logging through a background queue, with request and job correlation IDs."""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+LOG_FORMATS = ("json", "text")
+# Unchanged from the original basicConfig format so existing log parsing keeps working.
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+
+# Pass extra=HOT on per-chunk and per-request log calls so LOG_SAMPLE_RATES can thin them out.
+HOT = {"hot": True}
+
+REQUEST_ID: ContextVar[str | None] = ContextVar("dataverse_request_id", default=None)
+TOOL: ContextVar[str | None] = ContextVar("dataverse_tool", default=None)
+JOB_ID: ContextVar[str | None] = ContextVar("dataverse_job_id", default=None)
+
+_CORRELATION_FIELDS = ("request_id", "tool", "job_id")
+_RESERVED = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "hot", *_CORRELATION_FIELDS}
+
+_TRACEBACKS = logging.Formatter()
+_listener: logging.handlers.QueueListener | None = None
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def correlation(request_id: str | None = None, tool: str | None = None, job_id: str | None = None) -> Iterator[None]:
+    """Tag every log record emitted in this context (and contexts copied from it) with the given IDs."""
+    tokens = []
+    for var, value in ((REQUEST_ID, request_id), (TOOL, tool), (JOB_ID, job_id)):
+        if value is not None:
+            tokens.append((var, var.set(value)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def parse_sample_rates(value: str | None) -> dict[int, float]:
+    """Parse ``"DEBUG=0.01,INFO=0.1"`` into ``{logging.DEBUG: 0.01, logging.INFO: 0.1}``."""
+    rates: dict[int, float] = {}
+    for part in (value or "").split(","):
+        if not part.strip():
+            continue
+        name, sep, rate = part.partition("=")
+        level = logging.getLevelName(name.strip().upper())
+        if not sep or not isinstance(level, int):
+            raise ValueError(f"Invalid LOG_SAMPLE_RATES entry '{part.strip()}'; expected LEVEL=rate")
+        rates[level] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class CorrelationFilter(logging.Filter):
+    """Copies the correlation IDs onto the record; runs in the calling thread, where the context is live."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = REQUEST_ID.get()
+        record.tool = TOOL.get()
+        record.job_id = JOB_ID.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of hot-path records per level; records not marked hot are always kept."""
+
+    def __init__(self, rates: dict[int, float]) -> None:
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.rates or not getattr(record, "hot", False):
+            return True
+        rate = self.rates.get(record.levelno, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, correlation IDs and any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in _CORRELATION_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        for name, value in record.__dict__.items():
+            if name not in _RESERVED and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now (they may be mutated after the call returns), but keep the
+        # traceback out of the message so the JSON formatter can put it in its own field.
+        prepared = copy.copy(record)
+        prepared.msg = record.getMessage()
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = _TRACEBACKS.formatException(record.exc_info)
+        prepared.exc_info = None
+        return prepared
+
+
+def configure(level: int, format: str = "text", sample_rates: dict[int, float] | None = None) -> None:
+    """Route all logging through a queue drained by a background thread that writes to stdout.
+
+    Callers only pay for filtering and enqueueing a record; formatting and the
+    stdout write happen on the listener thread, so a slow log consumer never
+    stalls a tool call.
+    """
+    global _listener
+    if format not in LOG_FORMATS:
+        raise ValueError(f"LOG_FORMAT must be one of {', '.join(LOG_FORMATS)}")
+    if _listener is not None:
+        _listener.stop()
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(SamplingFilter(sample_rates or {}))
+    handler.addFilter(CorrelationFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+
+
+@atexit.register
+def _flush() -> None:
+    # Drains whatever is still queued before the interpreter exits.
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
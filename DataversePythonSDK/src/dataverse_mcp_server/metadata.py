@@ -0,0 +1,170 @@
+"""Table metadata lookups with a TTL, size-bounded LRU cache."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+from . import webapi
+
+logger = logging.getLogger("dataverse_mcp_server.metadata")
+
+_ATTRIBUTE_SELECT = "LogicalName,AttributeType,RequiredLevel,IsValidForCreate,IsValidForUpdate,AttributeOf"
+# MaxLength is only defined on the derived string-like attribute metadata types.
+_MAX_LENGTH_TYPES = ("StringAttributeMetadata", "MemoAttributeMetadata")
+
+
+@dataclass(frozen=True)
+class ColumnMetadata:
+    logical_name: str
+    attribute_type: str
+    required_level: str
+    valid_for_create: bool
+    valid_for_update: bool
+    max_length: int | None = None
+    attribute_of: str | None = None
+
+
+@dataclass(frozen=True)
+class TableMetadata:
+    logical_name: str
+    entity_set_name: str
+    primary_id_attribute: str
+    primary_name_attribute: str | None
+    columns: dict[str, ColumnMetadata]
+    fetched_at: float
+
+    def attribute_types(self) -> dict[str, str]:
+        return {name: column.attribute_type for name, column in self.columns.items()}
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "table": self.logical_name,
+            "entity_set_name": self.entity_set_name,
+            "primary_id_attribute": self.primary_id_attribute,
+            "primary_name_attribute": self.primary_name_attribute,
+            "columns": len(self.columns),
+            "fetched_at": self.fetched_at,
+        }
+
+
+def fetch_table_metadata(client: DataverseClient, table: str) -> TableMetadata:
+    """Load entity and attribute metadata for ``table`` from the Web API."""
+    logical = table.lower()
+    entity_path = f"EntityDefinitions(LogicalName='{webapi.escape_odata(logical)}')"
+    entity = webapi.request_json(
+        client,
+        "get",
+        entity_path,
+        params={
+            "$select": "LogicalName,EntitySetName,PrimaryIdAttribute,PrimaryNameAttribute",
+            "$expand": f"Attributes($select={_ATTRIBUTE_SELECT})",
+        },
+    )
+    max_lengths: dict[str, int] = {}
+    for metadata_type in _MAX_LENGTH_TYPES:
+        body = webapi.request_json(
+            client,
+            "get",
+            f"{entity_path}/Attributes/Microsoft.Dynamics.CRM.{metadata_type}",
+            params={"$select": "LogicalName,MaxLength"},
+        )
+        for item in body.get("value", []):
+            if isinstance(item, dict) and isinstance(item.get("MaxLength"), int):
+                max_lengths[item["LogicalName"]] = item["MaxLength"]
+
+    columns: dict[str, ColumnMetadata] = {}
+    for item in entity.get("Attributes", []):
+        if not isinstance(item, dict) or not item.get("LogicalName"):
+            continue
+        name = item["LogicalName"]
+        required = item.get("RequiredLevel") or {}
+        columns[name] = ColumnMetadata(
+            logical_name=name,
+            attribute_type=item.get("AttributeType") or "",
+            required_level=required.get("Value", "None") if isinstance(required, dict) else str(required),
+            valid_for_create=bool(item.get("IsValidForCreate")),
+            valid_for_update=bool(item.get("IsValidForUpdate")),
+            max_length=max_lengths.get(name),
+            attribute_of=item.get("AttributeOf"),
+        )
+    return TableMetadata(
+        logical_name=entity.get("LogicalName") or logical,
+        entity_set_name=entity.get("EntitySetName") or "",
+        primary_id_attribute=entity.get("PrimaryIdAttribute") or "",
+        primary_name_attribute=entity.get("PrimaryNameAttribute"),
+        columns=columns,
+        fetched_at=time.time(),
+    )
+
+
+class MetadataCache:
+    """Caches :class:`TableMetadata` by table logical name.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entry is
+    evicted once more than ``max_entries`` tables are cached.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], TableMetadata],
+        ttl_seconds: float = 900.0,
+        max_entries: int = 256,
+    ) -> None:
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, TableMetadata]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(table: str) -> str:
+        return table.strip().lower()
+
+    def get(self, table: str) -> TableMetadata:
+        key = self._key(table)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+        return self.refresh(table)
+
+    def refresh(self, table: str) -> TableMetadata:
+        """Reload ``table`` from Dataverse, replacing any cached entry."""
+        key = self._key(table)
+        metadata = self._loader(key)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), metadata)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.debug("Metadata cache evicted table=%s", evicted)
+        logger.info("Metadata cache loaded table=%s columns=%d", key, len(metadata.columns))
+        return metadata
+
+    def invalidate(self, table: str) -> bool:
+        with self._lock:
+            return self._entries.pop(self._key(table), None) is not None
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
@@ -0,0 +1,206 @@
+"""Lightweight in-process metrics rendered in the Prometheus text exposition format."""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Iterator, Sequence
+
+# Seconds; covers single-record calls up to multi-minute bulk chunks.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames) or set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format(value)}" for name, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, _labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, _labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][position] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            values = {key: (list(state[0]), state[1], state[2]) for key, state in self._values.items()}
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", _labels(names, key + (_format(bound),)), cumulative
+            yield f"{self.name}_bucket", _labels(names, key + ("+Inf",)), count
+            yield f"{self.name}_sum", _labels(self.labelnames, key), total
+            yield f"{self.name}_count", _labels(self.labelnames, key), count
+
+
+class MetricsRegistry:
+    """Holds named metrics and renders them all for a ``/metrics`` scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with a different definition")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_CALLS = REGISTRY.counter("dataverse_mcp_tool_calls_total", "MCP tool calls by outcome.", ("tool", "outcome"))
+TOOL_DURATION = REGISTRY.histogram(
+    "dataverse_mcp_tool_duration_seconds", "MCP tool call latency, excluding time spent waiting for a slot.", ("tool",)
+)
+TOOL_QUEUE_WAIT = REGISTRY.histogram(
+    "dataverse_mcp_tool_queue_seconds", "Time MCP tool calls waited for a per-tool concurrency slot.", ("tool",)
+)
+TOOLS_IN_FLIGHT = REGISTRY.gauge("dataverse_mcp_tools_in_flight", "MCP tool calls currently running.", ("tool",))
+
+CHUNKS = REGISTRY.counter("dataverse_batch_chunks_total", "Bulk chunks processed by outcome.", ("operation", "outcome"))
+CHUNK_RECORDS = REGISTRY.histogram(
+    "dataverse_batch_chunk_records", "Records per bulk chunk.", ("operation",), SIZE_BUCKETS
+)
+CHUNK_DURATION = REGISTRY.histogram(
+    "dataverse_batch_chunk_duration_seconds", "Time to send one bulk chunk, including throttling retries.", ("operation",)
+)
+RECORDS = REGISTRY.counter("dataverse_batch_records_total", "Records sent in bulk chunks by outcome.", ("operation", "outcome"))
+RECORDS_PER_SECOND = REGISTRY.gauge(
+    "dataverse_batch_records_per_second", "Successful records per second of the most recent bulk run.", ("operation",)
+)
+
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "dataverse_requests_in_flight", "Dataverse requests currently admitted by the rate governor.", ("environment",)
+)
+THROTTLE_BUDGET = REGISTRY.gauge(
+    "dataverse_throttle_budget", "Current concurrent request budget of the rate governor.", ("environment",)
+)
+THROTTLED = REGISTRY.counter(
+    "dataverse_throttled_responses_total", "Service-protection (429/503) responses from Dataverse.", ("environment",)
+)
+RETRIES = REGISTRY.counter(
+    "dataverse_request_retries_total", "Requests retried after a throttling response.", ("environment",)
+)
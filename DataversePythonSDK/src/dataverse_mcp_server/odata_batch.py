@@ -0,0 +1,325 @@
+"""Multipart OData ``$batch`` requests with optional atomic changesets."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+from . import webapi
+from .throttling import THROTTLE_STATUS_CODES
+
+logger = logging.getLogger("dataverse_mcp_server.odata_batch")
+
+# Dataverse rejects $batch requests with more than 1000 operations.
+MAX_BATCH_OPERATIONS = 1000
+
+_METHODS = frozenset({"GET", "POST", "PATCH", "PUT", "DELETE"})
+_BOUNDARY_RE = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+_STATUS_RE = re.compile(r"^HTTP/\d\.\d\s+(\d{3})")
+_ENTITY_ID_RE = re.compile(r"\(([0-9a-fA-F-]{36})\)\s*$")
+_CRLF = "\r\n"
+# A failed batch or changeset can come back with a 4xx/5xx status and a multipart body that still
+# holds the per-operation responses, so only throttling is left to raise (and be retried).
+_BATCH_STATUSES = tuple(status for status in range(200, 600) if status not in THROTTLE_STATUS_CODES)
+
+
+@dataclass
+class BatchOperation:
+    index: int
+    method: str
+    url: str
+    body: dict[str, Any] | None = None
+    content_id: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+    changeset: int | None = None
+
+    def render(self, api_root: str) -> str:
+        # Content-ID references ($1/...) must stay relative; everything else is sent absolute.
+        target = self.url if self.url.startswith("$") else f"{api_root}/{self.url.lstrip('/')}"
+        lines = ["Content-Type: application/http", "Content-Transfer-Encoding: binary"]
+        if self.content_id is not None:
+            lines.append(f"Content-ID: {self.content_id}")
+        lines.extend(["", f"{self.method} {target} HTTP/1.1"])
+        headers = dict(self.headers)
+        if self.body is not None:
+            headers.setdefault("Content-Type", "application/json; type=entry")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append("")
+        lines.append(json.dumps(self.body) if self.body is not None else "")
+        return _CRLF.join(lines)
+
+
+def _operation_url(client: DataverseClient, spec: dict[str, Any]) -> str:
+    path = spec.get("path")
+    if path:
+        return str(path)
+    table = spec.get("table")
+    if not table:
+        raise ValueError("each operation needs either 'path' or 'table'")
+    url = webapi.entity_set_name(client, str(table))
+    if spec.get("id"):
+        url += f"({spec['id']})"
+    elif spec.get("keys"):
+        url += webapi.alternate_key_segment(spec["keys"])
+    return url
+
+
+def build_operations(client: DataverseClient, items: list[dict[str, Any]]) -> list[BatchOperation | list[BatchOperation]]:
+    """Normalise tool input into operations, grouping ``{"changeset": [...]}`` items into lists."""
+    planned: list[BatchOperation | list[BatchOperation]] = []
+    index = 0
+    used_ids: set[str] = set()
+
+    def build(spec: dict[str, Any], changeset: int | None) -> BatchOperation:
+        nonlocal index
+        if not isinstance(spec, dict):
+            raise ValueError(f"operation {index} must be an object")
+        method = str(spec.get("method", "")).upper()
+        if method not in _METHODS:
+            raise ValueError(f"operation {index}: method must be one of {', '.join(sorted(_METHODS))}")
+        if changeset is not None and method == "GET":
+            raise ValueError(f"operation {index}: GET requests cannot be part of a changeset")
+        body = spec.get("data")
+        if body is not None and method in {"GET", "DELETE"}:
+            raise ValueError(f"operation {index}: {method} requests do not take data")
+        headers = {str(name): str(value) for name, value in (spec.get("headers") or {}).items()}
+        if spec.get("return_record"):
+            headers["Prefer"] = "return=representation"
+        content_id = spec.get("content_id")
+        if content_id is not None:
+            content_id = str(content_id)
+            if content_id in used_ids:
+                raise ValueError(f"operation {index}: content_id '{content_id}' is used more than once")
+            used_ids.add(content_id)
+        operation = BatchOperation(
+            index=index,
+            method=method,
+            url=_operation_url(client, spec),
+            body=body,
+            content_id=content_id,
+            headers=headers,
+            changeset=changeset,
+        )
+        index += 1
+        return operation
+
+    for position, item in enumerate(items):
+        if isinstance(item, dict) and "changeset" in item:
+            members = item["changeset"]
+            if not isinstance(members, list) or not members:
+                raise ValueError(f"changeset at position {position} must be a non-empty list")
+            if len(members) > MAX_BATCH_OPERATIONS:
+                raise ValueError(f"changeset at position {position} exceeds {MAX_BATCH_OPERATIONS} operations")
+            planned.append([build(spec, position) for spec in members])
+        else:
+            planned.append(build(item, None))
+
+    # Changeset members need a Content-ID; assign unused ones where the caller gave none.
+    next_id = 1
+    for entry in planned:
+        if isinstance(entry, list):
+            for operation in entry:
+                if operation.content_id is None:
+                    while str(next_id) in used_ids:
+                        next_id += 1
+                    operation.content_id = str(next_id)
+                    used_ids.add(operation.content_id)
+    return planned
+
+
+def _size(entry: BatchOperation | list[BatchOperation]) -> int:
+    return len(entry) if isinstance(entry, list) else 1
+
+
+def split_requests(
+    planned: list[BatchOperation | list[BatchOperation]],
+    max_operations: int = MAX_BATCH_OPERATIONS,
+) -> Iterator[list[BatchOperation | list[BatchOperation]]]:
+    """Pack entries into ``$batch`` requests of at most ``max_operations``, never splitting a changeset."""
+    current: list[BatchOperation | list[BatchOperation]] = []
+    count = 0
+    for entry in planned:
+        size = _size(entry)
+        if current and count + size > max_operations:
+            yield current
+            current, count = [], 0
+        current.append(entry)
+        count += size
+    if current:
+        yield current
+
+
+def render_batch(api_root: str, entries: list[BatchOperation | list[BatchOperation]]) -> tuple[str, str]:
+    """Return ``(boundary, body)`` for a multipart ``$batch`` request."""
+    boundary = f"batch_{uuid.uuid4().hex}"
+    parts: list[str] = []
+    for entry in entries:
+        if isinstance(entry, list):
+            changeset = f"changeset_{uuid.uuid4().hex}"
+            inner = "".join(f"--{changeset}{_CRLF}{operation.render(api_root)}{_CRLF}" for operation in entry)
+            parts.append(
+                f"--{boundary}{_CRLF}Content-Type: multipart/mixed; boundary={changeset}{_CRLF}{_CRLF}"
+                f"{inner}--{changeset}--{_CRLF}"
+            )
+        else:
+            parts.append(f"--{boundary}{_CRLF}{entry.render(api_root)}{_CRLF}")
+    return boundary, "".join(parts) + f"--{boundary}--{_CRLF}"
+
+
+def _split_headers(block: str) -> tuple[dict[str, str], str]:
+    head, _, rest = block.partition("\n\n")
+    headers: dict[str, str] = {}
+    for line in head.splitlines():
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers, rest
+
+
+def _multipart_parts(body: str, boundary: str) -> list[str]:
+    parts = []
+    for chunk in body.split(f"--{boundary}")[1:]:
+        if chunk.startswith("--"):
+            break
+        parts.append(chunk.strip("\n"))
+    return parts
+
+
+def _parse_http_part(part_headers: dict[str, str], content: str) -> dict[str, Any]:
+    status_line, _, rest = content.partition("\n")
+    match = _STATUS_RE.match(status_line.strip())
+    status = int(match.group(1)) if match else 0
+    headers, payload = _split_headers(rest)
+    payload = payload.strip()
+    result: dict[str, Any] = {"status": status, "succeeded": 200 <= status < 300}
+    if part_headers.get("content-id"):
+        result["content_id"] = part_headers["content-id"]
+    entity_id = headers.get("odata-entityid")
+    if entity_id:
+        result["entity_url"] = entity_id
+        id_match = _ENTITY_ID_RE.search(entity_id)
+        if id_match:
+            result["id"] = id_match.group(1)
+    if payload:
+        try:
+            result["body"] = json.loads(payload)
+        except ValueError:
+            result["body"] = payload
+    if not result["succeeded"]:
+        error = result.get("body")
+        if isinstance(error, dict) and isinstance(error.get("error"), dict):
+            result["error"] = error["error"].get("message")
+        else:
+            result["error"] = status_line.strip()
+    return result
+
+
+def parse_batch_response(content_type: str, body: str) -> list[dict[str, Any] | list[dict[str, Any]]]:
+    """Parse a multipart ``$batch`` response; changeset responses come back as nested lists."""
+    match = _BOUNDARY_RE.search(content_type or "")
+    if not match:
+        raise ValueError("$batch response has no multipart boundary")
+    text = body.replace("\r\n", "\n")
+    results: list[dict[str, Any] | list[dict[str, Any]]] = []
+    for part in _multipart_parts(text, match.group(1)):
+        headers, content = _split_headers(part)
+        content_type = headers.get("content-type", "")
+        if content_type.lower().startswith("multipart/mixed"):
+            inner = _BOUNDARY_RE.search(content_type)
+            if not inner:
+                raise ValueError("changeset response has no multipart boundary")
+            results.append(
+                [_parse_http_part(*_split_headers(inner_part)) for inner_part in _multipart_parts(content, inner.group(1))]
+            )
+        else:
+            results.append(_parse_http_part(headers, content))
+    return results
+
+
+def _describe(operation: BatchOperation) -> dict[str, Any]:
+    described: dict[str, Any] = {"index": operation.index, "method": operation.method, "url": operation.url}
+    if operation.changeset is not None:
+        described["changeset"] = operation.changeset
+    if operation.content_id is not None:
+        described["content_id"] = operation.content_id
+    return described
+
+
+def _match_results(
+    entries: list[BatchOperation | list[BatchOperation]],
+    responses: list[dict[str, Any] | list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Pair each operation with its response; operations the server never ran are marked not_executed."""
+    results: list[dict[str, Any]] = []
+    for position, entry in enumerate(entries):
+        response = responses[position] if position < len(responses) else None
+        if isinstance(entry, list):
+            by_id = {item.get("content_id"): item for item in response} if isinstance(response, list) else {}
+            # A failed changeset is rolled back and answered with a single error response.
+            failure = response if isinstance(response, dict) else None
+            for operation in entry:
+                matched = by_id.get(operation.content_id)
+                if matched is not None:
+                    results.append({**_describe(operation), **matched})
+                elif failure is not None:
+                    results.append({**_describe(operation), **failure, "rolled_back": True})
+                else:
+                    results.append({**_describe(operation), "succeeded": False, "not_executed": True})
+        elif isinstance(response, dict):
+            results.append({**_describe(entry), **response})
+        else:
+            results.append({**_describe(entry), "succeeded": False, "not_executed": True})
+    return results
+
+
+def skipped(entries: list[BatchOperation | list[BatchOperation]]) -> list[dict[str, Any]]:
+    """Results for entries that were not sent because an earlier request failed."""
+    return _match_results(entries, [])
+
+
+def execute_batch(
+    client: DataverseClient,
+    entries: list[BatchOperation | list[BatchOperation]],
+    continue_on_error: bool = False,
+) -> list[dict[str, Any]]:
+    """Send one ``$batch`` request and return per-operation results in input order."""
+    with client._scoped_odata() as od:
+        api_root = od.api
+    boundary, body = render_batch(api_root, entries)
+    headers = {"Content-Type": f"multipart/mixed; boundary={boundary}", "Accept": "application/json"}
+    if continue_on_error:
+        headers["Prefer"] = "odata.continue-on-error"
+    response = webapi.request(
+        client, "post", "$batch", data=body.encode("utf-8"), headers=headers, expected=_BATCH_STATUSES
+    )
+    content_type = response.headers.get("Content-Type", "")
+    if response.status_code != 200 and not content_type.lower().startswith("multipart/mixed"):
+        raise _batch_error(response)
+    responses = parse_batch_response(content_type, response.text)
+    return _match_results(entries, responses)
+
+
+def _batch_error(response: Any) -> Exception:
+    """The ``HttpError`` the SDK would have raised for a non-multipart error response."""
+    from PowerPlatform.Dataverse.core.errors import HttpError
+
+    message = f"HTTP {response.status_code}"
+    try:
+        error = response.json().get("error") or {}
+    except (AttributeError, ValueError):
+        error = {}
+    if isinstance(error, dict) and error.get("message"):
+        message = str(error["message"])
+    return HttpError(
+        message,
+        status_code=response.status_code,
+        service_error_code=error.get("code") if isinstance(error, dict) else None,
+        body_excerpt=(response.text or "")[:200],
+    )
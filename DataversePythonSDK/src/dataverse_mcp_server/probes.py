@@ -0,0 +1,63 @@
+"""Rate-limited Dataverse connectivity probes for readiness and deep health checks."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+from . import webapi
+from .throttling import is_throttle_error
+
+logger = logging.getLogger("dataverse_mcp_server.probes")
+
+
+def who_am_i(client: DataverseClient) -> dict[str, Any]:
+    """Call the WhoAmI function: the cheapest authenticated round trip the Web API offers."""
+    body = webapi.request_json(client, "get", "WhoAmI")
+    return {"user_id": body.get("UserId"), "organization_id": body.get("OrganizationId")}
+
+
+class ProbeCache:
+    """Runs ``probe`` at most once every ``min_interval`` seconds and caches the outcome.
+
+    Load balancers may poll readiness every few seconds; serving cached results
+    keeps probes from consuming the org's API quota. Concurrent callers share a
+    single in-flight probe.
+    """
+
+    def __init__(self, probe: Callable[[], dict[str, Any]], min_interval: float = 30.0) -> None:
+        self._probe = probe
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._result: dict[str, Any] | None = None
+        self._checked_at = 0.0
+        self._checked_monotonic = 0.0
+
+    def _run(self) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            details = self._probe()
+        except Exception as exc:
+            latency_ms = (time.perf_counter() - started) * 1000
+            if is_throttle_error(exc):
+                # Throttling proves auth and connectivity work; the org is busy, not broken.
+                return {"ok": True, "throttled": True, "latency_ms": round(latency_ms, 1)}
+            logger.warning("Dataverse probe failed error=%s", exc)
+            return {"ok": False, "latency_ms": round(latency_ms, 1), "error": f"{type(exc).__name__}: {exc}"}
+        latency_ms = (time.perf_counter() - started) * 1000
+        return {"ok": True, "latency_ms": round(latency_ms, 1), **details}
+
+    def result(self, force: bool = False) -> dict[str, Any]:
+        with self._lock:
+            age = time.monotonic() - self._checked_monotonic
+            if force or self._result is None or age >= self.min_interval:
+                self._result = self._run()
+                self._checked_at = time.time()
+                self._checked_monotonic = time.monotonic()
+                age = 0.0
+            return {**self._result, "checked_at": self._checked_at, "age_seconds": round(age, 1), "cached": age > 0}
@@ -0,0 +1,322 @@
+"""Schema provisioning: diff a document of tables, columns and relationships against an org and create the rest."""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+from . import webapi
+
+logger = logging.getLogger("dataverse_mcp_server.provisioning")
+
+COLUMN_TYPES = frozenset({"string", "text", "int", "integer", "decimal", "money", "float", "double", "datetime", "date", "bool", "boolean"})
+CASCADE_DELETE = frozenset({"Cascade", "RemoveLink", "Restrict"})
+# Keeps EntityDefinitions/RelationshipDefinitions $filter URLs well under length limits.
+_FILTER_BATCH = 25
+
+
+@dataclass
+class TableSpec:
+    name: str
+    columns: dict[str, Any] = field(default_factory=dict)
+    primary_column: str | None = None
+
+
+@dataclass
+class RelationshipSpec:
+    name: str
+    referenced_table: str
+    referencing_table: str
+    lookup: str
+    display_name: str | None = None
+    cascade_delete: str = "RemoveLink"
+
+
+@dataclass
+class SchemaPlan:
+    """What a schema document still needs in the target org."""
+
+    create_tables: list[TableSpec] = field(default_factory=list)
+    add_columns: dict[str, dict[str, Any]] = field(default_factory=dict)
+    create_relationships: list[RelationshipSpec] = field(default_factory=list)
+    existing_tables: list[str] = field(default_factory=list)
+    existing_columns: int = 0
+    existing_relationships: list[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.create_tables or self.add_columns or self.create_relationships)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "create_tables": [table.name for table in self.create_tables],
+            "add_columns": {table: sorted(columns) for table, columns in self.add_columns.items()},
+            "create_relationships": [relationship.name for relationship in self.create_relationships],
+            "existing_tables": self.existing_tables,
+            "existing_columns": self.existing_columns,
+            "existing_relationships": self.existing_relationships,
+        }
+
+
+def _column_type(table: str, column: str, spec: Any) -> Any:
+    """Translate a document column spec into what the SDK's column builders accept."""
+    if isinstance(spec, str):
+        if spec.lower().strip() not in COLUMN_TYPES:
+            raise ValueError(f"{table}.{column}: unsupported column type '{spec}'")
+        return spec
+    if isinstance(spec, dict) and str(spec.get("type", "")).lower() == "choice":
+        options = spec.get("options")
+        if not isinstance(options, dict) or not options:
+            raise ValueError(f"{table}.{column}: choice columns need a non-empty options object of label -> value")
+        try:
+            # The SDK builds a local option set from an IntEnum, using member names as labels.
+            return IntEnum(f"{column}Choice", {str(label): int(value) for label, value in options.items()})
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"{table}.{column}: invalid choice options ({exc})") from exc
+    raise ValueError(f"{table}.{column}: column spec must be a type name or {{\"type\": \"choice\", \"options\": {{...}}}}")
+
+
+def parse_schema(document: dict[str, Any]) -> tuple[list[TableSpec], list[RelationshipSpec]]:
+    """Validate a schema document and normalise it into table and relationship specs."""
+    if not isinstance(document, dict):
+        raise ValueError("schema must be an object with 'tables' and optional 'relationships'")
+    tables: list[TableSpec] = []
+    seen: set[str] = set()
+    for position, item in enumerate(document.get("tables") or []):
+        if not isinstance(item, dict) or not item.get("name"):
+            raise ValueError(f"tables[{position}] must be an object with a 'name'")
+        name = str(item["name"])
+        if name.lower() in seen:
+            raise ValueError(f"table '{name}' is listed more than once")
+        seen.add(name.lower())
+        columns = item.get("columns") or {}
+        if not isinstance(columns, dict):
+            raise ValueError(f"tables[{position}].columns must be an object of column name -> type")
+        tables.append(
+            TableSpec(
+                name=name,
+                columns={str(column): _column_type(name, str(column), spec) for column, spec in columns.items()},
+                primary_column=item.get("primary_column"),
+            )
+        )
+    relationships: list[RelationshipSpec] = []
+    for position, item in enumerate(document.get("relationships") or []):
+        missing = [key for key in ("name", "referenced_table", "referencing_table", "lookup") if not isinstance(item, dict) or not item.get(key)]
+        if missing:
+            raise ValueError(f"relationships[{position}] is missing {', '.join(missing)}")
+        cascade = str(item.get("cascade_delete") or "RemoveLink")
+        if cascade not in CASCADE_DELETE:
+            raise ValueError(f"relationships[{position}].cascade_delete must be one of {', '.join(sorted(CASCADE_DELETE))}")
+        relationships.append(
+            RelationshipSpec(
+                name=str(item["name"]),
+                referenced_table=str(item["referenced_table"]),
+                referencing_table=str(item["referencing_table"]),
+                lookup=str(item["lookup"]),
+                display_name=item.get("display_name"),
+                cascade_delete=cascade,
+            )
+        )
+    if not tables and not relationships:
+        raise ValueError("schema contains no tables or relationships")
+    return tables, relationships
+
+
+def _batched(values: list[str]) -> list[list[str]]:
+    return [values[start:start + _FILTER_BATCH] for start in range(0, len(values), _FILTER_BATCH)]
+
+
+def _existing_entities(client: DataverseClient, tables: list[str]) -> dict[str, str]:
+    """Map logical name -> MetadataId for the tables that already exist, a few requests for all of them."""
+    found: dict[str, str] = {}
+    for batch in _batched(sorted({table.lower() for table in tables})):
+        body = webapi.request_json(
+            client,
+            "get",
+            "EntityDefinitions",
+            params={
+                "$select": "LogicalName,MetadataId",
+                "$filter": " or ".join(f"LogicalName eq '{webapi.escape_odata(name)}'" for name in batch),
+            },
+        )
+        for item in body.get("value", []):
+            if isinstance(item, dict) and item.get("LogicalName"):
+                found[item["LogicalName"].lower()] = item.get("MetadataId")
+    return found
+
+
+def _existing_columns(client: DataverseClient, metadata_id: str) -> set[str]:
+    body = webapi.request_json(
+        client, "get", f"EntityDefinitions({metadata_id})/Attributes", params={"$select": "LogicalName"}
+    )
+    return {item["LogicalName"].lower() for item in body.get("value", []) if isinstance(item, dict) and item.get("LogicalName")}
+
+
+def _existing_relationships(client: DataverseClient, names: list[str]) -> set[str]:
+    found: set[str] = set()
+    unique = {name.lower(): name for name in names}
+    for batch in _batched(sorted(unique.values())):
+        body = webapi.request_json(
+            client,
+            "get",
+            "RelationshipDefinitions",
+            params={
+                "$select": "SchemaName",
+                "$filter": " or ".join(f"SchemaName eq '{webapi.escape_odata(name)}'" for name in batch),
+            },
+        )
+        found.update(item["SchemaName"].lower() for item in body.get("value", []) if isinstance(item, dict) and item.get("SchemaName"))
+    return found
+
+
+def plan_schema(
+    client: DataverseClient,
+    tables: list[TableSpec],
+    relationships: list[RelationshipSpec],
+    max_workers: int = 4,
+) -> SchemaPlan:
+    """Diff the specs against the org's metadata; only what is missing ends up in the plan."""
+    plan = SchemaPlan()
+    existing = _existing_entities(client, [table.name for table in tables])
+    present = [table for table in tables if table.name.lower() in existing]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(present) or 1)), thread_name_prefix="dv-plan") as pool:
+        columns_by_table = dict(
+            zip(
+                [table.name for table in present],
+                pool.map(lambda table: _existing_columns(client, existing[table.name.lower()]), present),
+            )
+        )
+    for table in tables:
+        if table.name.lower() not in existing:
+            plan.create_tables.append(table)
+            continue
+        plan.existing_tables.append(table.name)
+        have = columns_by_table[table.name]
+        missing = {column: spec for column, spec in table.columns.items() if column.lower() not in have}
+        plan.existing_columns += len(table.columns) - len(missing)
+        if missing:
+            plan.add_columns[table.name] = missing
+    if relationships:
+        have = _existing_relationships(client, [relationship.name for relationship in relationships])
+        for relationship in relationships:
+            if relationship.name.lower() in have:
+                plan.existing_relationships.append(relationship.name)
+            else:
+                plan.create_relationships.append(relationship)
+    return plan
+
+
+def _relationship_payload(client: DataverseClient, relationship: RelationshipSpec) -> dict[str, Any]:
+    with client._scoped_odata() as od:
+        label = od._label(relationship.display_name or relationship.lookup.split("_")[-1])
+    return {
+        "@odata.type": "Microsoft.Dynamics.CRM.OneToManyRelationshipMetadata",
+        "SchemaName": relationship.name,
+        "ReferencedEntity": relationship.referenced_table.lower(),
+        "ReferencedAttribute": webapi.primary_id_attribute(client, relationship.referenced_table),
+        "ReferencingEntity": relationship.referencing_table.lower(),
+        "CascadeConfiguration": {
+            "Assign": "NoCascade",
+            "Delete": relationship.cascade_delete,
+            "Merge": "NoCascade",
+            "Reparent": "NoCascade",
+            "Share": "NoCascade",
+            "Unshare": "NoCascade",
+        },
+        "Lookup": {
+            "@odata.type": "Microsoft.Dynamics.CRM.LookupAttributeMetadata",
+            "SchemaName": relationship.lookup,
+            "DisplayName": label,
+            "RequiredLevel": {"Value": "None"},
+        },
+    }
+
+
+def _step(kind: str, name: str, action: Callable[[], Any]) -> dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        action()
+    except Exception as exc:
+        logger.warning("Schema step failed kind=%s name=%s error=%s", kind, name, exc)
+        return {"kind": kind, "name": name, "succeeded": False, "error": f"{type(exc).__name__}: {exc}"}
+    return {"kind": kind, "name": name, "succeeded": True, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def apply_plan(
+    client: DataverseClient,
+    plan: SchemaPlan,
+    solution: str | None = None,
+    max_workers: int = 4,
+    call: Callable[..., Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Create what the plan lists and return one result per table, column set and relationship.
+
+    Tables (with their columns in the same request) and column additions to
+    existing tables are independent and run in parallel; columns for one table
+    are added by a single worker. Relationships need both tables, so they run
+    after every table step has finished. A failed step is reported and does not
+    stop the others; rerunning provisioning only retries what is still missing.
+    """
+    call = call or (lambda fn, *args, **kwargs: fn(*args, **kwargs))
+    steps: list[tuple[str, str, Callable[[], Any]]] = []
+    for table in plan.create_tables:
+        steps.append((
+            "table",
+            table.name,
+            lambda table=table: call(client.create_table, table.name, table.columns, solution, table.primary_column),
+        ))
+    for table, columns in plan.add_columns.items():
+        steps.append(("columns", table, lambda table=table, columns=columns: call(client.create_columns, table, columns)))
+
+    def run(group: list[tuple[str, str, Callable[[], Any]]]) -> list[dict[str, Any]]:
+        if not group:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(group))), thread_name_prefix="dv-provision") as pool:
+            return list(pool.map(lambda step: _step(*step), group))
+
+    results = run(steps)
+    failed_tables = {result["name"].lower() for result in results if not result["succeeded"] and result["kind"] == "table"}
+    params = {"SolutionUniqueName": solution} if solution else None
+    relationship_steps = []
+    for relationship in plan.create_relationships:
+        blocked = {relationship.referenced_table.lower(), relationship.referencing_table.lower()} & failed_tables
+        if blocked:
+            results.append({
+                "kind": "relationship",
+                "name": relationship.name,
+                "succeeded": False,
+                "error": f"skipped because table creation failed for {', '.join(sorted(blocked))}",
+            })
+            continue
+        relationship_steps.append((
+            "relationship",
+            relationship.name,
+            lambda relationship=relationship: call(
+                webapi.request,
+                client,
+                "post",
+                "RelationshipDefinitions",
+                json=_relationship_payload(client, relationship),
+                params=params,
+            ),
+        ))
+    results.extend(run(relationship_steps))
+    return results
+
+
+def publish(client: DataverseClient, tables: list[str]) -> None:
+    """Publish customizations for ``tables`` in one PublishXml call."""
+    entities = "".join(f"<entity>{table.lower()}</entity>" for table in sorted(set(tables)))
+    webapi.request(
+        client,
+        "post",
+        "PublishXml",
+        json={"ParameterXml": f"<importexportxml><entities>{entities}</entities></importexportxml>"},
+    )
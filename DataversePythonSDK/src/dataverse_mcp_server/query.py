@@ -0,0 +1,73 @@
+"""Paged reads from Dataverse using OData query options or FetchXML."""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING, Any, Iterator
+from urllib.parse import unquote
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+from . import webapi
+
+_PAGING_COOKIE = "@Microsoft.Dynamics.CRM.fetchxmlpagingcookie"
+_MORE_RECORDS = "@Microsoft.Dynamics.CRM.morerecords"
+_FETCH_ANNOTATIONS = 'odata.include-annotations="Microsoft.Dynamics.CRM.fetchxmlpagingcookie,Microsoft.Dynamics.CRM.morerecords"'
+
+
+def iter_odata_pages(
+    client: DataverseClient,
+    table: str,
+    select: list[str] | None = None,
+    filter: str | None = None,
+    orderby: list[str] | None = None,
+    page_size: int | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield pages of records for an OData query, following ``@odata.nextLink``."""
+    yield from client.get(table, select=select, filter=filter, orderby=orderby, page_size=page_size)
+
+
+def _paging_cookie(annotation: str) -> str | None:
+    """Extract the ``pagingcookie`` attribute from a FetchXML paging cookie annotation."""
+    try:
+        cookie = ET.fromstring(annotation)
+    except ET.ParseError:
+        return None
+    value = cookie.get("pagingcookie")
+    # The cookie value is URL-encoded twice by the Web API.
+    return unquote(unquote(value)) if value else None
+
+
+def iter_fetchxml_pages(
+    client: DataverseClient,
+    table: str,
+    fetchxml: str,
+    page_size: int | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield pages of records for a FetchXML query, following paging cookies."""
+    fetch = ET.fromstring(fetchxml)
+    if fetch.tag != "fetch":
+        raise ValueError("fetchxml must have a <fetch> root element")
+    if fetch.get("top") is None:
+        fetch.set("count", str(page_size or fetch.get("count") or 5000))
+    entity_set = webapi.entity_set_name(client, table)
+    page = int(fetch.get("page") or 1)
+    while True:
+        fetch.set("page", str(page))
+        body = webapi.request_json(
+            client,
+            "get",
+            entity_set,
+            params={"fetchXml": ET.tostring(fetch, encoding="unicode")},
+            headers={"Prefer": _FETCH_ANNOTATIONS},
+        )
+        records = [item for item in body.get("value", []) if isinstance(item, dict)]
+        if records:
+            yield records
+        if fetch.get("top") is not None or not body.get(_MORE_RECORDS):
+            return
+        cookie = _paging_cookie(body.get(_PAGING_COOKIE) or "")
+        if cookie:
+            fetch.set("paging-cookie", cookie)
+        page += 1
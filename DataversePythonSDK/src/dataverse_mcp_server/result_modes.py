@@ -0,0 +1,73 @@
+"""Size-bounded shapes for large ID lists returned by bulk tools."""
+
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Sequence
+
+IDS = "ids"
+COMPACT = "compact"
+SUMMARY = "summary"
+COUNT_ONLY = "count_only"
+FILE = "file"
+RESULT_MODES = (IDS, COMPACT, SUMMARY, COUNT_ONLY, FILE)
+
+# RFC 4122 byte order, i.e. Python's uuid.UUID(bytes=...), not the .NET mixed-endian Guid layout.
+COMPACT_ENCODING = "base64-uuid-bytes"
+_BINARY_SUFFIXES = {".bin", ".guids"}
+
+
+def encode_guids(ids: Sequence[str]) -> str:
+    """Pack GUIDs as concatenated 16-byte values, base64 encoded (about 22 characters per ID instead of 39)."""
+    return base64.b64encode(b"".join(uuid.UUID(value).bytes for value in ids)).decode("ascii")
+
+
+def decode_guids(encoded: str) -> list[str]:
+    raw = base64.b64decode(encoded)
+    if len(raw) % 16:
+        raise ValueError("compact GUID payload length is not a multiple of 16 bytes")
+    return [str(uuid.UUID(bytes=raw[offset:offset + 16])) for offset in range(0, len(raw), 16)]
+
+
+def write_ids(path: Path, ids: Sequence[str]) -> str:
+    """Write IDs to ``path`` as JSONL, or as raw 16-byte GUIDs for ``.bin``/``.guids``; return the format used."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() in _BINARY_SUFFIXES:
+        with path.open("wb") as sink:
+            for value in ids:
+                sink.write(uuid.UUID(value).bytes)
+        return "binary"
+    with path.open("w", encoding="utf-8") as sink:
+        sink.writelines(json.dumps(value) + "\n" for value in ids)
+    return "jsonl"
+
+
+def shape_ids(
+    ids: Sequence[str],
+    mode: str,
+    key: str,
+    summary_size: int = 5,
+    output_path: str | None = None,
+) -> dict[str, Any]:
+    """Return the result fields for ``ids`` under ``key`` in the requested result mode."""
+    if mode not in RESULT_MODES:
+        raise ValueError(f"result_mode must be one of {', '.join(RESULT_MODES)}")
+    if mode == IDS:
+        return {key: list(ids)}
+    shaped: dict[str, Any] = {f"{key}_count": len(ids)}
+    if mode == COMPACT:
+        shaped[f"{key}_compact"] = encode_guids(ids)
+        shaped["id_encoding"] = COMPACT_ENCODING
+    elif mode == SUMMARY:
+        size = max(0, summary_size)
+        shaped[f"{key}_first"] = list(ids[:size])
+        # Never repeat IDs already listed under _first.
+        shaped[f"{key}_last"] = list(ids[max(size, len(ids) - size):])
+    elif mode == FILE:
+        path = Path(output_path).expanduser()
+        shaped[f"{key}_format"] = write_ids(path, ids)
+        shaped[f"{key}_path"] = str(path)
+    return shaped
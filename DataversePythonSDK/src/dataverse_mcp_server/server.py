@@ -1,46 +1,101 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import os
-import sys
 from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from azure.core.credentials import TokenCredential
-from azure.identity import AzureCliCredential, ClientSecretCredential
-from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv
-from PowerPlatform.Dataverse.client import DataverseClient
-from starlette.responses import JSONResponse
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+from .startup import STARTUP
+
+from mcp.server.fastmcp import Context, FastMCP
+from starlette.responses import JSONResponse, PlainTextResponse
+
+STARTUP.mark("mcp_import")
+
+from . import logconfig
+from .batching import BatchResult, ChunkResult, run_batches
+from .bulkdelete import (
+    conditions_to_fetchxml,
+    count_matching,
+    fetchxml_entity,
+    fetchxml_to_query_expression,
+    submit_bulk_delete,
+    wait_for_async_operation,
+)
+from .changetracking import ChangeSink, DeltaLinkStore, iter_changes, sink_format
+from .executor import ToolExecutor
+from .idempotency import IdempotencyStore, fingerprint
+from .ingest import RowError, RowMapper, detect_format, iter_rows, windows
+from .jobs import JobManager
+from .metrics import REGISTRY
+from .odata_batch import MAX_BATCH_OPERATIONS, build_operations, execute_batch, skipped, split_requests
+from .probes import ProbeCache, who_am_i
+from .provisioning import apply_plan, parse_schema, plan_schema, publish
+from .metadata import MetadataCache, fetch_table_metadata
+from .query import iter_fetchxml_pages, iter_odata_pages
+from .result_modes import FILE, IDS, RESULT_MODES, shape_ids
+from .throttling import RateGovernor
+from .tokens import TokenBroker
+from .upsert import group_rows, update_by_ids, upsert_by_alternate_keys
+from .validation import RecordValidator
+
+if TYPE_CHECKING:
+    # azure-identity, the Dataverse SDK and requests add hundreds of milliseconds to a cold
+    # start, so they are imported on first use instead; see STARTUP.deferred_import.
+    from azure.core.credentials import TokenCredential
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+    from .clients import ClientRegistry
+
+STARTUP.mark("package_imports")
 
 
 def _configure_logging() -> logging.Logger:
     level_name = (os.getenv("LOG_LEVEL", "INFO") or "INFO").upper()
     level = getattr(logging, level_name, logging.INFO)
-    logging.basicConfig(
-        level=level,
-        stream=sys.stdout,
-        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
-    )
+    log_format = (os.getenv("LOG_FORMAT", "text") or "text").strip().lower()
+    logconfig.configure(level, log_format, logconfig.parse_sample_rates(os.getenv("LOG_SAMPLE_RATES")))
     logger = logging.getLogger("dataverse_mcp_server")
-    logger.info("Logging configured with level=%s", logging.getLevelName(level))
+    logger.info("Logging configured with level=%s format=%s", logging.getLevelName(level), log_format)
     return logger
 
 
-# Load environment variables from a .env file. Search in CWD and this file's ancestor dirs.
+@lru_cache(maxsize=1)
+def _dotenv_path() -> Path | None:
+    """Locate the .env file once: DATAVERSE_DOTENV if set, else the nearest one above CWD or this package."""
+    configured = os.getenv("DATAVERSE_DOTENV")
+    if configured is not None:
+        configured = configured.strip()
+        # An empty value (or "none") skips the search, e.g. in containers configured purely by env vars.
+        return Path(configured).expanduser() if configured and configured.lower() != "none" else None
+    seen: set[Path] = set()
+    for base in (Path.cwd(), Path(__file__).resolve().parent):
+        for directory in (base, *base.parents):
+            if directory in seen:
+                # The remaining ancestors were already checked from the other starting point.
+                break
+            seen.add(directory)
+            env_file = directory / ".env"
+            if env_file.is_file():
+                return env_file
+    return None
+
+
 def _find_and_load_dotenv() -> None:
-    # Candidates: current working directory and this file's directory
-    candidates = [Path.cwd(), Path(__file__).resolve().parent]
-    for base in candidates:
-        for p in (base,) + tuple(base.parents):
-            env_file = p / ".env"
-            if env_file.exists():
-                load_dotenv(dotenv_path=env_file)
-                return
-    # Fallback to default behavior (will look in CWD)
-    load_dotenv()
+    env_file = _dotenv_path()
+    if env_file is None:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=env_file)
 
 
 _find_and_load_dotenv()
+STARTUP.mark("dotenv")
 logger = _configure_logging()
 
 
@@ -56,6 +111,13 @@ def _env_int(name: str, default: int) -> int:
     return int(value)
 
 
+def _env_float(name: str, default: float) -> float:
+    value = _env(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
 def _server_host() -> str:
     return (
         _env("FASTMCP_HOST")
@@ -71,6 +133,42 @@ def _server_port() -> int:
     return _env_int("PORT", 8550)
 
 
+def _batch_size(override: int | None = None) -> int:
+    if override:
+        return override
+    return _env_int("DATAVERSE_BATCH_SIZE", 1000)
+
+
+def _batch_workers(override: int | None = None) -> int:
+    if override:
+        return override
+    return _env_int("DATAVERSE_BATCH_WORKERS", 4)
+
+
+_TOOL_CONCURRENCY_PREFIX = "DATAVERSE_TOOL_CONCURRENCY_"
+
+
+@lru_cache(maxsize=1)
+def _executor() -> ToolExecutor:
+    limits = {
+        name[len(_TOOL_CONCURRENCY_PREFIX):].lower(): int(value)
+        for name, value in os.environ.items()
+        if name.startswith(_TOOL_CONCURRENCY_PREFIX) and value.strip()
+    }
+    executor = ToolExecutor(
+        max_workers=_env_int("DATAVERSE_EXECUTOR_WORKERS", 16),
+        default_limit=_env_int("DATAVERSE_TOOL_CONCURRENCY", 4),
+        limits=limits,
+    )
+    logger.info(
+        "Tool executor configured workers=%d default_limit=%d overrides=%s",
+        executor.max_workers,
+        executor.default_limit,
+        limits,
+    )
+    return executor
+
+
 def _streamable_path() -> str:
     return (
         _env("FASTMCP_STREAMABLE_HTTP_PATH")
@@ -93,6 +191,9 @@ def _build_credential() -> TokenCredential:
     client_id = _env("AZURE_CLIENT_ID")
     client_secret = _env("AZURE_CLIENT_SECRET")
 
+    with STARTUP.deferred_import("azure.identity"):
+        from azure.identity import AzureCliCredential, ClientSecretCredential
+
     if tenant_id and client_id and client_secret:
         logger.info("Using ClientSecretCredential for Dataverse authentication")
         return ClientSecretCredential(tenant_id=tenant_id, client_id=client_id, client_secret=client_secret)
@@ -109,79 +210,1417 @@ def _build_credential() -> TokenCredential:
 
 
 @lru_cache(maxsize=1)
-def _client() -> DataverseClient:
+def _token_broker() -> TokenBroker:
+    broker = TokenBroker(
+        _build_credential(),
+        refresh_margin=_env_float("DATAVERSE_TOKEN_REFRESH_MARGIN", 300.0),
+        retry_interval=_env_float("DATAVERSE_TOKEN_RETRY_INTERVAL", 30.0),
+    )
+    logger.info("Token broker configured refresh_margin=%s", broker.refresh_margin)
+    return broker
+
+
+def _new_client(url: str) -> DataverseClient:
+    with STARTUP.deferred_import("PowerPlatform.Dataverse"):
+        from PowerPlatform.Dataverse.client import DataverseClient
+
+    client = DataverseClient(url, _token_broker())
+    # Acquire the first token now so the first tool call does not pay for it.
+    _token_broker().get_token(f"{url}/.default")
+    return client
+
+
+def _forget_token(url: str) -> None:
+    _token_broker().discard(f"{url}/.default")
+
+
+@lru_cache(maxsize=1)
+def _clients() -> ClientRegistry:
+    with STARTUP.deferred_import("dataverse_mcp_server.clients"):
+        from .clients import ClientRegistry, normalize_url, parse_environments
+
+    environments = parse_environments(_env("DATAVERSE_ENVIRONMENTS"))
+    default = (_env("DATAVERSE_DEFAULT_ENVIRONMENT") or "").lower() or None
     url = _env("DATAVERSE_URL")
-    if not url:
+    if url:
+        environments.setdefault("default", normalize_url(url))
+        default = default or "default"
+    elif default is None and len(environments) == 1:
+        default = next(iter(environments))
+    if not environments:
         logger.error("DATAVERSE_URL is not configured")
-        raise ValueError("DATAVERSE_URL is required, e.g. https://orgeaf9224a.crm.dynamics.com/")
+        raise ValueError(
+            "DATAVERSE_URL or DATAVERSE_ENVIRONMENTS is required, e.g. https://orgeaf9224a.crm.dynamics.com/"
+        )
+    if default is not None and default not in environments:
+        raise ValueError(f"DATAVERSE_DEFAULT_ENVIRONMENT '{default}' is not one of: {', '.join(environments)}")
+
+    registry = ClientRegistry(
+        _new_client,
+        environments,
+        default=default,
+        idle_seconds=_env_float("DATAVERSE_CLIENT_IDLE_SECONDS", 1800.0),
+        pool_size=_env_int("DATAVERSE_HTTP_POOL_SIZE", 32),
+        on_evict=_forget_token,
+    )
+    logger.info("Client registry configured environments=%s default=%s", environments, default)
+    return registry
+
+
+def _client(environment: str | None = None) -> DataverseClient:
+    return _clients().get(environment)
+
+
+def _governor(environment: str | None = None) -> RateGovernor:
+    return _governor_for(_clients().resolve(environment))
+
+
+@lru_cache(maxsize=None)
+def _governor_for(url: str) -> RateGovernor:
+    # Service-protection limits apply per org, so each environment gets its own budget.
+    governor = RateGovernor(
+        initial_budget=_env_int("DATAVERSE_THROTTLE_INITIAL_BUDGET", 4),
+        min_budget=_env_int("DATAVERSE_THROTTLE_MIN_BUDGET", 1),
+        max_budget=_env_int("DATAVERSE_THROTTLE_MAX_BUDGET", 16),
+        max_retries=_env_int("DATAVERSE_THROTTLE_MAX_RETRIES", 5),
+        max_delay=_env_float("DATAVERSE_THROTTLE_MAX_DELAY", 60.0),
+        name=url,
+    )
+    logger.info("Rate governor configured url=%s %s", url, governor.snapshot())
+    return governor
+
+def _metadata(environment: str | None = None) -> MetadataCache:
+    return _metadata_for(_clients().resolve(environment))
 
-    logger.info("Creating DataverseClient for url=%s", url)
-    return DataverseClient(url, _build_credential())
+
+@lru_cache(maxsize=None)
+def _metadata_for(url: str) -> MetadataCache:
+    return MetadataCache(
+        lambda table: fetch_table_metadata(_client(url), table),
+        ttl_seconds=_env_float("DATAVERSE_METADATA_TTL", 900.0),
+        max_entries=_env_int("DATAVERSE_METADATA_CACHE_SIZE", 256),
+    )
 
 @mcp.custom_route("/health", methods=["GET"])
 def health_check(request) -> JSONResponse:
     logger.info("Health check requested")
-    return JSONResponse({"status": "ok", "connectedto" : _env("DATAVERSE_URL")})
+    STARTUP.health_served()
+    payload = {
+        "status": "ok",
+        "connectedto": _env("DATAVERSE_URL"),
+        "startup": STARTUP.snapshot(),
+    }
+    # Only report clients and tokens once they exist; building them here would require configuration.
+    if _clients.cache_info().currsize:
+        environments = _clients().snapshot()
+        for environment in environments:
+            if environment["active"]:
+                environment["throttling"] = _governor_for(environment["url"]).snapshot()
+        payload["environments"] = environments
+    if _token_broker.cache_info().currsize:
+        payload["tokens"] = _token_broker().snapshot()
+    return JSONResponse(payload)
+
+
+@lru_cache(maxsize=None)
+def _probe(url: str) -> ProbeCache:
+    return ProbeCache(lambda: who_am_i(_client(url)), min_interval=_env_float("DATAVERSE_PROBE_INTERVAL", 30.0))
+
+
+def _probe_environment(url: str) -> dict[str, object]:
+    """Warm the environment's client, probe it (rate limited) and report its credential state."""
+    result: dict[str, object] = {"url": url, "probe": _probe(url).result()}
+    if _token_broker.cache_info().currsize:
+        result["credential"] = _token_broker().describe(f"{url}/.default")
+    return result
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+def readiness_check(request) -> JSONResponse:
+    try:
+        url = _clients().resolve(request.query_params.get("environment"))
+    except ValueError as exc:
+        return JSONResponse({"ready": False, "error": str(exc)}, status_code=503)
+    result = _probe_environment(url)
+    ready = bool(result["probe"]["ok"])
+    if not ready:
+        logger.warning("Readiness check failed url=%s", url)
+    return JSONResponse({"ready": ready, **result}, status_code=200 if ready else 503)
+
+
+@mcp.custom_route("/health/deep", methods=["GET"])
+def deep_health_check(request) -> JSONResponse:
+    logger.info("Deep health check requested")
+    try:
+        registry = _clients()
+    except ValueError as exc:
+        return JSONResponse({"status": "error", "error": str(exc)}, status_code=503)
+    # Probe the default org and orgs already in use; idle orgs are not woken up by health checks.
+    environments = []
+    for environment in registry.snapshot():
+        if environment["default"] or environment["active"]:
+            result = _probe_environment(environment["url"])
+            result["name"] = environment["name"]
+            result["throttling"] = _governor_for(environment["url"]).snapshot()
+            environments.append(result)
+    healthy = all(environment["probe"]["ok"] for environment in environments)
+    return JSONResponse(
+        {"status": "ok" if healthy else "degraded", "environments": environments},
+        status_code=200 if healthy else 503,
+    )
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+def metrics_endpoint(request) -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
    
 
+def _delete_records(client: DataverseClient, governor: RateGovernor, table: str, record_ids: Sequence[str]) -> None:
+    """Delete records one request at a time, each under the governor.
+
+    Unlike CreateMultiple or UpdateMultiple, per-record deletes are not one atomic
+    request, so retrying the whole chunk after a throttle would re-delete records that
+    are already gone. A 404 on a retry means an earlier attempt did go through.
+    """
+    for record_id in record_ids:
+        retried = False
+
+        def delete() -> None:
+            nonlocal retried
+            try:
+                client.delete(table, record_id)
+            except Exception as exc:
+                if retried and getattr(exc, "status_code", None) == 404:
+                    return
+                retried = True
+                raise
+
+        governor.call(delete)
+
+
+def _bulk_plan(
+    operation: str,
+    table: str,
+    params: dict[str, Any],
+) -> tuple[Sequence[Any], Callable[[Sequence[Any]], Any]]:
+    """Return the items to chunk and the per-chunk handler for a bulk operation."""
+    environment = params.get("environment")
+    client = _client(environment)
+    governor = _governor(environment)
+    if operation == "create_multiple":
+        return params["records"], lambda chunk: governor.call(client.create, table, list(chunk))
+    if operation == "update_multiple":
+        data = params["data"]
+        return params["record_ids"], lambda chunk: governor.call(client.update, table, list(chunk), data)
+    if operation == "delete_multiple":
+        if params["use_bulk_delete"]:
+            return params["record_ids"], lambda chunk: governor.call(
+                client.delete, table, list(chunk), use_bulk_delete=True
+            )
+        return params["record_ids"], lambda chunk: _delete_records(client, governor, table, chunk)
+    raise ValueError(f"Unsupported bulk operation '{operation}'")
+
+
+@lru_cache(maxsize=1)
+def _jobs() -> JobManager:
+    job_dir = Path(_env("DATAVERSE_JOB_DIR") or Path.home() / ".dataverse-mcp-server" / "jobs")
+    logger.info("Job manager using job_dir=%s", job_dir)
+    return JobManager(job_dir, _bulk_plan, max_concurrent_jobs=_env_int("DATAVERSE_JOB_WORKERS", 2))
+
+
+@lru_cache(maxsize=1)
+def _idempotency() -> IdempotencyStore:
+    path = Path(_env("DATAVERSE_IDEMPOTENCY_DB") or Path.home() / ".dataverse-mcp-server" / "idempotency.sqlite3")
+    logger.info("Idempotency store using path=%s", path)
+    return IdempotencyStore(
+        path,
+        ttl_seconds=_env_float("DATAVERSE_IDEMPOTENCY_TTL", 86400.0),
+        wait_seconds=_env_float("DATAVERSE_IDEMPOTENCY_WAIT_SECONDS", 600.0),
+    )
+
+
+@lru_cache(maxsize=1)
+def _sync_store() -> DeltaLinkStore:
+    path = Path(_env("DATAVERSE_SYNC_DB") or Path.home() / ".dataverse-mcp-server" / "sync.sqlite3")
+    logger.info("Delta link store using path=%s", path)
+    return DeltaLinkStore(path)
+
+
+def _submit_job(
+    operation: str,
+    table: str,
+    params: dict[str, Any],
+    total: int,
+    chunk_size: int | None,
+    max_workers: int | None,
+) -> dict[str, object]:
+    return _jobs().submit(
+        operation,
+        table,
+        params,
+        total=total,
+        chunk_size=_batch_size(chunk_size),
+        max_workers=_batch_workers(max_workers),
+    )
+
+
+def _chunk_summaries(batch: BatchResult, row_indexes: Sequence[int]) -> list[dict[str, object]]:
+    """Per-chunk summaries where failed chunks list the input row indexes they covered."""
+    summaries = []
+    for chunk in batch.chunks:
+        summary = chunk.to_dict()
+        if not chunk.succeeded:
+            summary["row_indexes"] = list(row_indexes[chunk.offset:chunk.offset + chunk.size])
+        summaries.append(summary)
+    return summaries
+
+
+def _validate_records(
+    table: str,
+    records: list[dict[str, object]],
+    validate: bool,
+    environment: str | None = None,
+) -> tuple[list[dict[str, object]], list[int], list[dict[str, object]]]:
+    """Split ``records`` into (valid rows, their input indexes, rejected rows)."""
+    if not validate:
+        return records, list(range(len(records))), []
+    result = RecordValidator(_metadata(environment).get(table), "create").split(records)
+    if result.rejected:
+        logger.info(
+            "Validation rejected rows table=%s rejected=%d valid=%d",
+            table,
+            len(result.rejected),
+            len(result.valid),
+        )
+    return result.valid, result.valid_indexes, result.rejected
+
+
+def _pin_rows(
+    records: list[dict[str, object]],
+    row_indexes: list[int],
+    rejected: list[dict[str, object]],
+    pinned: list[int] | None,
+) -> tuple[list[dict[str, object]], list[int], list[dict[str, object]]]:
+    """Send the rows chosen when the idempotency key was first used, so replayed chunk indexes still match.
+
+    Validation depends on cached metadata, which may have changed since that attempt.
+    """
+    if pinned is None or pinned == row_indexes:
+        return [records[index] for index in row_indexes], row_indexes, rejected
+    logger.info(
+        "Validation differs from the first attempt; reusing its rows pinned=%d current=%d",
+        len(pinned),
+        len(row_indexes),
+    )
+    keep = set(pinned)
+    previously_rejected = [
+        {"row_index": index, "reasons": ["rejected when this idempotency_key was first used"]}
+        for index in row_indexes
+        if index not in keep
+    ]
+    rejected = sorted(
+        [row for row in rejected if row["row_index"] not in keep] + previously_rejected,
+        key=lambda row: row["row_index"],
+    )
+    return [records[index] for index in pinned], list(pinned), rejected
+
+
+def _validate_update_payload(
+    table: str,
+    data: dict[str, object],
+    validate: bool,
+    environment: str | None = None,
+) -> None:
+    if not validate:
+        return
+    errors = RecordValidator(_metadata(environment).get(table), "update").errors(data)
+    if errors:
+        raise ValueError(f"Invalid update payload for table '{table}': " + "; ".join(errors))
+
+
+def _create_multiple(
+    table: str,
+    records: list[dict[str, object]],
+    chunk_size: int | None,
+    max_workers: int | None,
+    validate: bool = True,
+    environment: str | None = None,
+    idempotency_key: str | None = None,
+    result_mode: str = IDS,
+    summary_size: int = 5,
+    output_path: str | None = None,
+) -> dict[str, object]:
+    if result_mode not in RESULT_MODES:
+        raise ValueError(f"result_mode must be one of {', '.join(RESULT_MODES)}")
+    if result_mode == FILE and not output_path:
+        raise ValueError("result_mode='file' requires output_path")
+    logger.info(
+        "create_multiple started table=%s records=%d idempotency_key=%s result_mode=%s",
+        table,
+        len(records),
+        idempotency_key,
+        result_mode,
+    )
+    valid, row_indexes, rejected = _validate_records(table, records, validate, environment)
+    if not idempotency_key:
+        items, handler = _bulk_plan("create_multiple", table, {"records": valid, "environment": environment})
+        batch = run_batches(
+            "create_multiple",
+            items,
+            handler,
+            chunk_size=_batch_size(chunk_size),
+            max_workers=_batch_workers(max_workers),
+        )
+        created_ids = [record_id for ids in batch.results() for record_id in ids]
+        replayed: dict[int, object] = {}
+    else:
+        store = _idempotency()
+
+        def commit(chunk: ChunkResult) -> None:
+            if chunk.succeeded:
+                store.record(idempotency_key, chunk.index, chunk.result)
+
+        request = fingerprint(environment, table, records, validate)
+        claim = store.claim(idempotency_key, request, _batch_size(chunk_size), row_indexes)
+        with claim as (size, job_id, replayed, pinned):
+            if job_id:
+                raise ValueError(
+                    f"idempotency_key '{idempotency_key}' belongs to background job {job_id}; poll it with get_job_status"
+                )
+            valid, row_indexes, rejected = _pin_rows(records, row_indexes, rejected, pinned)
+            items, handler = _bulk_plan("create_multiple", table, {"records": valid, "environment": environment})
+            batch = run_batches(
+                "create_multiple",
+                items,
+                handler,
+                chunk_size=size,
+                max_workers=_batch_workers(max_workers),
+                skip=replayed.keys(),
+                on_chunk=commit,
+            )
+        results = {**replayed, **{chunk.index: chunk.result for chunk in batch.chunks if chunk.succeeded}}
+        created_ids = [record_id for index in sorted(results) for record_id in results[index]]
+    logger.info(
+        "create_multiple completed table=%s created=%d failed=%d rejected=%d replayed_chunks=%d",
+        table,
+        len(created_ids),
+        batch.failed,
+        len(rejected),
+        len(replayed),
+    )
+    chunks = _chunk_summaries(batch, row_indexes)
+    if result_mode != IDS:
+        # Compact modes keep the response small; successful chunks are only counted.
+        chunks = [chunk for chunk in chunks if chunk["status"] == "failed"]
+    result = {
+        "table": table,
+        "records": len(records),
+        **shape_ids(created_ids, result_mode, "created_ids", summary_size, output_path),
+        "rejected": rejected,
+        **batch.to_dict(),
+        "chunks": chunks,
+    }
+    if result_mode != IDS:
+        result["result_mode"] = result_mode
+    if idempotency_key:
+        result["replayed_chunks"] = sorted(replayed)
+    return result
+
+
+def _submit_create_job(
+    table: str,
+    records: list[dict[str, object]],
+    chunk_size: int | None,
+    max_workers: int | None,
+    validate: bool,
+    environment: str | None = None,
+    idempotency_key: str | None = None,
+) -> dict[str, object]:
+    valid, row_indexes, rejected = _validate_records(table, records, validate, environment)
+    params = {"records": valid, "environment": environment}
+    if not idempotency_key:
+        job = _submit_job("create_multiple", table, params, len(valid), chunk_size, max_workers)
+        return {**job, "rejected": rejected}
+
+    store = _idempotency()
+    request = fingerprint(environment, table, records, validate)
+    claim = store.claim(idempotency_key, request, _batch_size(chunk_size), row_indexes)
+    with claim as (size, job_id, committed, pinned):
+        valid, row_indexes, rejected = _pin_rows(records, row_indexes, rejected, pinned)
+        if job_id:
+            logger.info("create_multiple replaying job idempotency_key=%s job_id=%s", idempotency_key, job_id)
+            return {**_jobs().status(job_id), "rejected": rejected, "replayed": True}
+        if committed:
+            raise ValueError(
+                f"idempotency_key '{idempotency_key}' was used for a foreground request; retry without background=true"
+            )
+        params = {"records": valid, "environment": environment}
+        job = _submit_job("create_multiple", table, params, len(valid), size, max_workers)
+        store.set_job(idempotency_key, job["job_id"])
+    return {**job, "rejected": rejected}
+
+
+def _update_multiple(
+    table: str,
+    record_ids: list[str],
+    data: dict[str, object],
+    chunk_size: int | None,
+    max_workers: int | None,
+    validate: bool = True,
+    environment: str | None = None,
+) -> dict[str, object]:
+    logger.info("update_multiple started table=%s records=%d", table, len(record_ids))
+    _validate_update_payload(table, data, validate, environment)
+    items, handler = _bulk_plan(
+        "update_multiple", table, {"record_ids": record_ids, "data": data, "environment": environment}
+    )
+    batch = run_batches(
+        "update_multiple",
+        items,
+        handler,
+        chunk_size=_batch_size(chunk_size),
+        max_workers=_batch_workers(max_workers),
+    )
+    logger.info(
+        "update_multiple completed table=%s updated=%d failed=%d",
+        table,
+        batch.succeeded,
+        batch.failed,
+    )
+    return {"table": table, **batch.to_dict()}
+
+
+def _submit_update_job(
+    table: str,
+    record_ids: list[str],
+    data: dict[str, object],
+    chunk_size: int | None,
+    max_workers: int | None,
+    validate: bool,
+    environment: str | None = None,
+) -> dict[str, object]:
+    _validate_update_payload(table, data, validate, environment)
+    return _submit_job(
+        "update_multiple",
+        table,
+        {"record_ids": record_ids, "data": data, "environment": environment},
+        len(record_ids),
+        chunk_size,
+        max_workers,
+    )
+
+
+def _update_records(
+    table: str,
+    rows: list[dict[str, object]],
+    chunk_size: int | None,
+    max_workers: int | None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    logger.info("update_records started table=%s rows=%d", table, len(rows))
+    client = _client(environment)
+    governor = _governor(environment)
+    groups, rejected = group_rows(rows)
+    group_summaries: list[dict[str, object]] = []
+    upserted_ids: list[str] = []
+    succeeded = failed = 0
+    for group in groups:
+        if group.mode == "id":
+            handler = lambda chunk: governor.call(update_by_ids, client, table, chunk)
+        else:
+            handler = lambda chunk: governor.call(upsert_by_alternate_keys, client, table, chunk)
+        batch = run_batches(
+            "update_records",
+            group.rows,
+            handler,
+            chunk_size=_batch_size(chunk_size),
+            max_workers=_batch_workers(max_workers),
+        )
+        if group.mode == "alternate_key":
+            upserted_ids.extend(record_id for ids in batch.results() for record_id in ids)
+        group_summaries.append(
+            {
+                "mode": group.mode,
+                "fields": list(group.fields),
+                "rows": len(group.rows),
+                "succeeded": batch.succeeded,
+                "failed": batch.failed,
+                "chunks": _chunk_summaries(batch, group.row_indexes),
+            }
+        )
+        succeeded += batch.succeeded
+        failed += batch.failed
+    logger.info(
+        "update_records completed table=%s succeeded=%d failed=%d rejected=%d groups=%d",
+        table,
+        succeeded,
+        failed,
+        len(rejected),
+        len(groups),
+    )
+    return {
+        "table": table,
+        "total": len(rows),
+        "succeeded": succeeded,
+        "failed": failed,
+        "rejected": rejected,
+        "upserted_ids": upserted_ids,
+        "groups": group_summaries,
+    }
+
+
+# Upper bound on rejected rows and failed chunks echoed back by file imports.
+_MAX_REPORTED_ROWS = 100
+
+
+def _bulk_import_file(
+    table: str,
+    path: str,
+    file_format: str | None,
+    column_map: dict[str, str] | None,
+    start_offset: int,
+    max_rows: int | None,
+    chunk_size: int | None,
+    max_workers: int | None,
+    on_progress: Callable[[int, int], None] | None = None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    source = Path(path).expanduser()
+    if not source.is_file():
+        raise ValueError(f"File not found: {source}")
+    fmt = detect_format(source, file_format)
+    logger.info(
+        "bulk_import_file started table=%s path=%s format=%s start_offset=%d",
+        table,
+        source,
+        fmt,
+        start_offset,
+    )
+    client = _client(environment)
+    governor = _governor(environment)
+    metadata = _metadata(environment).get(table)
+    mapper = RowMapper(metadata.attribute_types(), column_map)
+    validator = RecordValidator(metadata, "create")
+    size = _batch_size(chunk_size)
+    workers = _batch_workers(max_workers)
+    progress_every = _env_int("DATAVERSE_IMPORT_PROGRESS_ROWS", 10000)
+
+    rows = iter_rows(source, fmt, start_offset)
+    if max_rows is not None:
+        rows = islice(rows, max_rows)
+
+    offset = start_offset
+    rows_read = created = failed = rejected = 0
+    rejected_rows: list[dict[str, object]] = []
+    failed_chunks: list[dict[str, object]] = []
+    next_report = progress_every
+    read_error: str | None = None
+    # Only one window of rows is held in memory at a time: one chunk per worker.
+    for window in windows(rows, size * workers):
+        payloads: list[dict[str, object]] = []
+        positions: list[int] = []
+        if window and isinstance(window[-1], RowError) and window[-1].fatal:
+            # The reader stopped; send what was read before it and resume from the failed row.
+            read_error = window.pop().reason
+        for position, row in enumerate(window, start=offset):
+            if isinstance(row, RowError):
+                rejected += 1
+                if len(rejected_rows) < _MAX_REPORTED_ROWS:
+                    rejected_rows.append({"row_offset": position, "reason": row.reason})
+                continue
+            try:
+                payload = mapper.map_row(row)
+                errors = validator.errors(payload)
+                if errors:
+                    raise ValueError("; ".join(errors))
+            except ValueError as exc:
+                rejected += 1
+                if len(rejected_rows) < _MAX_REPORTED_ROWS:
+                    rejected_rows.append({"row_offset": position, "reason": str(exc)})
+                continue
+            payloads.append(payload)
+            positions.append(position)
+
+        batch = run_batches(
+            "bulk_import_file",
+            payloads,
+            lambda chunk: governor.call(client.create, table, list(chunk)),
+            chunk_size=size,
+            max_workers=workers,
+        )
+        created += batch.succeeded
+        failed += batch.failed
+        for chunk in batch.chunks:
+            if not chunk.succeeded and len(failed_chunks) < _MAX_REPORTED_ROWS:
+                failed_chunks.append(
+                    {
+                        "row_offsets": positions[chunk.offset:chunk.offset + chunk.size],
+                        "error": chunk.error,
+                    }
+                )
+
+        rows_read += len(window)
+        offset += len(window)
+        if rows_read >= next_report:
+            logger.info(
+                "bulk_import_file progress table=%s rows_read=%d created=%d failed=%d rejected=%d next_offset=%d",
+                table,
+                rows_read,
+                created,
+                failed,
+                rejected,
+                offset,
+            )
+            if on_progress is not None:
+                on_progress(rows_read, created)
+            next_report = rows_read + progress_every
+        if read_error is not None:
+            break
+
+    if read_error is not None:
+        logger.warning(
+            "bulk_import_file stopped table=%s next_offset=%d error=%s",
+            table,
+            offset,
+            read_error,
+        )
+    logger.info(
+        "bulk_import_file completed table=%s rows_read=%d created=%d failed=%d rejected=%d",
+        table,
+        rows_read,
+        created,
+        failed,
+        rejected,
+    )
+    summary: dict[str, object] = {
+        "table": table,
+        "path": str(source),
+        "format": fmt,
+        "start_offset": start_offset,
+        "next_offset": offset,
+        "rows_read": rows_read,
+        "created": created,
+        "failed": failed,
+        "rejected": rejected,
+        "rejected_rows": rejected_rows,
+        "failed_chunks": failed_chunks,
+        "ignored_columns": sorted(mapper.ignored_columns),
+    }
+    if read_error is not None:
+        summary["error"] = f"reading stopped at row {offset}: {read_error}"
+    return summary
+
+
+def _create_table(table: str, columns: dict[str, any], environment: str | None = None) -> str:
+    logger.info("create_table started table=%s columns=%d", table, len(columns))
+    _client(environment).create_table(table, columns)
+    _metadata(environment).invalidate(table)
+    logger.info("create_table completed table=%s", table)
+    return f"Table '{table}' created with columns: {', '.join(columns.keys())}"
+
+
+def _provision_schema(
+    schema: dict[str, Any],
+    dry_run: bool,
+    publish_changes: bool,
+    solution: str | None,
+    max_workers: int | None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    tables, relationships = parse_schema(schema)
+    workers = max_workers or _env_int("DATAVERSE_PROVISION_WORKERS", 4)
+    logger.info(
+        "provision_schema started tables=%d relationships=%d dry_run=%s workers=%d",
+        len(tables),
+        len(relationships),
+        dry_run,
+        workers,
+    )
+    client = _client(environment)
+    governor = _governor(environment)
+    plan = plan_schema(client, tables, relationships, max_workers=workers)
+    result: dict[str, object] = {"dry_run": dry_run, "plan": plan.summary()}
+    if dry_run or plan.empty:
+        logger.info("provision_schema completed dry_run=%s changes=%s", dry_run, not plan.empty)
+        return {**result, "succeeded": 0, "failed": 0, "published": False}
+
+    steps = apply_plan(client, plan, solution=solution, max_workers=workers, call=governor.call)
+    touched = {table.name for table in plan.create_tables} | set(plan.add_columns)
+    touched |= {relationship.referencing_table for relationship in plan.create_relationships}
+    metadata = _metadata(environment)
+    for table in touched:
+        metadata.invalidate(table)
+    succeeded = sum(1 for step in steps if step["succeeded"])
+    referencing = {relationship.name: relationship.referencing_table for relationship in plan.create_relationships}
+    changed = {referencing.get(step["name"], step["name"]) for step in steps if step["succeeded"]}
+    published = False
+    if publish_changes and changed:
+        # One publish for everything instead of one per table.
+        governor.call(publish, client, sorted(changed))
+        published = True
+    logger.info(
+        "provision_schema completed steps=%d succeeded=%d failed=%d published=%s",
+        len(steps),
+        succeeded,
+        len(steps) - succeeded,
+        published,
+    )
+    return {**result, "succeeded": succeeded, "failed": len(steps) - succeeded, "published": published, "steps": steps}
+
+
+def _query_records(
+    table: str,
+    select: list[str] | None,
+    filter: str | None,
+    orderby: list[str] | None,
+    fetchxml: str | None,
+    page_size: int | None,
+    max_rows: int | None,
+    ids_only: bool,
+    output_path: str | None,
+    on_page: Callable[[int, int], None] | None = None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    row_cap = _env_int("DATAVERSE_QUERY_MAX_ROWS", 100000)
+    limit = min(max_rows, row_cap) if max_rows else row_cap
+    inline_cap = _env_int("DATAVERSE_QUERY_INLINE_MAX_ROWS", 5000)
+    # Inline rows are held in memory and sent in one response, so large reads must go to a file.
+    if not output_path and limit > inline_cap:
+        if max_rows:
+            raise ValueError(
+                f"max_rows={max_rows} exceeds the inline limit of {inline_cap} rows; set output_path to write them to a file"
+            )
+        limit = inline_cap
+    logger.info(
+        "query_records started table=%s fetchxml=%s limit=%d output_path=%s",
+        table,
+        bool(fetchxml),
+        limit,
+        output_path,
+    )
+    client = _client(environment)
+    primary_id = _metadata(environment).get(table).primary_id_attribute if ids_only else None
+    if fetchxml:
+        pages = iter_fetchxml_pages(client, table, fetchxml, page_size)
+    else:
+        pages = iter_odata_pages(
+            client,
+            table,
+            select=[primary_id] if ids_only else select,
+            filter=filter,
+            orderby=orderby,
+            page_size=page_size or 5000,
+        )
+
+    sink = Path(output_path).expanduser().open("w", encoding="utf-8") if output_path else None
+    rows: list[object] = []
+    count = page_count = 0
+    truncated = False
+    try:
+        for page in pages:
+            page_count += 1
+            if count + len(page) > limit:
+                page = page[:limit - count]
+                truncated = True
+            values = [record.get(primary_id) for record in page] if ids_only else page
+            if sink is not None:
+                sink.writelines(json.dumps(value) + "\n" for value in values)
+            else:
+                rows.extend(values)
+            count += len(page)
+            if on_page is not None:
+                on_page(page_count, count)
+            if truncated or count >= limit:
+                truncated = True
+                break
+    finally:
+        if sink is not None:
+            sink.close()
+    logger.info("query_records completed table=%s rows=%d pages=%d truncated=%s", table, count, page_count, truncated)
+    result: dict[str, object] = {
+        "table": table,
+        "count": count,
+        "pages": page_count,
+        "truncated": truncated,
+    }
+    if output_path:
+        result["output_path"] = str(Path(output_path).expanduser())
+    else:
+        result["ids" if ids_only else "records"] = rows
+        if truncated and limit == inline_cap:
+            result["inline_limit"] = inline_cap
+    return result
+
+
+def _refresh_metadata(table: str, environment: str | None = None) -> dict[str, object]:
+    logger.info("refresh_metadata started table=%s", table)
+    metadata = _metadata(environment).refresh(table)
+    logger.info("refresh_metadata completed table=%s columns=%d", table, len(metadata.columns))
+    return metadata.summary()
+
+
+def _delete_multiple(
+    table: str,
+    record_ids: list[str],
+    use_bulk_delete: bool,
+    chunk_size: int | None,
+    max_workers: int | None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    logger.info(
+        "delete_multiple started table=%s records=%d use_bulk_delete=%s",
+        table,
+        len(record_ids),
+        use_bulk_delete,
+    )
+    items, handler = _bulk_plan(
+        "delete_multiple",
+        table,
+        {"record_ids": record_ids, "use_bulk_delete": use_bulk_delete, "environment": environment},
+    )
+    batch = run_batches(
+        "delete_multiple",
+        items,
+        handler,
+        chunk_size=_batch_size(chunk_size),
+        max_workers=_batch_workers(max_workers),
+    )
+    bulk_delete_job_ids = [job_id for job_id in batch.results() if job_id]
+    logger.info(
+        "delete_multiple completed table=%s deleted=%d failed=%d",
+        table,
+        batch.succeeded,
+        batch.failed,
+    )
+    return {"table": table, "bulk_delete_job_ids": bulk_delete_job_ids, **batch.to_dict()}
+
+
+def _delete_by_query(
+    table: str,
+    fetchxml: str | None,
+    conditions: dict[str, object] | None,
+    dry_run: bool,
+    wait_seconds: float,
+    environment: str | None = None,
+) -> dict[str, object]:
+    if bool(fetchxml) == bool(conditions):
+        raise ValueError("Provide exactly one of fetchxml or conditions.")
+    # BulkDelete deletes whatever the query selects, so refuse a query aimed at another table.
+    entity = fetchxml_entity(fetchxml) if fetchxml else table.lower()
+    if entity != table.lower():
+        raise ValueError(f"fetchxml targets entity '{entity}' but table is '{table}'; they must match")
+    query_xml = fetchxml or conditions_to_fetchxml(table, conditions or {})
+    logger.info("delete_by_query started table=%s dry_run=%s", table, dry_run)
+    client = _client(environment)
+    if dry_run:
+        primary_id = _metadata(environment).get(table).primary_id_attribute
+        matching = count_matching(client, table, query_xml, primary_id)
+        logger.info("delete_by_query dry run table=%s matching=%d", table, matching)
+        return {"table": table, "dry_run": True, "matching": matching, "fetchxml": query_xml}
+
+    governor = _governor(environment)
+    query = governor.call(fetchxml_to_query_expression, client, query_xml)
+    job_id = governor.call(submit_bulk_delete, client, table, query)
+    logger.info("delete_by_query submitted table=%s job_id=%s", table, job_id)
+    status = wait_for_async_operation(
+        client,
+        job_id,
+        timeout_seconds=wait_seconds,
+        poll_seconds=_env_float("DATAVERSE_ASYNC_POLL_SECONDS", 5.0),
+        call=governor.call,
+    )
+    logger.info(
+        "delete_by_query finished waiting table=%s job_id=%s status=%s",
+        table,
+        job_id,
+        status["status"],
+    )
+    return {"table": table, "dry_run": False, **status}
+
+
+def _batch_execute(
+    operations: list[dict[str, object]],
+    continue_on_error: bool,
+    environment: str | None = None,
+) -> dict[str, object]:
+    logger.info("batch_execute started operations=%d continue_on_error=%s", len(operations), continue_on_error)
+    client = _client(environment)
+    governor = _governor(environment)
+    planned = build_operations(client, operations)
+    max_operations = min(_env_int("DATAVERSE_BATCH_MAX_OPERATIONS", MAX_BATCH_OPERATIONS), MAX_BATCH_OPERATIONS)
+    results: list[dict[str, object]] = []
+    sent = 0
+    stopped = False
+    for entries in split_requests(planned, max_operations):
+        if stopped:
+            # $batch stops at the first failure; later requests are not sent either so ordering holds.
+            results.extend(skipped(entries))
+            continue
+        batch_results = governor.call(execute_batch, client, entries, continue_on_error)
+        sent += 1
+        results.extend(batch_results)
+        stopped = not continue_on_error and any(not result["succeeded"] for result in batch_results)
+    succeeded = sum(1 for result in results if result["succeeded"])
+    not_executed = sum(1 for result in results if result.get("not_executed"))
+    logger.info(
+        "batch_execute completed operations=%d batches=%d succeeded=%d failed=%d not_executed=%d",
+        len(results),
+        sent,
+        succeeded,
+        len(results) - succeeded - not_executed,
+        not_executed,
+    )
+    return {
+        "operations": len(results),
+        "batches": sent,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded - not_executed,
+        "not_executed": not_executed,
+        "results": results,
+    }
+
+
+def _sync_changes(
+    table: str,
+    output_path: str,
+    format: str | None,
+    select: list[str] | None,
+    page_size: int | None,
+    reset: bool,
+    on_page: Callable[[int, int], None] | None = None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    url = _clients().resolve(environment)
+    store = _sync_store()
+    # A reset ignores the stored link; it is replaced only once the full sync succeeds.
+    previous = None if reset else store.get(url, table)
+    if previous is not None and select is not None and sorted(previous["select"] or []) != sorted(select):
+        raise ValueError(
+            f"{table} was last synced with select={previous['select']}; pass reset=true to start over with new columns"
+        )
+    if previous is not None:
+        select = previous["select"]
+    sink_kind = sink_format(output_path, format)
+    logger.info(
+        "sync_changes started table=%s full_sync=%s output_path=%s format=%s",
+        table,
+        previous is None,
+        output_path,
+        sink_kind,
+    )
+    client = _client(environment)
+    sink = ChangeSink(Path(output_path).expanduser(), sink_kind)
+    upserted = deleted = pages = 0
+    delta_link = None
+    try:
+        for changes, delta_link in iter_changes(
+            client,
+            table,
+            select=select,
+            delta_link=previous["delta_link"] if previous else None,
+            page_size=page_size,
+        ):
+            sink.write(changes)
+            pages += 1
+            removed = sum(1 for change in changes if change["change"] == "delete")
+            deleted += removed
+            upserted += len(changes) - removed
+            if on_page is not None:
+                on_page(pages, upserted + deleted)
+        if not delta_link:
+            raise RuntimeError(f"Dataverse returned no delta link for {table}; is change tracking enabled on the table?")
+    except BaseException:
+        sink.discard()
+        raise
+    # The delta link only advances once the changes are safely on disk.
+    sink.commit()
+    synced_at = store.save(url, table, select, delta_link)
+    logger.info("sync_changes completed table=%s upserted=%d deleted=%d pages=%d", table, upserted, deleted, pages)
+    return {
+        "table": table,
+        "full_sync": previous is None,
+        "upserted": upserted,
+        "deleted": deleted,
+        "pages": pages,
+        "output_path": str(sink.path),
+        "format": sink_kind,
+        "select": select,
+        "previous_sync_at": previous["synced_at"] if previous else None,
+        "synced_at": synced_at,
+    }
+
+
 @mcp.tool(name="create_multiple",
-          description="Create multiple records in a Dataverse table. Returns list of created record IDs." \
-          "the input is a list of record data dictionaries, and the output is a list of created record IDs.")
-def create_multiple(
+          description="Create multiple records in a Dataverse table. " \
+          "The input is a list of record data dictionaries, which is split into chunks that are created concurrently. " \
+          "The output contains the created record IDs in input order plus per-chunk results; failed chunks report their " \
+          "offset, size and error so only those rows need to be resent. " \
+          "Set background=true to return a job_id immediately and poll it with get_job_status. " \
+          "Unless validate=false, rows are first checked against the table metadata (column names, types, max lengths, " \
+          "required columns) and invalid rows are returned under 'rejected' with reasons instead of being sent. " \
+          "Pass an idempotency_key to make retries safe: chunks already committed under that key are not sent again " \
+          "and their original IDs are returned. " \
+          "For large inserts, set result_mode to avoid returning every ID: count_only returns just counts, summary the " \
+          "first and last summary_size IDs, file writes the IDs to output_path (JSONL, or raw 16-byte GUIDs for .bin) " \
+          "and returns the path, and compact returns all IDs as one base64 string of 16-byte GUIDs. These modes list only " \
+          "failed chunks. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def create_multiple(
     table: str,
     records: list[dict[str, object]],
-) -> list[str]:
-    """Create multiple records and return created IDs."""
-    logger.info("create_multiple started table=%s records=%d", table, len(records))
-    created_ids = _client().create(table, records)
-    logger.info("create_multiple completed table=%s created=%d", table, len(created_ids))
-    return created_ids
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+    background: bool = False,
+    validate: bool = True,
+    environment: str | None = None,
+    idempotency_key: str | None = None,
+    result_mode: str = IDS,
+    summary_size: int = 5,
+    output_path: str | None = None,
+) -> dict[str, object]:
+    """Create multiple records in concurrent chunks and return created IDs with per-chunk results."""
+    if background:
+        return await _executor().run(
+            "create_multiple",
+            _submit_create_job,
+            table,
+            records,
+            chunk_size,
+            max_workers,
+            validate,
+            environment,
+            idempotency_key,
+        )
+    return await _executor().run(
+        "create_multiple",
+        _create_multiple,
+        table,
+        records,
+        chunk_size,
+        max_workers,
+        validate,
+        environment,
+        idempotency_key,
+        result_mode,
+        summary_size,
+        output_path,
+    )
 
 @mcp.tool(name="update_multiple",
-          description="Update multiple records in a Dataverse table by applying the same payload to each ID." \
-          "the input is a list of record IDs and a data dictionary to apply to each record, and the output is a summary message indicating how many records were updated.")
-def update_multiple(
+          description="Update multiple records in a Dataverse table by applying the same payload to each ID. " \
+          "The input is a list of record IDs and a data dictionary to apply to each record; IDs are updated in concurrent chunks. " \
+          "The output summarizes how many records were updated and lists per-chunk results, including failed chunks. " \
+          "Set background=true to return a job_id immediately and poll it with get_job_status. " \
+          "Unless validate=false, the payload is checked against the table metadata before any record is sent. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def update_multiple(
     table: str,
     record_ids: list[str],
     data: dict[str, object],
-) -> str:
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+    background: bool = False,
+    validate: bool = True,
+    environment: str | None = None,
+) -> dict[str, object]:
     """Update multiple records by applying the same payload to each ID."""
-    logger.info("update_multiple started table=%s records=%d", table, len(record_ids))
-    _client().update(table, record_ids, data)
-    logger.info("update_multiple completed table=%s updated=%d", table, len(record_ids))
-    return f"Total number of records updated: {len(record_ids)}"
+    handler = _submit_update_job if background else _update_multiple
+    return await _executor().run(
+        "update_multiple",
+        handler,
+        table,
+        record_ids,
+        data,
+        chunk_size,
+        max_workers,
+        validate,
+        environment,
+    )
+
+@mcp.tool(name="update_records",
+          description="Update many records in a Dataverse table where each record has its own payload. " \
+          "The input is a list of objects shaped like {\"id\": \"<guid>\", \"fields\": {...}} or " \
+          "{\"keys\": {\"<alternate key column>\": value}, \"fields\": {...}}; rows addressed by alternate keys are upserted. " \
+          "Rows with the same addressing mode and field names are grouped into batched UpdateMultiple/UpsertMultiple requests. " \
+          "The output reports per-group and per-chunk results; failed chunks list the input row indexes to resend. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def update_records(
+    table: str,
+    rows: list[dict[str, object]],
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    """Update or upsert records that each carry their own field values."""
+    return await _executor().run(
+        "update_records", _update_records, table, rows, chunk_size, max_workers, environment
+    )
+
+@mcp.tool(name="bulk_import_file",
+          description="Stream rows from a local CSV, JSONL or Parquet file into a Dataverse table with constant memory. " \
+          "Source columns are renamed with the optional column_map and coerced to the table's column types; unknown columns are ignored. " \
+          "Rows are created in concurrent chunks. The output includes next_offset, which can be passed back as start_offset " \
+          "to resume an interrupted import, plus rejected rows and failed chunks with their row offsets. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def bulk_import_file(
+    table: str,
+    path: str,
+    ctx: Context,
+    file_format: str | None = None,
+    column_map: dict[str, str] | None = None,
+    start_offset: int = 0,
+    max_rows: int | None = None,
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    """Import rows from a local file into a Dataverse table."""
+    loop = asyncio.get_running_loop()
+
+    def report_progress(rows_read: int, created: int) -> None:
+        asyncio.run_coroutine_threadsafe(
+            ctx.report_progress(rows_read, message=f"{created} records created"),
+            loop,
+        )
+
+    return await _executor().run(
+        "bulk_import_file",
+        _bulk_import_file,
+        table,
+        path,
+        file_format,
+        column_map,
+        start_offset,
+        max_rows,
+        chunk_size,
+        max_workers,
+        report_progress,
+        environment,
+    )
 
 @mcp.tool(name="create_table",
           description="Create a new Dataverse table with specified columns. " \
-          "The input is the table name and a dictionary of column names and types, and the output is a confirmation message.")
-def create_table(table:str, columns : dict[str,any]) -> str:
+          "The input is the table name and a dictionary of column names and types, and the output is a confirmation message. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def create_table(table:str, columns : dict[str,any], environment: str | None = None) -> str:
     """Create a new Dataverse table with specified columns."""
-    logger.info("create_table started table=%s columns=%d", table, len(columns))
-    _client().create_table(table, columns)
-    logger.info("create_table completed table=%s", table)
-    return f"Table '{table}' created with columns: {', '.join(columns.keys())}"
+    return await _executor().run("create_table", _create_table, table, columns, environment)
+
+@mcp.tool(name="provision_schema",
+          description="Create many tables, columns and one-to-many relationships from one schema document. The document has " \
+          "tables: [{name, columns: {column: type}, primary_column}] and relationships: [{name, referenced_table, " \
+          "referencing_table, lookup, display_name, cascade_delete}]; column types are string, int, decimal, float, " \
+          "datetime, bool, or {\"type\": \"choice\", \"options\": {label: value}}. The server diffs the document " \
+          "against existing metadata, skips what already exists, creates the rest in parallel and publishes the " \
+          "customizations once at the end. Set dry_run=true to only return the plan. Rerunning after a partial failure " \
+          "only creates what is still missing. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def provision_schema(
+    schema: dict[str, object],
+    dry_run: bool = False,
+    publish: bool = True,
+    solution: str | None = None,
+    max_workers: int | None = None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    """Provision the tables, columns and relationships in a schema document that do not exist yet."""
+    return await _executor().run(
+        "provision_schema", _provision_schema, schema, dry_run, publish, solution, max_workers, environment
+    )
+
+@mcp.tool(name="query_records",
+          description="Read records from a Dataverse table in pages. Use either OData options (select, filter, orderby) or a " \
+          "FetchXML query; paging links and FetchXML paging cookies are followed automatically up to max_rows " \
+          "(capped by the server). Set ids_only=true to return just primary IDs, e.g. to feed update_multiple or delete_multiple. " \
+          "Set output_path to write results as JSONL to a local file instead of returning them inline; inline results " \
+          "are limited to a few thousand rows, so larger reads need output_path. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def query_records(
+    table: str,
+    ctx: Context,
+    select: list[str] | None = None,
+    filter: str | None = None,
+    orderby: list[str] | None = None,
+    fetchxml: str | None = None,
+    page_size: int | None = None,
+    max_rows: int | None = None,
+    ids_only: bool = False,
+    output_path: str | None = None,
+    environment: str | None = None,
+) -> dict[str, object]:
+    """Query records page by page and return them inline or write them to a JSONL file."""
+    loop = asyncio.get_running_loop()
+
+    def report_page(pages: int, rows: int) -> None:
+        asyncio.run_coroutine_threadsafe(
+            ctx.report_progress(rows, message=f"{pages} pages read"),
+            loop,
+        )
+
+    return await _executor().run(
+        "query_records",
+        _query_records,
+        table,
+        select,
+        filter,
+        orderby,
+        fetchxml,
+        page_size,
+        max_rows,
+        ids_only,
+        output_path,
+        report_page,
+        environment,
+    )
+
+@mcp.tool(name="refresh_metadata",
+          description="Reload the cached metadata (entity set, primary keys and column definitions) for a Dataverse table. " \
+          "Use it after changing a table's schema outside this server. The output summarizes the reloaded metadata. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def refresh_metadata(table: str, environment: str | None = None) -> dict[str, object]:
+    """Force a reload of a table's cached metadata."""
+    return await _executor().run("refresh_metadata", _refresh_metadata, table, environment)
 
 @mcp.tool(name="delete_multiple",
-          description="Delete multiple records in a Dataverse table by ID, defaulting to bulk delete for efficiency.")
-def delete_multiple(
+          description="Delete multiple records in a Dataverse table by ID, defaulting to bulk delete for efficiency. " \
+          "IDs are deleted in concurrent chunks and the output lists per-chunk results and any BulkDelete job IDs. " \
+          "Set background=true to return a job_id immediately and poll it with get_job_status. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def delete_multiple(
     table: str,
     record_ids: list[str],
     use_bulk_delete: bool = True,
-) -> str:
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+    background: bool = False,
+    environment: str | None = None,
+) -> dict[str, object]:
     """Delete multiple records, defaulting to Dataverse bulk delete."""
-    logger.info(
-        "delete_multiple started table=%s records=%d use_bulk_delete=%s",
+    if background:
+        return await _executor().run(
+            "delete_multiple",
+            _submit_job,
+            "delete_multiple",
+            table,
+            {"record_ids": record_ids, "use_bulk_delete": use_bulk_delete, "environment": environment},
+            len(record_ids),
+            chunk_size,
+            max_workers,
+        )
+    return await _executor().run(
+        "delete_multiple",
+        _delete_multiple,
         table,
-        len(record_ids),
+        record_ids,
         use_bulk_delete,
+        chunk_size,
+        max_workers,
+        environment,
+    )
+
+@mcp.tool(name="delete_by_query",
+          description="Delete every record in a Dataverse table that matches a query, without sending record IDs. " \
+          "Pass either a FetchXML query or a conditions object of column/value equality pairs. The server submits a " \
+          "Dataverse BulkDelete job and waits up to wait_seconds for it to finish, returning its status and deleted count. " \
+          "Set dry_run=true to only count the matching records. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def delete_by_query(
+    table: str,
+    fetchxml: str | None = None,
+    conditions: dict[str, object] | None = None,
+    dry_run: bool = False,
+    wait_seconds: float = 300.0,
+    environment: str | None = None,
+) -> dict[str, object]:
+    """Delete the records matching a query with a server-side BulkDelete job."""
+    return await _executor().run(
+        "delete_by_query", _delete_by_query, table, fetchxml, conditions, dry_run, wait_seconds, environment
+    )
+
+@mcp.tool(name="batch_execute",
+          description="Run mixed create, update, upsert, delete and read operations in as few round trips as possible " \
+          "using OData $batch requests (up to 1000 operations each). Each operation is an object with method " \
+          "(POST, PATCH, PUT, DELETE or GET), either table plus optional id or alternate keys, or a raw Web API path, " \
+          "optional data, and optional content_id. Wrap operations in {\"changeset\": [...]} to make them atomic; inside a " \
+          "changeset, a path such as \"$1/contact_customer_accounts/$ref\" refers to the record created by content_id 1. " \
+          "The output lists per-operation status, created record id and response body in input order. Processing stops at " \
+          "the first failure unless continue_on_error=true. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def batch_execute(
+    operations: list[dict[str, object]],
+    continue_on_error: bool = False,
+    environment: str | None = None,
+) -> dict[str, object]:
+    """Execute mixed operations through OData $batch requests."""
+    return await _executor().run("batch_execute", _batch_execute, operations, continue_on_error, environment)
+
+@mcp.tool(name="sync_changes",
+          description="Mirror a Dataverse table incrementally using change tracking. The first call (or reset=true) " \
+          "writes every row; later calls write only rows created, updated or deleted since the previous sync, using a " \
+          "delta link the server stores per environment and table. Changes are written to output_path as JSONL or " \
+          "Parquet (chosen by format or the file extension), one {change: upsert|delete, id, record} entry per row. " \
+          "Change tracking must be enabled on the table. The output reports upserted and deleted counts. " \
+          "Pass environment to target a configured Dataverse org other than the default.")
+async def sync_changes(
+    table: str,
+    output_path: str,
+    ctx: Context,
+    format: str | None = None,
+    select: list[str] | None = None,
+    page_size: int | None = None,
+    reset: bool = False,
+    environment: str | None = None,
+) -> dict[str, object]:
+    """Write the rows changed since the last sync of a table to a local file."""
+    loop = asyncio.get_running_loop()
+
+    def report_page(pages: int, rows: int) -> None:
+        asyncio.run_coroutine_threadsafe(
+            ctx.report_progress(rows, message=f"{pages} pages of changes read"),
+            loop,
+        )
+
+    return await _executor().run(
+        "sync_changes",
+        _sync_changes,
+        table,
+        output_path,
+        format,
+        select,
+        page_size,
+        reset,
+        report_page,
+        environment,
     )
-    _client().delete(table, record_ids, use_bulk_delete=use_bulk_delete)
-    logger.info("delete_multiple completed table=%s deleted=%d", table, len(record_ids))
-    return f"Total number of records deleted: {len(record_ids)}"
+
+@mcp.tool(name="get_job_status",
+          description="Get the status of a background bulk job started with background=true. " \
+          "The output includes the job status, completed and failed chunks, and with include_results=true " \
+          "the per-chunk results (for example created record IDs) of completed chunks.")
+async def get_job_status(job_id: str, include_results: bool = False) -> dict[str, object]:
+    """Return the state of a background bulk job."""
+    return await _executor().run("get_job_status", _jobs().status, job_id, include_results)
+
+@mcp.tool(name="cancel_job",
+          description="Cancel a running background bulk job. Chunks already in flight finish; remaining chunks are not sent. " \
+          "A cancelled job can be continued later with resume_job.")
+async def cancel_job(job_id: str) -> dict[str, object]:
+    """Request cancellation of a background bulk job."""
+    return await _executor().run("cancel_job", _jobs().cancel, job_id)
+
+@mcp.tool(name="resume_job",
+          description="Resume a failed, cancelled or interrupted background bulk job from its checkpoint. " \
+          "Only chunks that have not completed are sent again.")
+async def resume_job(job_id: str) -> dict[str, object]:
+    """Resume a background bulk job from its checkpoint."""
+    return await _executor().run("resume_job", _jobs().resume, job_id)
+
+STARTUP.mark("app_setup")
 
 
 def main() -> None:
     transport = _env("MCP_TRANSPORT", "streamable-http") or "streamable-http"
+    logger.info("Startup timings %s", STARTUP.snapshot()["phases_ms"])
     logger.info(
         "Starting Dataverse MCP server host=%s port=%s transport=%s path=%s",
         _server_host(),
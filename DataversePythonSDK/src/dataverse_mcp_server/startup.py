@@ -0,0 +1,56 @@
+"""Start-up phase timings, so cold-start regressions show up in logs and ``/health``."""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class StartupTimer:
+    """Records how long each start-up phase and each deferred import took.
+
+    Phases are timed back to back from the moment this module is imported;
+    deferred imports are timed the first time a code path pulls them in.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._last = self.started
+        self._lock = threading.Lock()
+        self.phases: dict[str, float] = {}
+        self.deferred_imports: dict[str, float] = {}
+        self.first_health_ms: float | None = None
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self.phases[phase] = round((now - self._last) * 1000, 1)
+            self._last = now
+
+    @contextmanager
+    def deferred_import(self, name: str) -> Iterator[None]:
+        if name in self.deferred_imports:
+            yield
+            return
+        started = time.perf_counter()
+        yield
+        with self._lock:
+            self.deferred_imports.setdefault(name, round((time.perf_counter() - started) * 1000, 1))
+
+    def health_served(self) -> None:
+        if self.first_health_ms is None:
+            self.first_health_ms = round((time.perf_counter() - self.started) * 1000, 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "phases_ms": dict(self.phases),
+                "total_ms": round(sum(self.phases.values()), 1),
+                "first_health_ms": self.first_health_ms,
+                "deferred_imports_ms": dict(self.deferred_imports),
+            }
+
+
+STARTUP = StartupTimer()
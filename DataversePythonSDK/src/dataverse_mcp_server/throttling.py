@@ -0,0 +1,166 @@
+"""Adaptive throttling for Dataverse requests that honours service-protection limits."""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from PowerPlatform.Dataverse.core.errors import HttpError
+
+from .logconfig import HOT
+from .metrics import REQUESTS_IN_FLIGHT, RETRIES, THROTTLE_BUDGET, THROTTLED
+
+logger = logging.getLogger("dataverse_mcp_server.throttling")
+
+R = TypeVar("R")
+
+# 429 is the service-protection response; 503 is returned when the org itself is saturated.
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return the server-requested delay for a throttling error, if any."""
+    if not isinstance(exc, HttpError):
+        return None
+    value = (exc.details or {}).get("retry_after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    return isinstance(exc, HttpError) and exc.status_code in THROTTLE_STATUS_CODES
+
+
+class RateGovernor:
+    """Bounds in-flight Dataverse requests with an AIMD-controlled budget.
+
+    Every successful call grows the budget additively (roughly one slot per budget's
+    worth of successes); every throttling response halves it and pauses all callers
+    for the ``Retry-After`` interval. Throttled calls are retried individually, so a
+    bulk operation only resends the sub-batch that was rejected.
+    """
+
+    def __init__(
+        self,
+        initial_budget: int = 4,
+        min_budget: int = 1,
+        max_budget: int = 16,
+        decrease_factor: float = 0.5,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        name: str = "default",
+    ) -> None:
+        if not 1 <= min_budget <= initial_budget <= max_budget:
+            raise ValueError("budgets must satisfy 1 <= min_budget <= initial_budget <= max_budget")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self.decrease_factor = decrease_factor
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._budget = float(initial_budget)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._throttled = 0
+        self._retries = 0
+        self._condition = threading.Condition()
+        self.name = name
+        THROTTLE_BUDGET.set(initial_budget, environment=name)
+
+    @property
+    def budget(self) -> int:
+        return int(self._budget)
+
+    def _acquire(self) -> None:
+        with self._condition:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self._in_flight < int(self._budget):
+                    self._in_flight += 1
+                    REQUESTS_IN_FLIGHT.set(self._in_flight, environment=self.name)
+                    return
+                self._condition.wait(timeout=wait if wait > 0 else None)
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            REQUESTS_IN_FLIGHT.set(self._in_flight, environment=self.name)
+            self._condition.notify_all()
+
+    def _on_success(self) -> None:
+        with self._condition:
+            if self._budget < self.max_budget:
+                self._budget = min(self.max_budget, self._budget + 1.0 / self._budget)
+                THROTTLE_BUDGET.set(int(self._budget), environment=self.name)
+                self._condition.notify_all()
+
+    def _on_throttle(self, delay: float) -> None:
+        with self._condition:
+            self._throttled += 1
+            THROTTLED.inc(environment=self.name)
+            now = time.monotonic()
+            # Concurrent requests tend to be throttled together; only shrink once per pause window.
+            if now >= self._paused_until:
+                self._budget = max(float(self.min_budget), self._budget * self.decrease_factor)
+                THROTTLE_BUDGET.set(int(self._budget), environment=self.name)
+            self._paused_until = max(self._paused_until, now + delay)
+            logger.warning(
+                "Dataverse throttled request budget=%d pause_seconds=%.1f",
+                int(self._budget),
+                delay,
+                extra=HOT,
+            )
+
+    def _backoff(self, exc: BaseException, attempt: int) -> float:
+        requested = retry_after_seconds(exc)
+        if requested is not None:
+            return min(self.max_delay, requested)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def call(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Invoke ``fn`` within the budget, retrying it when Dataverse throttles.
+
+        A retry re-runs ``fn`` from the start, so it should send a single request (or
+        an atomic action such as CreateMultiple); govern loops of requests per request.
+        """
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                self._release()
+                if not is_throttle_error(exc) or attempt >= self.max_retries:
+                    raise
+                self._on_throttle(self._backoff(exc, attempt))
+                with self._condition:
+                    self._retries += 1
+                RETRIES.inc(environment=self.name)
+                attempt += 1
+                continue
+            self._release()
+            self._on_success()
+            return result
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "budget": int(self._budget),
+                "min_budget": self.min_budget,
+                "max_budget": self.max_budget,
+                "in_flight": self._in_flight,
+                "throttled": self._throttled,
+                "retries": self._retries,
+                "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            }
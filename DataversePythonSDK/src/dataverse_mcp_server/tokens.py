@@ -0,0 +1,194 @@
+"""Shared access-token cache that refreshes tokens before they expire."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from azure.core.credentials import AccessToken, TokenCredential
+
+logger = logging.getLogger("dataverse_mcp_server.tokens")
+
+
+@dataclass
+class _ScopeState:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    token: AccessToken | None = None
+    acquired_at: float = 0.0
+    refresh_at: float = 0.0
+    refreshes: int = 0
+    failures: int = 0
+    hits: int = 0
+    # Requests that had to wait for a token because none was cached or it had expired.
+    blocking_refreshes: int = 0
+    last_refresh_ms: float | None = None
+    max_refresh_ms: float = 0.0
+    total_refresh_ms: float = 0.0
+    last_error: str | None = None
+
+
+class TokenBroker:
+    """A ``TokenCredential`` that caches tokens per scope and refreshes them ahead of expiry.
+
+    Request paths read the cached token; a background thread renews each token
+    ``refresh_margin`` seconds before it expires, so callers only pay for token
+    acquisition the first time a scope is used. One broker can back any number of
+    clients.
+    """
+
+    def __init__(
+        self,
+        credential: TokenCredential,
+        refresh_margin: float = 300.0,
+        retry_interval: float = 30.0,
+    ) -> None:
+        self.credential = credential
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self._scopes: dict[tuple[str, ...], _ScopeState] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def get_token(self, *scopes: str, claims: str | None = None, tenant_id: str | None = None, **kwargs: Any) -> AccessToken:
+        if claims or tenant_id or kwargs:
+            # Claims challenges and tenant overrides must reach the credential untouched.
+            return self.credential.get_token(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+        key = tuple(scopes)
+        state = self._state(key)
+        token = state.token
+        if token is not None and time.time() < state.refresh_at:
+            state.hits += 1
+            return token
+        with state.lock:
+            token = state.token
+            if token is not None and time.time() < state.refresh_at:
+                state.hits += 1
+                return token
+            if token is not None and token.expires_on > time.time():
+                # Still valid: serve it and let the background thread renew it.
+                state.hits += 1
+                self._wake.set()
+                return token
+            state.blocking_refreshes += 1
+            return self._refresh(key, state)
+
+    def _state(self, key: tuple[str, ...]) -> _ScopeState:
+        with self._lock:
+            state = self._scopes.get(key)
+            if state is None:
+                state = self._scopes[key] = _ScopeState()
+                self._ensure_thread()
+            return state
+
+    def _refresh(self, key: tuple[str, ...], state: _ScopeState) -> AccessToken:
+        """Acquire a new token for ``key``; the caller holds ``state.lock``."""
+        started = time.perf_counter()
+        try:
+            token = self.credential.get_token(*key)
+        except Exception as exc:
+            state.failures += 1
+            state.last_error = str(exc)
+            logger.warning("Token refresh failed scopes=%s error=%s", key, exc)
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        state.token = token
+        state.acquired_at = time.time()
+        # Short-lived tokens are renewed halfway through their lifetime instead.
+        lifetime = token.expires_on - state.acquired_at
+        state.refresh_at = token.expires_on - min(self.refresh_margin, lifetime / 2)
+        state.refreshes += 1
+        state.last_refresh_ms = elapsed_ms
+        state.max_refresh_ms = max(state.max_refresh_ms, elapsed_ms)
+        state.total_refresh_ms += elapsed_ms
+        state.last_error = None
+        logger.info(
+            "Token refreshed scopes=%s elapsed_ms=%.1f expires_in=%.0f",
+            key,
+            elapsed_ms,
+            token.expires_on - state.acquired_at,
+        )
+        self._wake.set()
+        return token
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="dataverse-token-refresh", daemon=True)
+            self._thread.start()
+
+    def _next_wakeup(self) -> float:
+        with self._lock:
+            states = list(self._scopes.values())
+        now = time.time()
+        delays = [state.refresh_at - now for state in states if state.token is not None]
+        return max(0.0, min(delays)) if delays else self.retry_interval
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            with self._lock:
+                items = list(self._scopes.items())
+            failed = False
+            for key, state in items:
+                if state.token is None or time.time() < state.refresh_at:
+                    continue
+                with state.lock:
+                    if time.time() < state.refresh_at:
+                        continue
+                    try:
+                        self._refresh(key, state)
+                    except Exception:
+                        failed = True
+            self._wake.clear()
+            delay = self.retry_interval if failed else self._next_wakeup()
+            self._wake.wait(delay)
+
+    def discard(self, *scopes: str) -> None:
+        """Stop caching and refreshing the token for ``scopes``."""
+        with self._lock:
+            self._scopes.pop(tuple(scopes), None)
+
+    @staticmethod
+    def _describe(key: tuple[str, ...], state: _ScopeState, now: float) -> dict[str, Any]:
+        token = state.token
+        return {
+            "scopes": list(key),
+            "token_age_seconds": round(now - state.acquired_at, 1) if token else None,
+            "expires_in_seconds": round(token.expires_on - now, 1) if token else None,
+            "refreshes": state.refreshes,
+            "blocking_refreshes": state.blocking_refreshes,
+            "cache_hits": state.hits,
+            "failures": state.failures,
+            "last_refresh_ms": round(state.last_refresh_ms, 1) if state.last_refresh_ms is not None else None,
+            "avg_refresh_ms": round(state.total_refresh_ms / state.refreshes, 1) if state.refreshes else None,
+            "max_refresh_ms": round(state.max_refresh_ms, 1),
+            "last_error": state.last_error,
+        }
+
+    def describe(self, *scopes: str) -> dict[str, Any] | None:
+        """Token age, expiry and refresh stats for one scope, or ``None`` if it was never requested."""
+        with self._lock:
+            state = self._scopes.get(tuple(scopes))
+        return self._describe(tuple(scopes), state, time.time()) if state is not None else None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Token age, time to expiry and refresh latency for every scope in use."""
+        now = time.time()
+        with self._lock:
+            items = list(self._scopes.items())
+        scopes = [self._describe(key, state, now) for key, state in items]
+        return {"refresh_margin_seconds": self.refresh_margin, "scopes": scopes}
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        close = getattr(self.credential, "close", None)
+        if callable(close):
+            close()
@@ -0,0 +1,80 @@
+"""Heterogeneous bulk updates: one payload per record, addressed by ID or alternate key."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Sequence
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+from . import webapi
+
+
+@dataclass
+class RowGroup:
+    """Rows that can share one UpdateMultiple/UpsertMultiple request."""
+
+    mode: str
+    fields: tuple[str, ...]
+    row_indexes: list[int] = field(default_factory=list)
+    rows: list[dict[str, Any]] = field(default_factory=list)
+
+
+def group_rows(rows: Sequence[dict[str, Any]]) -> tuple[list[RowGroup], list[dict[str, Any]]]:
+    """Group ``{id|keys, fields}`` rows by addressing mode and field set.
+
+    Returns the groups plus rejected rows (with their input index and a reason).
+    """
+    groups: dict[tuple[str, tuple[str, ...]], RowGroup] = {}
+    rejected: list[dict[str, Any]] = []
+    for index, row in enumerate(rows):
+        fields = row.get("fields") if isinstance(row, dict) else None
+        if not isinstance(fields, dict) or not fields:
+            rejected.append({"row_index": index, "reason": "row must contain a non-empty 'fields' object"})
+            continue
+        record_id = row.get("id")
+        keys = row.get("keys")
+        if record_id and keys:
+            rejected.append({"row_index": index, "reason": "row must set either 'id' or 'keys', not both"})
+            continue
+        if record_id:
+            mode = "id"
+        elif isinstance(keys, dict) and keys:
+            mode = "alternate_key"
+        else:
+            rejected.append({"row_index": index, "reason": "row must contain an 'id' or a non-empty 'keys' object"})
+            continue
+        signature = (mode, tuple(sorted(name.lower() for name in fields)))
+        group = groups.get(signature)
+        if group is None:
+            group = groups[signature] = RowGroup(mode=mode, fields=signature[1])
+        group.row_indexes.append(index)
+        group.rows.append(row)
+    return list(groups.values()), rejected
+
+
+def update_by_ids(client: DataverseClient, table: str, rows: Sequence[dict[str, Any]]) -> None:
+    client.update(table, [str(row["id"]) for row in rows], [dict(row["fields"]) for row in rows])
+
+
+def upsert_by_alternate_keys(client: DataverseClient, table: str, rows: Sequence[dict[str, Any]]) -> list[str]:
+    """Upsert rows addressed by alternate keys with a single ``UpsertMultiple`` request."""
+    entity_set = webapi.entity_set_name(client, table)
+    odata_type = f"Microsoft.Dynamics.CRM.{table.lower()}"
+    targets = [
+        {
+            **{name.lower(): value for name, value in row["fields"].items()},
+            "@odata.type": odata_type,
+            "@odata.id": f"{entity_set}{webapi.alternate_key_segment(row['keys'])}",
+        }
+        for row in rows
+    ]
+    body = webapi.request_json(
+        client,
+        "post",
+        f"{entity_set}/Microsoft.Dynamics.CRM.UpsertMultiple",
+        json={"Targets": targets},
+    )
+    ids = body.get("Ids")
+    return [record_id for record_id in ids if isinstance(record_id, str)] if isinstance(ids, list) else []
@@ -0,0 +1,173 @@
+"""Client-side payload validation against cached table metadata."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from .metadata import ColumnMetadata, TableMetadata
+
+_GUID_RE = re.compile(r"^\{?[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\}?$")
+_LOOKUP_TYPES = frozenset({"Lookup", "Customer", "Owner"})
+# Required columns the platform fills in itself (owner, state, ...) are SystemRequired, not ApplicationRequired.
+_REQUIRED_LEVEL = "ApplicationRequired"
+
+Check = Callable[[Any], "str | None"]
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _string_check(max_length: int | None) -> Check:
+    def check(value: Any) -> str | None:
+        if not isinstance(value, str):
+            return "expected a string"
+        if max_length is not None and len(value) > max_length:
+            return f"length {len(value)} exceeds max length {max_length}"
+        return None
+
+    return check
+
+
+def _int_check(value: Any) -> str | None:
+    return None if _is_int(value) else "expected an integer"
+
+
+def _number_check(value: Any) -> str | None:
+    return None if _is_int(value) or isinstance(value, float) else "expected a number"
+
+
+def _bool_check(value: Any) -> str | None:
+    return None if isinstance(value, bool) else "expected a boolean"
+
+
+def _string_value_check(value: Any) -> str | None:
+    return None if isinstance(value, str) else "expected an ISO 8601 string"
+
+
+def _choice_check(value: Any) -> str | None:
+    # Labels are accepted too; the SDK resolves them to option values.
+    return None if _is_int(value) or isinstance(value, str) else "expected an option value or label"
+
+
+def _guid_check(value: Any) -> str | None:
+    return None if isinstance(value, str) and _GUID_RE.match(value) else "expected a GUID string"
+
+
+def _lookup_check(column: ColumnMetadata) -> Check:
+    def check(value: Any) -> str | None:
+        return f"set lookups with '{column.logical_name}@odata.bind' instead of a raw value"
+
+    return check
+
+
+def _accept(value: Any) -> str | None:
+    return None
+
+
+def _type_check(column: ColumnMetadata) -> Check:
+    attribute_type = column.attribute_type
+    if attribute_type in {"String", "Memo"}:
+        return _string_check(column.max_length)
+    if attribute_type in {"Integer", "BigInt"}:
+        return _int_check
+    if attribute_type in {"Decimal", "Double", "Money"}:
+        return _number_check
+    if attribute_type == "Boolean":
+        return _bool_check
+    if attribute_type == "DateTime":
+        return _string_value_check
+    if attribute_type in {"Picklist", "State", "Status"}:
+        return _choice_check
+    if attribute_type == "Uniqueidentifier":
+        return _guid_check
+    if attribute_type in _LOOKUP_TYPES:
+        return _lookup_check(column)
+    return _accept
+
+
+@dataclass
+class ValidationResult:
+    valid: list[dict[str, Any]] = field(default_factory=list)
+    valid_indexes: list[int] = field(default_factory=list)
+    rejected: list[dict[str, Any]] = field(default_factory=list)
+
+
+class RecordValidator:
+    """Checks record payloads for a table without any network calls.
+
+    Per-column checks and the required-column set are resolved once from the
+    metadata, so validating each row is a dictionary lookup per field.
+    """
+
+    def __init__(self, metadata: TableMetadata, mode: str = "create") -> None:
+        if mode not in {"create", "update"}:
+            raise ValueError("mode must be 'create' or 'update'")
+        self.mode = mode
+        self._checks: dict[str, Check] = {}
+        self._not_writable: set[str] = set()
+        for name, column in metadata.columns.items():
+            writable = column.valid_for_create if mode == "create" else column.valid_for_update
+            if not writable:
+                self._not_writable.add(name)
+            self._checks[name] = _type_check(column)
+        self._required = (
+            [
+                column
+                for column in metadata.columns.values()
+                if column.required_level == _REQUIRED_LEVEL and column.valid_for_create and not column.attribute_of
+            ]
+            if mode == "create"
+            else []
+        )
+
+    def errors(self, record: Any) -> list[str]:
+        if not isinstance(record, dict):
+            return ["record must be an object"]
+        errors: list[str] = []
+        present: set[str] = set()
+        bound: set[str] = set()
+        for key, value in record.items():
+            name = str(key).lower()
+            if "@" in name:
+                # Annotations such as '<lookup>@odata.bind' are passed through untouched.
+                if name.endswith("@odata.bind"):
+                    bound.add(name.split("@", 1)[0])
+                continue
+            check = self._checks.get(name)
+            if check is None:
+                errors.append(f"'{key}': unknown column")
+                continue
+            if name in self._not_writable:
+                errors.append(f"'{key}': column is not valid for {self.mode}")
+                continue
+            if value is None:
+                continue
+            present.add(name)
+            problem = check(value)
+            if problem:
+                errors.append(f"'{key}': {problem}")
+        for column in self._required:
+            name = column.logical_name
+            if column.attribute_type in _LOOKUP_TYPES:
+                # Navigation property names usually start with the lookup's logical name.
+                missing = not any(target.startswith(name) for target in bound)
+            else:
+                missing = name not in present
+            if missing:
+                errors.append(f"'{name}': required column is missing")
+        return errors
+
+    def split(self, records: Sequence[Any]) -> ValidationResult:
+        """Partition ``records`` into valid rows and rejected rows with reasons."""
+        result = ValidationResult()
+        for index, record in enumerate(records):
+            errors = self.errors(record)
+            if errors:
+                result.rejected.append({"row_index": index, "reasons": errors})
+            else:
+                result.valid.append(record)
+                result.valid_indexes.append(index)
+        return result
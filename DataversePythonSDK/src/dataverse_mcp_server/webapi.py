@@ -0,0 +1,62 @@
+"""Raw Dataverse Web API access for operations the SDK does not wrap.
+
+Requests go through the SDK's internal OData client so they share its
+authentication, correlation headers and ``HttpError`` mapping.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from PowerPlatform.Dataverse.client import DataverseClient
+
+
+def escape_odata(value: str) -> str:
+    return value.replace("'", "''")
+
+
+def odata_literal(value: Any) -> str:
+    """Format a Python value as an OData URL literal."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return f"'{escape_odata(str(value))}'"
+
+
+def alternate_key_segment(keys: dict[str, Any]) -> str:
+    """Build the ``(key1=value1,key2=value2)`` segment that addresses a row by alternate key."""
+    if not keys:
+        raise ValueError("alternate keys must not be empty")
+    return "(" + ",".join(f"{name.lower()}={odata_literal(value)}" for name, value in keys.items()) + ")"
+
+
+def request(client: DataverseClient, method: str, path: str, **kwargs: Any) -> Any:
+    """Send ``method`` to ``path`` (relative to the Web API root, or absolute) and return the response."""
+    with client._scoped_odata() as od:
+        url = path if path.startswith("https://") else f"{od.api}/{path.lstrip('/')}"
+        return od._request(method, url, **kwargs)
+
+
+def request_json(client: DataverseClient, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+    response = request(client, method, path, **kwargs)
+    if not response.text:
+        return {}
+    try:
+        body = response.json()
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def entity_set_name(client: DataverseClient, table: str) -> str:
+    with client._scoped_odata() as od:
+        return od._entity_set_from_schema_name(table)
+
+
+def primary_id_attribute(client: DataverseClient, table: str) -> str:
+    with client._scoped_odata() as od:
+        return od._primary_id_attr(table)
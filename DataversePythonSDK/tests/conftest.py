@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+from PowerPlatform.Dataverse.core.errors import HttpError
+
+
+@pytest.fixture
+def http_error():
+    """Build the SDK's HttpError; throttles default to a zero Retry-After so retries don't sleep."""
+
+    def build(status_code: int, message: str = "error", retry_after: int | None = None) -> HttpError:
+        if retry_after is None and status_code in (429, 503):
+            retry_after = 0
+        return HttpError(message, status_code=status_code, retry_after=retry_after)
+
+    return build
+
+
+class FakeClient:
+    """Stands in for the SDK client in tool-level tests; records every create."""
+
+    def __init__(self) -> None:
+        self.created: list[dict] = []
+        self.fail_when = None
+
+    def create(self, table, records):
+        if self.fail_when is not None and any(self.fail_when(record) for record in records):
+            raise RuntimeError("create rejected")
+        self.created.extend(records)
+        return [f"id-{len(self.created) - len(records) + index}" for index in range(len(records))]
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Point the server's client, governor and metadata lookups at in-memory fakes."""
+    from dataverse_mcp_server import server
+    from dataverse_mcp_server.throttling import RateGovernor
+
+    client = FakeClient()
+    tables = {}
+    monkeypatch.setattr(server, "_client", lambda environment=None: client)
+    monkeypatch.setattr(server, "_governor", lambda environment=None: RateGovernor())
+    monkeypatch.setattr(server, "_metadata", lambda environment=None: SimpleNamespace(get=lambda table: tables[table]))
+    return SimpleNamespace(client=client, tables=tables)
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from dataverse_mcp_server.batching import chunked, run_batches
+
+
+def test_chunked_splits_into_consecutive_slices():
+    assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    with pytest.raises(ValueError):
+        chunked([1], 0)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_run_batches_returns_chunks_in_input_order(workers):
+    batch = run_batches("create", list(range(10)), lambda chunk: sum(chunk), chunk_size=3, max_workers=workers)
+
+    assert [chunk.index for chunk in batch.chunks] == [0, 1, 2, 3]
+    assert [chunk.offset for chunk in batch.chunks] == [0, 3, 6, 9]
+    assert batch.results() == [3, 12, 21, 9]
+    assert (batch.succeeded, batch.failed) == (10, 0)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_failed_chunk_does_not_abort_its_siblings(workers):
+    def handler(chunk):
+        if 4 in chunk:
+            raise RuntimeError("boom")
+        return list(chunk)
+
+    batch = run_batches("create", list(range(9)), handler, chunk_size=3, max_workers=workers)
+
+    assert (batch.succeeded, batch.failed) == (6, 3)
+    failed = batch.chunks[1]
+    assert not failed.succeeded
+    assert failed.error == "RuntimeError: boom"
+    assert batch.to_dict()["chunks"][1]["status"] == "failed"
+    assert batch.results() == [[0, 1, 2], [6, 7, 8]]
+
+
+def test_skipped_chunks_are_not_sent():
+    sent = []
+    batch = run_batches("create", list(range(9)), lambda chunk: sent.append(list(chunk)), 3, 2, skip={0, 2})
+
+    assert sent == [[3, 4, 5]]
+    assert [chunk.index for chunk in batch.chunks] == [1]
+    assert batch.total == 9
+
+
+def test_everything_skipped_sends_nothing():
+    batch = run_batches("create", [1, 2], lambda chunk: pytest.fail("sent"), 1, 2, skip={0, 1})
+
+    assert batch.chunks == []
+
+
+def test_chunks_not_started_after_cancel_are_dropped():
+    cancel = threading.Event()
+    finished = []
+
+    def handler(chunk):
+        cancel.set()
+        return chunk
+
+    batch = run_batches(
+        "create", list(range(6)), handler, 2, 1, on_chunk=finished.append, cancel=cancel
+    )
+
+    assert [chunk.index for chunk in batch.chunks] == [0]
+    assert [chunk.index for chunk in finished] == [0]
@@ -0,0 +1,68 @@
+import pytest
+
+from dataverse_mcp_server import bulkdelete, server
+from dataverse_mcp_server.bulkdelete import conditions_to_fetchxml, fetchxml_entity, wait_for_async_operation
+from dataverse_mcp_server.throttling import RateGovernor
+
+
+def test_conditions_to_fetchxml():
+    fetchxml = conditions_to_fetchxml("Account", {"StateCode": 1, "donotemail": True, "parentaccountid": None})
+
+    assert fetchxml == (
+        '<fetch><entity name="account"><filter type="and">'
+        '<condition attribute="statecode" operator="eq" value="1" />'
+        '<condition attribute="donotemail" operator="eq" value="1" />'
+        '<condition attribute="parentaccountid" operator="null" />'
+        "</filter></entity></fetch>"
+    )
+    with pytest.raises(ValueError, match="must not be empty"):
+        conditions_to_fetchxml("account", {})
+
+
+def test_fetchxml_entity():
+    assert fetchxml_entity('<fetch top="5"><entity name="Contact"><all-attributes/></entity></fetch>') == "contact"
+    with pytest.raises(ValueError, match="not well-formed"):
+        fetchxml_entity("<fetch>")
+    with pytest.raises(ValueError, match="<entity name"):
+        fetchxml_entity("<fetch><entity/></fetch>")
+
+
+def test_delete_by_query_rejects_fetchxml_for_another_table(monkeypatch):
+    monkeypatch.setattr(server, "_client", lambda environment: pytest.fail("reached Dataverse"))
+
+    with pytest.raises(ValueError, match="targets entity 'account' but table is 'contact'"):
+        server._delete_by_query("contact", '<fetch><entity name="account"/></fetch>', None, False, 0, None)
+
+
+def test_throttled_polls_count_as_still_running(monkeypatch, http_error):
+    statuses = iter(
+        [
+            http_error(429),
+            {"job_id": "j", "completed": False, "status": "in_progress"},
+            http_error(503),
+            {"job_id": "j", "completed": True, "status": "succeeded"},
+        ]
+    )
+
+    def status(client, job_id):
+        value = next(statuses)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    monkeypatch.setattr(bulkdelete, "async_operation_status", status)
+    # No retries, so each throttle reaches the wait loop instead of being absorbed by the governor.
+    governor = RateGovernor(max_retries=0)
+
+    result = wait_for_async_operation(None, "j", timeout_seconds=5, poll_seconds=0, call=governor.call)
+
+    assert result["status"] == "succeeded"
+    assert next(statuses, None) is None
+
+
+def test_other_poll_errors_are_raised(monkeypatch, http_error):
+    monkeypatch.setattr(bulkdelete, "async_operation_status", lambda client, job_id: (_ for _ in ()).throw(http_error(500)))
+
+    with pytest.raises(Exception) as raised:
+        wait_for_async_operation(None, "j", timeout_seconds=5, poll_seconds=0)
+    assert raised.value.status_code == 500
@@ -0,0 +1,75 @@
+import pytest
+
+from dataverse_mcp_server import changetracking
+from dataverse_mcp_server.changetracking import DELETE, UPSERT, DeltaLinkStore, iter_changes
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DeltaLinkStore(tmp_path / "delta.sqlite3")
+    yield store
+    store.close()
+
+
+def test_delta_links_are_kept_per_environment_and_table(store):
+    assert store.get("default", "account") is None
+
+    store.save("default", "Account", ["name", "revenue"], "link-1")
+    store.save("test", "account", None, "link-2")
+
+    assert store.get("default", "ACCOUNT")["delta_link"] == "link-1"
+    assert store.get("default", "account")["select"] == ["name", "revenue"]
+    assert store.get("test", "account")["select"] is None
+
+
+def test_saving_replaces_the_previous_link(store):
+    first = store.save("default", "account", ["name"], "link-1")
+    second = store.save("default", "account", ["name"], "link-2")
+
+    saved = store.get("default", "account")
+    assert saved["delta_link"] == "link-2"
+    assert saved["synced_at"] == second >= first
+
+
+def test_links_survive_reopening(tmp_path):
+    path = tmp_path / "delta.sqlite3"
+    store = DeltaLinkStore(path)
+    store.save("default", "account", ["name"], "link-1")
+    store.close()
+
+    reopened = DeltaLinkStore(path)
+    assert reopened.get("default", "account")["delta_link"] == "link-1"
+    reopened.close()
+
+
+def test_iter_changes_follows_next_links_and_returns_the_delta_link(monkeypatch):
+    pages = {
+        "accounts": {
+            "value": [{"@odata.etag": "W/1", "accountid": "a", "name": "A"}],
+            "@odata.nextLink": "page-2",
+        },
+        "page-2": {
+            "value": [{"@odata.context": "...$deletedEntity", "id": "b", "reason": "deleted"}],
+            "@odata.deltaLink": "delta-1",
+        },
+    }
+    requests = []
+
+    def request_json(client, method, url, params=None, headers=None):
+        requests.append((url, params, headers["Prefer"]))
+        return pages[url]
+
+    monkeypatch.setattr(changetracking.webapi, "primary_id_attribute", lambda client, table: "accountid")
+    monkeypatch.setattr(changetracking.webapi, "entity_set_name", lambda client, table: "accounts")
+    monkeypatch.setattr(changetracking.webapi, "request_json", request_json)
+
+    pages_seen = list(iter_changes(None, "account", select=["name"], page_size=1))
+
+    assert pages_seen == [
+        ([{"change": UPSERT, "id": "a", "record": {"accountid": "a", "name": "A"}}], None),
+        ([{"change": DELETE, "id": "b", "record": None}], "delta-1"),
+    ]
+    assert requests == [
+        ("accounts", {"$select": "name"}, "odata.track-changes,odata.maxpagesize=1"),
+        ("page-2", None, "odata.track-changes,odata.maxpagesize=1"),
+    ]
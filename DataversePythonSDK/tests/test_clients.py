@@ -0,0 +1,188 @@
+import inspect
+import time
+
+import pytest
+import requests
+from azure.core.credentials import AccessToken
+from requests.adapters import HTTPAdapter
+from PowerPlatform.Dataverse.client import DataverseClient
+from PowerPlatform.Dataverse.core._http import _HttpClient
+
+from dataverse_mcp_server.clients import ClientRegistry, _PooledHttpClient, parse_environments
+
+DEV = "https://dev.crm.dynamics.com"
+PROD = "https://prod.crm.dynamics.com"
+
+
+class Credential:
+    def get_token(self, *scopes, **kwargs):
+        return AccessToken("token", int(time.time() + 3600))
+
+
+class StubAdapter(HTTPAdapter):
+    """Answers every request with an empty 200 JSON body and records what was sent."""
+
+    def __init__(self, failures=0):
+        super().__init__()
+        self.failures = failures
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append((request, kwargs))
+        if self.failures:
+            self.failures -= 1
+            raise requests.exceptions.ConnectionError("connection reset")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"{}"
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url
+        response.request = request
+        return response
+
+
+@pytest.fixture
+def make_registry():
+    registries = []
+
+    def make(**kwargs):
+        kwargs.setdefault("environments", {"dev": DEV, "prod": PROD})
+        kwargs.setdefault("default", "dev")
+        registry = ClientRegistry(lambda url: DataverseClient(url, Credential()), **kwargs)
+        registries.append(registry)
+        return registry
+
+    yield make
+    for registry in registries:
+        registry.close()
+
+
+def _stub(registry, url):
+    adapter = StubAdapter()
+    registry._entries[url].session.mount("https://", adapter)
+    return adapter
+
+
+def test_sdk_http_client_contract_is_unchanged():
+    # ClientRegistry swaps _ODataClient._http for a _PooledHttpClient; these are the SDK internals it relies on.
+    odata = DataverseClient(DEV, Credential())._get_odata()
+    assert type(odata._http) is _HttpClient
+    assert list(inspect.signature(_HttpClient.__init__).parameters) == ["self", "retries", "backoff", "timeout"]
+    assert list(inspect.signature(_HttpClient._request).parameters) == ["self", "method", "url", "kwargs"]
+    assert {"max_attempts", "base_delay", "default_timeout"} <= set(vars(odata._http))
+    assert "self._http._request(method, url, **kwargs)" in inspect.getsource(type(odata)._raw_request)
+
+
+def test_sdk_requests_go_through_the_pooled_session(make_registry):
+    registry = make_registry()
+    client = registry.get()
+    adapter = _stub(registry, DEV)
+
+    odata = client._get_odata()
+    assert isinstance(odata._http, _PooledHttpClient)
+    response = odata._request("get", f"{odata.api}/WhoAmI")
+
+    assert response.status_code == 200
+    [(request, kwargs)] = adapter.sent
+    assert request.url == f"{DEV}/api/data/v9.2/WhoAmI"
+    assert request.headers["Authorization"] == "Bearer token"
+    assert kwargs["timeout"] == 10
+    assert registry._entries[DEV].requests == 1
+
+
+def test_pooled_client_keeps_the_sdk_retry_and_timeout_settings():
+    base = _HttpClient(retries=3, backoff=0, timeout=None)
+    session = requests.Session()
+    adapter = StubAdapter(failures=2)
+    session.mount("https://", adapter)
+    calls = []
+    pooled = _PooledHttpClient(base, session, lambda: calls.append(1))
+
+    response = pooled._request("post", f"{DEV}/api/data/v9.2/accounts", json={})
+
+    assert response.status_code == 200
+    assert len(adapter.sent) == 3
+    assert {kwargs["timeout"] for _, kwargs in adapter.sent} == {120}
+    assert calls == [1]
+
+    adapter.failures = 3
+    with pytest.raises(requests.exceptions.ConnectionError):
+        pooled._request("get", f"{DEV}/api/data/v9.2/accounts")
+
+
+def test_unsupported_sdk_fails_loudly():
+    class NoHttp:
+        pass
+
+    class Client:
+        def _get_odata(self):
+            return NoHttp()
+
+    registry = ClientRegistry(lambda url: Client(), {"dev": DEV}, default="dev")
+
+    with pytest.raises(RuntimeError, match="0.1.0b3"):
+        registry.get()
+    assert registry._entries == {}
+
+
+def test_environments_get_separate_clients_and_sessions(make_registry):
+    registry = make_registry()
+
+    dev, prod = registry.get("dev"), registry.get("PROD")
+    assert dev is not prod
+    assert registry.get() is dev
+    assert registry.get(f"{PROD}/") is prod
+    assert registry._entries[DEV].session is not registry._entries[PROD].session
+
+    dev_adapter, prod_adapter = _stub(registry, DEV), _stub(registry, PROD)
+    odata = dev._get_odata()
+    odata._request("get", f"{odata.api}/WhoAmI")
+
+    assert len(dev_adapter.sent) == 1 and prod_adapter.sent == []
+    assert registry._entries[DEV].requests == 1
+    assert registry._entries[PROD].requests == 0
+    assert prod._get_odata()._http is not odata._http
+
+
+def test_unknown_environments_are_refused(make_registry):
+    registry = make_registry()
+
+    with pytest.raises(ValueError, match="Unknown Dataverse environment 'https://other.crm.dynamics.com'"):
+        registry.get("https://other.crm.dynamics.com")
+    with pytest.raises(ValueError, match="No default Dataverse environment"):
+        make_registry(default=None).get()
+    with pytest.raises(ValueError, match="Invalid environment entry"):
+        parse_environments("dev")
+
+
+def test_idle_clients_are_evicted_and_rebuilt(make_registry):
+    evicted = []
+    registry = make_registry(idle_seconds=60, on_evict=evicted.append)
+    dev, prod = registry.get("dev"), registry.get("prod")
+    dev_session = registry._entries[DEV].session
+    closed = []
+    dev_session.close = lambda: closed.append(DEV)
+
+    registry._entries[DEV].last_used -= 61
+    assert registry.get("prod") is prod
+    assert evicted == [DEV] and closed == [DEV]
+    assert set(registry._entries) == {PROD}
+
+    rebuilt = registry.get("dev")
+    assert rebuilt is not dev
+    assert registry._entries[DEV].session is not dev_session
+    assert [entry["active"] for entry in registry.snapshot()] == [True, True]
+
+
+def test_requests_keep_a_client_from_being_evicted(make_registry):
+    registry = make_registry(idle_seconds=60)
+    client = registry.get()
+    _stub(registry, DEV)
+    registry._entries[DEV].last_used -= 61
+
+    # A request through the SDK refreshes last_used just like a registry lookup does.
+    odata = client._get_odata()
+    odata._request("get", f"{odata.api}/WhoAmI")
+
+    assert registry.evict_idle() == []
+    assert registry.get() is client
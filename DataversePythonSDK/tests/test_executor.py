@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import dataverse_mcp_server.server as server
+from dataverse_mcp_server.executor import ToolExecutor
+from dataverse_mcp_server.logconfig import REQUEST_ID, TOOL
+from dataverse_mcp_server.metrics import TOOL_CALLS, TOOLS_IN_FLIGHT
+
+
+class Tracker:
+    """Blocking callable that records how many copies of itself run at once."""
+
+    def __init__(self, hold=0.05):
+        self.hold = hold
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value=None):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.hold)
+        with self._lock:
+            self.running -= 1
+        return value
+
+
+@pytest.fixture
+def make_executor():
+    executors = []
+
+    def make(*args, **kwargs):
+        executor = ToolExecutor(*args, **kwargs)
+        executors.append(executor)
+        return executor
+
+    yield make
+    for executor in executors:
+        executor.shutdown()
+
+
+def test_each_tool_is_held_to_its_own_limit(make_executor):
+    executor = make_executor(max_workers=8, default_limit=3, limits={"slow_tool": 2})
+    slow, other = Tracker(), Tracker()
+
+    async def scenario():
+        return await asyncio.gather(
+            *(executor.run("slow_tool", slow, index) for index in range(6)),
+            *(executor.run("other_tool", other, index) for index in range(6)),
+        )
+
+    assert asyncio.run(scenario()) == [*range(6), *range(6)]
+    assert slow.peak == 2
+    assert other.peak == 3
+    assert executor.limit_for("slow_tool") == 2 and executor.limit_for("other_tool") == 3
+
+
+def test_a_saturated_tool_does_not_block_other_tools(make_executor):
+    executor = make_executor(max_workers=4, default_limit=2)
+    release = threading.Event()
+    started = []
+
+    def stuck():
+        started.append(1)
+        release.wait(5)
+
+    async def scenario():
+        blocked = [asyncio.ensure_future(executor.run("stuck_tool", stuck)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        result = await asyncio.wait_for(executor.run("free_tool", lambda: "done"), timeout=5)
+        # Two calls hold stuck_tool's slots; the other two wait for a slot rather than a worker.
+        saturated = executor._semaphore("stuck_tool").locked(), len(started)
+        release.set()
+        await asyncio.gather(*blocked)
+        return result, saturated
+
+    assert asyncio.run(scenario()) == ("done", (True, 2))
+    assert len(started) == 4
+
+
+def test_the_shared_pool_caps_calls_across_tools(make_executor):
+    executor = make_executor(max_workers=2, default_limit=4)
+    tracker = Tracker()
+
+    async def scenario():
+        await asyncio.gather(*(executor.run(f"tool_{index % 3}", tracker) for index in range(9)))
+
+    asyncio.run(scenario())
+    assert tracker.peak == 2
+
+
+def test_calls_carry_a_fresh_request_id_onto_the_worker_thread(make_executor):
+    executor = make_executor(max_workers=2, default_limit=2)
+
+    def seen():
+        return REQUEST_ID.get(), TOOL.get(), threading.current_thread().name
+
+    async def scenario():
+        return await asyncio.gather(executor.run("whoami", seen), executor.run("whoami", seen))
+
+    (first_id, first_tool, thread), (second_id, second_tool, _) = asyncio.run(scenario())
+    assert first_id and second_id and first_id != second_id
+    assert first_tool == second_tool == "whoami"
+    assert thread.startswith("dv-tool")
+    # The caller's context is left as it was.
+    assert REQUEST_ID.get() is None and TOOL.get() is None
+
+
+def test_errors_propagate_and_are_counted(make_executor):
+    executor = make_executor(max_workers=1, default_limit=1)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="boom"):
+            await executor.run("executor_test_failing", fail)
+        return await executor.run("executor_test_failing", lambda: "recovered")
+
+    assert asyncio.run(scenario()) == "recovered"
+    assert TOOL_CALLS._values[("executor_test_failing", "error")] == 1
+    assert TOOL_CALLS._values[("executor_test_failing", "success")] == 1
+    assert TOOLS_IN_FLIGHT._values[("executor_test_failing",)] == 0
+
+
+@pytest.mark.parametrize("kwargs", [{"max_workers": 0, "default_limit": 1}, {"max_workers": 1, "default_limit": 0}])
+def test_limits_must_be_positive(kwargs):
+    with pytest.raises(ValueError):
+        ToolExecutor(**kwargs)
+
+
+def test_server_reads_per_tool_limits_from_the_environment(monkeypatch):
+    monkeypatch.setenv("DATAVERSE_EXECUTOR_WORKERS", "6")
+    monkeypatch.setenv("DATAVERSE_TOOL_CONCURRENCY", "3")
+    monkeypatch.setenv("DATAVERSE_TOOL_CONCURRENCY_QUERY_RECORDS", "1")
+    monkeypatch.setenv("DATAVERSE_TOOL_CONCURRENCY_CREATE_MULTIPLE", " ")
+    server._executor.cache_clear()
+    try:
+        executor = server._executor()
+        assert (executor.max_workers, executor.default_limit) == (6, 3)
+        assert executor.limits == {"query_records": 1}
+        assert executor.limit_for("create_multiple") == 3
+        executor.shutdown()
+    finally:
+        server._executor.cache_clear()
@@ -0,0 +1,155 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from dataverse_mcp_server import server
+from dataverse_mcp_server.idempotency import IdempotencyStore, fingerprint
+from dataverse_mcp_server.server import _pin_rows
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = IdempotencyStore(tmp_path / "idempotency.sqlite3")
+    yield store
+    store.close()
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint("account", [{"a": 1, "b": 2}]) == fingerprint("account", [{"b": 2, "a": 1}])
+    assert fingerprint("account", [{"a": 1}]) != fingerprint("contact", [{"a": 1}])
+
+
+def test_replay_reuses_chunk_size_rows_and_committed_results(store):
+    with store.claim("k", "fp", 100, row_indexes=[0, 2, 3]) as (chunk_size, job_id, committed, pinned):
+        assert (chunk_size, job_id, committed, pinned) == (100, None, {}, [0, 2, 3])
+        store.record("k", 0, ["id-0"])
+        store.set_job("k", "job-1")
+
+    # A retry asks for a different chunk size and validates a different set of rows.
+    with store.claim("k", "fp", 10, row_indexes=[0, 1, 2, 3]) as (chunk_size, job_id, committed, pinned):
+        assert (chunk_size, job_id, committed, pinned) == (100, "job-1", {0: ["id-0"]}, [0, 2, 3])
+
+
+def test_key_reused_for_a_different_request_is_rejected(store):
+    with store.claim("k", "fp-1", 100):
+        pass
+
+    with pytest.raises(ValueError, match="already used for a different request"):
+        with store.claim("k", "fp-2", 100):
+            pass
+    # The rejected claim released the key.
+    with store.claim("k", "fp-1", 100):
+        pass
+
+
+def test_retry_during_an_in_flight_claim_waits_for_its_commits(store):
+    first_claimed = threading.Event()
+    seen = []
+
+    def retry():
+        first_claimed.wait(5)
+        with store.claim("k", "fp", 100) as (_, _, committed, _):
+            seen.append(committed)
+
+    thread = threading.Thread(target=retry)
+    thread.start()
+    with store.claim("k", "fp", 100):
+        first_claimed.set()
+        time.sleep(0.05)
+        store.record("k", 0, ["id-0"])
+    thread.join(5)
+
+    assert seen == [{0: ["id-0"]}]
+
+
+def test_retry_gives_up_after_wait_seconds(tmp_path):
+    store = IdempotencyStore(tmp_path / "idempotency.sqlite3", wait_seconds=0.05)
+    with store.claim("k", "fp", 100):
+        with pytest.raises(ValueError, match="still in progress; retry later"):
+            with store.claim("k", "fp", 100):
+                pass
+    store.close()
+
+
+def test_create_multiple_retried_mid_flight_returns_the_same_ids(tmp_path, fake_server, monkeypatch):
+    store = IdempotencyStore(tmp_path / "idempotency.sqlite3")
+    monkeypatch.setattr(server, "_idempotency", lambda: store)
+    entered, release = threading.Event(), threading.Event()
+    create = fake_server.client.create
+
+    def slow_create(table, records):
+        entered.set()
+        release.wait(5)
+        return create(table, records)
+
+    fake_server.client.create = slow_create
+    records = [{"name": str(index)} for index in range(4)]
+    results = {}
+
+    def call(name):
+        results[name] = server._create_multiple("account", records, 2, 1, validate=False, idempotency_key="k")
+
+    first = threading.Thread(target=call, args=("first",))
+    first.start()
+    assert entered.wait(5)
+    retry = threading.Thread(target=call, args=("retry",))
+    retry.start()
+    time.sleep(0.05)
+    release.set()
+    first.join(5)
+    retry.join(5)
+
+    assert len(fake_server.client.created) == 4
+    assert results["retry"]["created_ids"] == results["first"]["created_ids"]
+    assert results["retry"]["replayed_chunks"] == [0, 1]
+    store.close()
+
+
+def test_expired_keys_start_over(tmp_path):
+    store = IdempotencyStore(tmp_path / "idempotency.sqlite3", ttl_seconds=60)
+    with store.claim("k", "fp-1", 100):
+        store.record("k", 0, ["id-0"])
+    store._conn.execute("UPDATE requests SET created_at = ?", (time.time() - 120,))
+
+    with store.claim("k", "fp-2", 50) as (chunk_size, _, committed, _):
+        assert (chunk_size, committed) == (50, {})
+    store.close()
+
+
+def test_database_without_row_indexes_is_migrated(tmp_path):
+    path = tmp_path / "idempotency.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE requests (key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, chunk_size INTEGER NOT NULL, "
+        "job_id TEXT, created_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO requests VALUES ('k', 'fp', 5, NULL, ?)", (time.time(),))
+    conn.commit()
+    conn.close()
+
+    store = IdempotencyStore(path)
+    with store.claim("k", "fp", 100, row_indexes=[0]) as (chunk_size, _, _, pinned):
+        assert (chunk_size, pinned) == (5, None)
+    store.close()
+
+
+def test_pin_rows_reuses_the_first_attempts_rows():
+    records = [{"name": str(index)} for index in range(4)]
+    rejected = [{"row_index": 1, "reasons": ["'name': expected a string"]}]
+
+    assert _pin_rows(records, [0, 2, 3], rejected, None) == ([records[0], records[2], records[3]], [0, 2, 3], rejected)
+
+    # Metadata changed since the first attempt sent rows 0-2: those rows are sent again regardless,
+    # and only rows outside them stay rejected.
+    valid, row_indexes, now_rejected = _pin_rows(
+        records, [0, 2], [{"row_index": 3, "reasons": ["stale"]}, {"row_index": 1, "reasons": ["x"]}], [0, 1, 2]
+    )
+    assert row_indexes == [0, 1, 2]
+    assert valid == records[:3]
+    assert now_rejected == [{"row_index": 3, "reasons": ["stale"]}]
+
+    valid, row_indexes, now_rejected = _pin_rows(records, [0, 1, 2, 3], [], [0, 2, 3])
+    assert row_indexes == [0, 2, 3]
+    assert now_rejected == [{"row_index": 1, "reasons": ["rejected when this idempotency_key was first used"]}]
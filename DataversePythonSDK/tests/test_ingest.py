@@ -0,0 +1,156 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from dataverse_mcp_server import ingest, server
+from dataverse_mcp_server.ingest import RowError, RowMapper, coerce_value, detect_format, iter_rows, windows
+from dataverse_mcp_server.metadata import ColumnMetadata, TableMetadata
+
+TYPES = {"name": "String", "amount": "Integer", "price": "Money", "active": "Boolean", "stage": "Picklist"}
+
+ITEMS = TableMetadata(
+    logical_name="new_item",
+    entity_set_name="new_items",
+    primary_id_attribute="new_itemid",
+    primary_name_attribute="name",
+    columns={name: ColumnMetadata(name, attribute_type, "None", True, True) for name, attribute_type in TYPES.items()},
+    fetched_at=0.0,
+)
+
+
+@pytest.mark.parametrize(
+    "value, attribute_type, expected",
+    [
+        ("", "String", None),
+        (None, "Integer", None),
+        (" Yes ", "Boolean", True),
+        ("0", "Boolean", False),
+        (" 42 ", "Integer", 42),
+        ("-3", "Picklist", -3),
+        ("Open", "Picklist", "Open"),
+        ("1.25", "Money", 1.25),
+        (7.0, "BigInt", 7),
+        (12, "Memo", "12"),
+        ("text", "String", "text"),
+    ],
+)
+def test_coerce_value(value, attribute_type, expected):
+    assert coerce_value(value, attribute_type) == expected
+
+
+@pytest.mark.parametrize("value, attribute_type", [("maybe", "Boolean"), ("4.5", "Integer"), ("abc", "Money")])
+def test_coerce_value_rejects_bad_values(value, attribute_type):
+    with pytest.raises(ValueError):
+        coerce_value(value, attribute_type)
+
+
+def test_row_mapper_renames_coerces_and_ignores_unknown_columns():
+    mapper = RowMapper(TYPES, {"Item Name": "Name"})
+
+    assert mapper.map_row({"Item Name": "Widget", "AMOUNT": "3", "price": "", "colour": "red"}) == {
+        "name": "Widget",
+        "amount": 3,
+    }
+    assert mapper.ignored_columns == {"colour"}
+    with pytest.raises(ValueError, match="column 'active': 'sometimes' is not a boolean"):
+        mapper.map_row({"active": "sometimes"})
+
+
+def test_detect_format():
+    assert detect_format(Path("rows.ndjson")) == "jsonl"
+    assert detect_format(Path("rows.txt"), "CSV") == "csv"
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        detect_format(Path("rows.xlsx"))
+
+
+def test_windows():
+    assert list(windows(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(windows([], 3)) == []
+
+
+def test_bad_jsonl_lines_keep_their_offsets(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text('{"name": "a"}\n\n{"name": \n[1, 2]\n{"name": "d"}\n')
+
+    rows = list(iter_rows(path, "jsonl"))
+
+    assert rows[0] == {"name": "a"} and rows[3] == {"name": "d"}
+    assert isinstance(rows[1], RowError) and rows[1].reason.startswith("line 3: invalid JSON")
+    assert rows[2] == RowError("line 4: not a JSON object")
+    assert list(iter_rows(path, "jsonl", start_offset=3)) == [{"name": "d"}]
+
+
+def _failing_reader(rows):
+    def read(path):
+        yield from rows
+        raise OSError("disk went away")
+
+    return read
+
+
+def test_reader_failure_ends_with_a_fatal_row_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "_iter_csv", _failing_reader([{"name": "a"}, {"name": "b"}]))
+
+    rows = list(iter_rows(tmp_path / "rows.csv", "csv", start_offset=1))
+
+    assert rows == [{"name": "b"}, RowError("OSError: disk went away", fatal=True)]
+
+
+def test_malformed_csv_records_are_row_errors(tmp_path):
+    path = tmp_path / "rows.csv"
+    # A field over csv.field_size_limit() (128 KiB by default) is a csv.Error for that record only.
+    path.write_text("name\na\n" + "b" * 200_000 + "\nc\n")
+
+    rows = list(iter_rows(path, "csv"))
+
+    assert [row if isinstance(row, dict) else "error" for row in rows] == [{"name": "a"}, "error", {"name": "c"}]
+
+
+def _import(path, start_offset=0, chunk_size=2, max_workers=1):
+    return server._bulk_import_file("new_item", str(path), None, None, start_offset, None, chunk_size, max_workers)
+
+
+def test_import_rejects_unparseable_rows_and_continues(tmp_path, fake_server):
+    fake_server.tables["new_item"] = ITEMS
+    path = tmp_path / "rows.jsonl"
+    path.write_text("\n".join([json.dumps({"name": "a"}), "{oops", json.dumps({"amount": "x"}), json.dumps({"name": "d"})]))
+
+    result = _import(path)
+
+    assert (result["rows_read"], result["created"], result["rejected"], result["next_offset"]) == (4, 2, 2, 4)
+    assert [row["row_offset"] for row in result["rejected_rows"]] == [1, 2]
+    assert "error" not in result
+    assert fake_server.client.created == [{"name": "a"}, {"name": "d"}]
+
+
+def test_import_stopped_by_a_read_error_can_be_resumed(tmp_path, fake_server, monkeypatch):
+    fake_server.tables["new_item"] = ITEMS
+    path = tmp_path / "rows.csv"
+    path.write_text("name,amount\na,1\nb,2\nc,3\nd,4\n")
+    rows = [{"name": name, "amount": str(index + 1)} for index, name in enumerate("abc")]
+    read_csv = ingest._iter_csv
+    monkeypatch.setattr(ingest, "_iter_csv", _failing_reader(rows))
+
+    result = _import(path, start_offset=1)
+
+    assert (result["rows_read"], result["created"], result["next_offset"]) == (2, 2, 3)
+    assert result["error"] == "reading stopped at row 3: OSError: disk went away"
+    assert fake_server.client.created == [{"name": "b", "amount": 2}, {"name": "c", "amount": 3}]
+
+    monkeypatch.setattr(ingest, "_iter_csv", read_csv)
+    resumed = _import(path, start_offset=result["next_offset"])
+    assert (resumed["rows_read"], resumed["created"], resumed["next_offset"], "error" in resumed) == (1, 1, 4, False)
+    assert fake_server.client.created[-1] == {"name": "d", "amount": 4}
+
+
+def test_failed_chunks_report_row_offsets(tmp_path, fake_server):
+    fake_server.tables["new_item"] = ITEMS
+    fake_server.client.fail_when = lambda record: record.get("name") == "c"
+    path = tmp_path / "rows.jsonl"
+    path.write_text("\n".join(json.dumps({"name": name}) for name in "abcde"))
+
+    result = _import(path, chunk_size=2, max_workers=2)
+
+    assert (result["created"], result["failed"], result["next_offset"]) == (3, 2, 5)
+    assert result["failed_chunks"] == [{"row_offsets": [2, 3], "error": "RuntimeError: create rejected"}]
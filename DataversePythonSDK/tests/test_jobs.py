@@ -0,0 +1,179 @@
+import json
+import threading
+import time
+
+import pytest
+
+from dataverse_mcp_server.jobs import (
+    CANCELLED,
+    FAILED,
+    INTERRUPTED,
+    RUNNING,
+    SUCCEEDED,
+    Job,
+    JobManager,
+)
+
+
+class Planner:
+    """Chunk handler that records what was sent and fails chunks containing an item in ``fail``."""
+
+    def __init__(self, fail=(), gate: threading.Event | None = None):
+        self.fail = set(fail)
+        self.gate = gate
+        self.sent = []
+        self.entered = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, operation, table, params):
+        def handler(chunk):
+            self.entered.set()
+            if self.gate is not None:
+                self.gate.wait(5)
+            with self._lock:
+                self.sent.append(list(chunk))
+            if self.fail & set(chunk):
+                raise RuntimeError("chunk rejected")
+            return [f"id-{item}" for item in chunk]
+
+        return params["records"], handler
+
+
+def wait_for(manager, job_id, statuses=(SUCCEEDED, FAILED, CANCELLED)):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        status = manager.status(job_id)
+        if status["status"] in statuses:
+            return status
+        time.sleep(0.01)
+    pytest.fail(f"job {job_id} did not finish: {status}")
+
+
+def submit(manager, records, chunk_size=2):
+    return manager.submit("create_multiple", "account", {"records": records}, len(records), chunk_size, 2)
+
+
+def test_job_checkpoints_each_chunk(tmp_path):
+    manager = JobManager(tmp_path, Planner())
+
+    job_id = submit(manager, list(range(5)))["job_id"]
+    status = wait_for(manager, job_id)
+
+    assert status["status"] == SUCCEEDED
+    assert (status["total_chunks"], status["completed_chunks"], status["succeeded"]) == (3, 3, 5)
+    results = manager.status(job_id, include_results=True)["results"]
+    assert results == [["id-0", "id-1"], ["id-2", "id-3"], ["id-4"]]
+    assert len((tmp_path / f"{job_id}.checkpoint.jsonl").read_text().splitlines()) == 3
+
+
+def test_resume_sends_only_failed_chunks(tmp_path):
+    planner = Planner(fail={2})
+    manager = JobManager(tmp_path, planner)
+
+    job_id = submit(manager, list(range(6)))["job_id"]
+    status = wait_for(manager, job_id)
+    assert status["status"] == FAILED
+    assert status["failed_chunks"] == [{"index": 1, "offset": 2, "size": 2, "error": "RuntimeError: chunk rejected"}]
+
+    planner.fail.clear()
+    planner.sent.clear()
+    manager.resume(job_id)
+    status = wait_for(manager, job_id)
+
+    assert planner.sent == [[2, 3]]
+    assert status["status"] == SUCCEEDED
+    assert status["failed_chunks"] == []
+    assert status["succeeded"] == 6
+
+
+def test_job_left_running_by_a_previous_process_is_interrupted_and_resumable(tmp_path):
+    job = Job(job_id="abc", operation="create_multiple", table="account", total=6, chunk_size=2, max_workers=1, status=RUNNING)
+    (tmp_path / "abc.json").write_text(json.dumps(job.__dict__))
+    (tmp_path / "abc.payload.json").write_text(json.dumps({"records": list(range(6))}))
+    # Chunk 0 landed; the crash tore the line for chunk 2 mid-write.
+    (tmp_path / "abc.checkpoint.jsonl").write_text('{"index": 0, "result": ["id-0", "id-1"]}\n{"index": 2, "res')
+
+    planner = Planner()
+    manager = JobManager(tmp_path, planner)
+    status = manager.status("abc")
+    assert status["status"] == INTERRUPTED
+    assert status["completed_chunks"] == 1
+
+    manager.resume("abc")
+    status = wait_for(manager, "abc")
+
+    assert sorted(planner.sent) == [[2, 3], [4, 5]]
+    assert status["status"] == SUCCEEDED
+    assert status["completed_chunks"] == 3
+
+
+def test_finished_job_cannot_be_resumed(tmp_path):
+    manager = JobManager(tmp_path, Planner())
+    job_id = submit(manager, [1])["job_id"]
+    wait_for(manager, job_id)
+
+    with pytest.raises(ValueError, match="cannot be resumed"):
+        manager.resume(job_id)
+    with pytest.raises(ValueError, match="Unknown job_id"):
+        manager.status("missing")
+
+
+def test_concurrent_resumes_start_one_runner(tmp_path):
+    gate = threading.Event()
+    planner = Planner(fail={0})
+    manager = JobManager(tmp_path, planner)
+    job_id = submit(manager, [0, 1])["job_id"]
+    wait_for(manager, job_id)
+    planner.fail.clear()
+    planner.gate = gate
+
+    outcomes = []
+
+    def resume():
+        try:
+            manager.resume(job_id)
+            outcomes.append("started")
+        except ValueError:
+            outcomes.append("rejected")
+
+    threads = [threading.Thread(target=resume) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    gate.set()
+    wait_for(manager, job_id)
+
+    assert outcomes.count("started") == 1
+    assert planner.sent[1:] == [[0, 1]]
+
+
+def test_cancel_drops_chunks_not_yet_started(tmp_path):
+    gate = threading.Event()
+    planner = Planner(gate=gate)
+    manager = JobManager(tmp_path, planner)
+    job_id = manager.submit("create_multiple", "account", {"records": list(range(6))}, 6, 2, 1)["job_id"]
+    assert planner.entered.wait(5)
+
+    manager.cancel(job_id)
+    gate.set()
+    status = wait_for(manager, job_id)
+
+    assert status["status"] == CANCELLED
+    assert status["completed_chunks"] == 1
+    with pytest.raises(ValueError, match="not running"):
+        manager.cancel(job_id)
+
+
+def test_status_polls_during_a_run_see_a_consistent_snapshot(tmp_path):
+    planner = Planner(fail=set(range(0, 400, 2)))
+    manager = JobManager(tmp_path, planner)
+    job_id = manager.submit("create_multiple", "account", {"records": list(range(400))}, 400, 1, 8)["job_id"]
+
+    polls = 0
+    while manager.status(job_id)["status"] not in (SUCCEEDED, FAILED, CANCELLED):
+        polls += 1
+    status = wait_for(manager, job_id)
+
+    assert polls > 0
+    assert len(status["failed_chunks"]) == 200
@@ -0,0 +1,50 @@
+import json
+import logging
+
+import pytest
+
+from dataverse_mcp_server.logconfig import (
+    CorrelationFilter,
+    JsonFormatter,
+    SamplingFilter,
+    correlation,
+    parse_sample_rates,
+)
+
+
+def record(level=logging.INFO, hot=False, **extra):
+    built = logging.LogRecord("dataverse_mcp_server.test", level, __file__, 1, "chunk %d done", (3,), None)
+    if hot:
+        built.hot = True
+    built.__dict__.update(extra)
+    return built
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("debug=0.01, INFO=2") == {logging.DEBUG: 0.01, logging.INFO: 1.0}
+    assert parse_sample_rates(None) == {}
+    with pytest.raises(ValueError, match="expected LEVEL=rate"):
+        parse_sample_rates("LOUD=0.5")
+
+
+def test_sampling_only_drops_hot_records():
+    sampler = SamplingFilter({logging.INFO: 0.0})
+
+    assert not sampler.filter(record(hot=True))
+    assert sampler.filter(record())
+    assert sampler.filter(record(level=logging.WARNING, hot=True))
+
+
+def test_json_lines_carry_correlation_ids_and_extra_fields():
+    with correlation(request_id="r1", tool="create_multiple"):
+        with correlation(job_id="j1"):
+            entry = record(records=10)
+            CorrelationFilter().filter(entry)
+        outer = record()
+        CorrelationFilter().filter(outer)
+
+    line = json.loads(JsonFormatter().format(entry))
+
+    assert line["message"] == "chunk 3 done"
+    assert (line["request_id"], line["tool"], line["job_id"], line["records"]) == ("r1", "create_multiple", "j1", 10)
+    assert "job_id" not in json.loads(JsonFormatter().format(outer))
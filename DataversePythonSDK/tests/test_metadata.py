@@ -0,0 +1,163 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from dataverse_mcp_server import metadata, webapi
+from dataverse_mcp_server.metadata import MetadataCache, TableMetadata, fetch_table_metadata
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(metadata, "time", SimpleNamespace(monotonic=clock.monotonic, time=time.time))
+    return clock
+
+
+class Loader:
+    def __init__(self):
+        self.loads = []
+
+    def __call__(self, table):
+        self.loads.append(table)
+        return TableMetadata(table, f"{table}s", f"{table}id", "name", {}, fetched_at=len(self.loads))
+
+
+def test_lookups_are_cached_by_normalized_name(clock):
+    loader = Loader()
+    cache = MetadataCache(loader)
+
+    first = cache.get(" Account ")
+    assert cache.get("account") is first
+    assert cache.get("ACCOUNT") is first
+
+    assert loader.loads == ["account"]
+    assert cache.snapshot() == {"entries": 1, "max_entries": 256, "ttl_seconds": 900.0, "hits": 2, "misses": 1}
+
+
+def test_entries_expire_after_the_ttl(clock):
+    loader = Loader()
+    cache = MetadataCache(loader, ttl_seconds=60)
+
+    first = cache.get("account")
+    clock.now += 59.9
+    assert cache.get("account") is first
+
+    clock.now += 0.1
+    second = cache.get("account")
+    assert second is not first
+    assert loader.loads == ["account", "account"]
+
+    # The reload restarts the TTL.
+    clock.now += 59.9
+    assert cache.get("account") is second
+
+
+def test_least_recently_used_table_is_evicted(clock):
+    loader = Loader()
+    cache = MetadataCache(loader, max_entries=2)
+
+    cache.get("account")
+    cache.get("contact")
+    cache.get("account")
+    cache.get("lead")
+
+    assert list(cache._entries) == ["account", "lead"]
+    cache.get("account")
+    cache.get("contact")
+    assert loader.loads == ["account", "contact", "lead", "contact"]
+    assert list(cache._entries) == ["account", "contact"]
+
+
+def test_refresh_and_invalidate(clock):
+    loader = Loader()
+    cache = MetadataCache(loader)
+
+    first = cache.get("account")
+    refreshed = cache.refresh("Account")
+    assert refreshed is not first
+    assert cache.get("account") is refreshed
+
+    assert cache.invalidate("ACCOUNT") is True
+    assert cache.invalidate("account") is False
+    cache.get("account")
+    assert loader.loads == ["account", "account", "account"]
+
+
+def test_fetch_table_metadata_reads_columns_and_max_lengths(monkeypatch):
+    responses = {
+        "EntityDefinitions(LogicalName='account')": {
+            "LogicalName": "account",
+            "EntitySetName": "accounts",
+            "PrimaryIdAttribute": "accountid",
+            "PrimaryNameAttribute": "name",
+            "Attributes": [
+                {
+                    "LogicalName": "name",
+                    "AttributeType": "String",
+                    "RequiredLevel": {"Value": "ApplicationRequired"},
+                    "IsValidForCreate": True,
+                    "IsValidForUpdate": True,
+                },
+                {
+                    "LogicalName": "description",
+                    "AttributeType": "Memo",
+                    "RequiredLevel": {"Value": "None"},
+                    "IsValidForCreate": True,
+                    "IsValidForUpdate": False,
+                },
+                {
+                    "LogicalName": "primarycontactidname",
+                    "AttributeType": "String",
+                    "IsValidForCreate": False,
+                    "AttributeOf": "primarycontactid",
+                },
+                {"AttributeType": "String"},
+            ],
+        },
+        "EntityDefinitions(LogicalName='account')/Attributes/Microsoft.Dynamics.CRM.StringAttributeMetadata": {
+            "value": [{"LogicalName": "name", "MaxLength": 160}, {"LogicalName": "primarycontactidname"}]
+        },
+        "EntityDefinitions(LogicalName='account')/Attributes/Microsoft.Dynamics.CRM.MemoAttributeMetadata": {
+            "value": [{"LogicalName": "description", "MaxLength": 2000}]
+        },
+    }
+    requested = []
+
+    def request_json(client, method, path, **kwargs):
+        requested.append(path)
+        return responses[path]
+
+    monkeypatch.setattr(webapi, "request_json", request_json)
+
+    table = fetch_table_metadata(object(), "Account")
+
+    assert len(requested) == 3
+    assert (table.logical_name, table.entity_set_name, table.primary_id_attribute, table.primary_name_attribute) == (
+        "account",
+        "accounts",
+        "accountid",
+        "name",
+    )
+    assert sorted(table.columns) == ["description", "name", "primarycontactidname"]
+    name, description, lookup_name = (
+        table.columns["name"],
+        table.columns["description"],
+        table.columns["primarycontactidname"],
+    )
+    assert (name.required_level, name.max_length, name.valid_for_update) == ("ApplicationRequired", 160, True)
+    assert (description.attribute_type, description.max_length, description.valid_for_update) == ("Memo", 2000, False)
+    assert (lookup_name.required_level, lookup_name.max_length, lookup_name.attribute_of) == (
+        "None",
+        None,
+        "primarycontactid",
+    )
+    assert table.summary()["columns"] == 3
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from dataverse_mcp_server import server
+from dataverse_mcp_server.metrics import REGISTRY, MetricsRegistry
+
+
+def test_counter_and_gauge_render_one_line_per_label_set():
+    registry = MetricsRegistry()
+    calls = registry.counter("test_calls_total", "Calls by outcome.", ("tool", "outcome"))
+    in_flight = registry.gauge("test_in_flight", "Calls running.", ("tool",))
+    calls.inc(tool="query", outcome="success")
+    calls.inc(2, tool="query", outcome="success")
+    calls.inc(0.5, outcome="error", tool="create")
+    in_flight.inc(tool="query")
+    in_flight.inc(tool="query")
+    in_flight.dec(tool="query")
+    in_flight.set(7, tool="create")
+
+    assert registry.render() == (
+        "# HELP test_calls_total Calls by outcome.\n"
+        "# TYPE test_calls_total counter\n"
+        'test_calls_total{tool="create",outcome="error"} 0.5\n'
+        'test_calls_total{tool="query",outcome="success"} 3\n'
+        "# HELP test_in_flight Calls running.\n"
+        "# TYPE test_in_flight gauge\n"
+        'test_in_flight{tool="create"} 7\n'
+        'test_in_flight{tool="query"} 1\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("test_seconds", "Latency.", ("tool",), buckets=(1, 0.1, 10))
+    for value in (0.05, 0.1, 0.5, 5, 50):
+        latency.observe(value, tool="query")
+
+    assert registry.render().splitlines()[2:] == [
+        'test_seconds_bucket{tool="query",le="0.1"} 2',
+        'test_seconds_bucket{tool="query",le="1"} 3',
+        'test_seconds_bucket{tool="query",le="10"} 4',
+        'test_seconds_bucket{tool="query",le="+Inf"} 5',
+        'test_seconds_sum{tool="query"} 55.65',
+        'test_seconds_count{tool="query"} 5',
+    ]
+
+
+def test_unlabelled_metrics_render_without_braces():
+    registry = MetricsRegistry()
+    registry.gauge("test_up", "Up.").set(1)
+
+    assert registry.render().splitlines()[-1] == "test_up 1"
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("test_total", "Escaping.", ("table",)).inc(table='a"b\\c\nd')
+
+    assert registry.render().splitlines()[-1] == 'test_total{table="a\\"b\\\\c\\nd"} 1'
+
+
+@pytest.mark.parametrize(
+    "labels",
+    [{}, {"tool": "query"}, {"tool": "query", "outcome": "success", "extra": "x"}, {"tool": "query", "result": "ok"}],
+)
+def test_labels_must_match_the_declared_names(labels):
+    counter = MetricsRegistry().counter("test_total", "Labels.", ("tool", "outcome"))
+
+    with pytest.raises(ValueError, match=r"test_total expects labels \('tool', 'outcome'\)"):
+        counter.inc(**labels)
+
+
+def test_registering_a_name_twice_returns_the_same_metric_or_fails():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Help.", ("tool",))
+
+    assert registry.counter("test_total", "Other help.", ("tool",)) is counter
+    with pytest.raises(ValueError, match="different definition"):
+        registry.gauge("test_total", "Help.", ("tool",))
+    with pytest.raises(ValueError, match="different definition"):
+        registry.counter("test_total", "Help.", ("tool", "outcome"))
+
+
+def test_concurrent_increments_are_not_lost():
+    counter = MetricsRegistry().counter("test_total", "Concurrency.", ("tool",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(tool="query")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter._values[("query",)] == 8000
+
+
+def test_metrics_endpoint_serves_the_process_registry():
+    response = server.metrics_endpoint(None)
+
+    assert response.media_type == "text/plain; version=0.0.4"
+    body = response.body.decode()
+    assert body == REGISTRY.render()
+    assert "# TYPE dataverse_mcp_tool_calls_total counter" in body
+    assert "# TYPE dataverse_mcp_tool_duration_seconds histogram" in body
@@ -0,0 +1,171 @@
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from dataverse_mcp_server import odata_batch
+from dataverse_mcp_server.odata_batch import (
+    BatchOperation,
+    _match_results,
+    build_operations,
+    execute_batch,
+    parse_batch_response,
+    split_requests,
+)
+
+API = "https://org.crm.dynamics.com/api/data/v9.2"
+
+RESPONSE = """--batchresponse_1
+Content-Type: application/http
+Content-Transfer-Encoding: binary
+
+HTTP/1.1 204 No Content
+OData-EntityId: https://org.crm.dynamics.com/api/data/v9.2/accounts(11111111-1111-1111-1111-111111111111)
+
+--batchresponse_1
+Content-Type: multipart/mixed; boundary=changesetresponse_2
+
+--changesetresponse_2
+Content-Type: application/http
+Content-Transfer-Encoding: binary
+Content-ID: 1
+
+HTTP/1.1 201 Created
+Content-Type: application/json
+
+{"accountid": "22222222-2222-2222-2222-222222222222"}
+--changesetresponse_2
+Content-Type: application/http
+Content-Transfer-Encoding: binary
+Content-ID: 2
+
+HTTP/1.1 204 No Content
+
+--changesetresponse_2--
+--batchresponse_1
+Content-Type: application/http
+Content-Transfer-Encoding: binary
+
+HTTP/1.1 404 Not Found
+Content-Type: application/json
+
+{"error": {"code": "0x80040217", "message": "account Does Not Exist"}}
+--batchresponse_1--
+""".replace("\n", "\r\n")
+
+CONTENT_TYPE = "multipart/mixed; boundary=batchresponse_1"
+
+
+def operations(*specs):
+    return build_operations(None, list(specs))
+
+
+def test_build_operations_assigns_changeset_content_ids():
+    planned = operations(
+        {"method": "post", "path": "accounts", "data": {"name": "a"}},
+        {"changeset": [{"method": "POST", "path": "accounts", "content_id": "1"}, {"method": "PATCH", "path": "$1"}]},
+    )
+
+    assert planned[0].method == "POST"
+    assert [(op.index, op.content_id, op.changeset) for op in planned[1]] == [(1, "1", 1), (2, "2", 1)]
+
+
+@pytest.mark.parametrize(
+    "spec, error",
+    [
+        ({"method": "TRACE", "path": "accounts"}, "method must be one of"),
+        ({"method": "GET", "path": "accounts", "data": {}}, "do not take data"),
+        ({"changeset": [{"method": "GET", "path": "accounts"}]}, "cannot be part of a changeset"),
+        ({"changeset": []}, "non-empty list"),
+        ({"method": "GET"}, "either 'path' or 'table'"),
+    ],
+)
+def test_build_operations_rejects_invalid_input(spec, error):
+    with pytest.raises(ValueError, match=error):
+        operations(spec)
+
+
+def test_split_requests_never_splits_a_changeset():
+    single = [BatchOperation(index, "GET", "accounts") for index in range(3)]
+    changeset = [BatchOperation(index, "POST", "accounts", changeset=3) for index in range(3, 6)]
+
+    requests = list(split_requests([single[0], changeset, single[1], single[2]], max_operations=4))
+
+    assert requests == [[single[0], changeset], [single[1], single[2]]]
+    assert list(split_requests([], max_operations=4)) == []
+
+
+def test_render_batch_uses_absolute_urls_except_content_id_references():
+    planned = operations({"changeset": [{"method": "POST", "path": "accounts", "data": {"name": "a"}}, {"method": "PATCH", "path": "$1"}]})
+
+    boundary, body = odata_batch.render_batch(API, planned)
+
+    assert body.endswith(f"--{boundary}--\r\n")
+    assert f"POST {API}/accounts HTTP/1.1" in body
+    assert "PATCH $1 HTTP/1.1" in body
+    assert "Content-ID: 2" in body
+
+
+def test_parse_batch_response_nests_changesets():
+    top, changeset, missing = parse_batch_response(CONTENT_TYPE, RESPONSE)
+
+    assert top["status"] == 204
+    assert top["id"] == "11111111-1111-1111-1111-111111111111"
+    assert [(item["content_id"], item["status"]) for item in changeset] == [("1", 201), ("2", 204)]
+    assert changeset[0]["body"] == {"accountid": "22222222-2222-2222-2222-222222222222"}
+    assert (missing["succeeded"], missing["error"]) == (False, "account Does Not Exist")
+
+    with pytest.raises(ValueError, match="no multipart boundary"):
+        parse_batch_response("application/json", "{}")
+
+
+def test_match_results_marks_rollbacks_and_unsent_operations():
+    planned = operations(
+        {"method": "GET", "path": "accounts"},
+        {"changeset": [{"method": "POST", "path": "accounts"}, {"method": "POST", "path": "contacts"}]},
+        {"method": "DELETE", "path": "accounts(1)"},
+    )
+    failure = {"status": 400, "succeeded": False, "error": "bad"}
+
+    results = _match_results(planned, [{"status": 200, "succeeded": True}, failure])
+
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["succeeded"]
+    assert results[1]["rolled_back"] and results[2]["rolled_back"]
+    assert results[2]["error"] == "bad"
+    assert results[3] == {"index": 3, "method": "DELETE", "url": "accounts(1)", "succeeded": False, "not_executed": True}
+
+
+class _Client:
+    @contextmanager
+    def _scoped_odata(self):
+        yield SimpleNamespace(api=API)
+
+
+def _response(status_code, content_type, text):
+    return SimpleNamespace(
+        status_code=status_code, headers={"Content-Type": content_type}, text=text, json=lambda: json.loads(text)
+    )
+
+
+def test_execute_batch_keeps_per_operation_results_on_an_error_status(monkeypatch):
+    planned = operations(
+        {"method": "DELETE", "path": "accounts(1)"},
+        {"changeset": [{"method": "POST", "path": "accounts"}, {"method": "POST", "path": "accounts"}]},
+        {"method": "DELETE", "path": "accounts(2)"},
+    )
+    monkeypatch.setattr(odata_batch.webapi, "request", lambda *args, **kwargs: _response(400, CONTENT_TYPE, RESPONSE))
+
+    results = execute_batch(_Client(), planned)
+
+    assert [result["status"] for result in results] == [204, 201, 204, 404]
+
+
+def test_execute_batch_raises_for_a_non_multipart_error(monkeypatch):
+    error = json.dumps({"error": {"code": "0x8006088a", "message": "The batch is malformed"}})
+    monkeypatch.setattr(odata_batch.webapi, "request", lambda *args, **kwargs: _response(400, "application/json", error))
+
+    with pytest.raises(Exception, match="The batch is malformed") as raised:
+        execute_batch(_Client(), operations({"method": "GET", "path": "accounts"}))
+    assert raised.value.status_code == 400
@@ -0,0 +1,185 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from dataverse_mcp_server import probes, server, webapi
+from dataverse_mcp_server.clients import ClientRegistry
+from dataverse_mcp_server.probes import ProbeCache, who_am_i
+
+DEV = "https://dev.crm.dynamics.com"
+PROD = "https://prod.crm.dynamics.com"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(
+        probes, "time", SimpleNamespace(monotonic=clock.monotonic, time=time.time, perf_counter=time.perf_counter)
+    )
+    return clock
+
+
+class Probe:
+    def __init__(self, error=None, delay=0.0):
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"user_id": "user-1", "organization_id": "org-1"}
+
+
+def test_results_are_cached_for_the_min_interval(clock):
+    probe = Probe()
+    cache = ProbeCache(probe, min_interval=30)
+
+    first = cache.result()
+    clock.now += 29
+    second = cache.result()
+
+    assert probe.calls == 1
+    assert first["ok"] and first["user_id"] == "user-1" and first["cached"] is False
+    assert second["cached"] is True and second["age_seconds"] == 29.0
+    assert second["checked_at"] == first["checked_at"]
+
+    clock.now += 1
+    assert cache.result()["cached"] is False
+    assert cache.result(force=True)["cached"] is False
+    assert probe.calls == 3
+
+
+def test_failures_are_reported_and_cached(clock):
+    probe = Probe(error=RuntimeError("DNS lookup failed"))
+    cache = ProbeCache(probe, min_interval=30)
+
+    result = cache.result()
+    cache.result()
+
+    assert result["ok"] is False
+    assert result["error"] == "RuntimeError: DNS lookup failed"
+    assert probe.calls == 1
+
+
+def test_throttling_counts_as_reachable(clock, http_error):
+    result = ProbeCache(Probe(error=http_error(429, "Rate limit exceeded"))).result()
+
+    assert result["ok"] is True and result["throttled"] is True
+    assert "error" not in result
+
+
+def test_concurrent_callers_share_one_probe():
+    probe = Probe(delay=0.1)
+    cache = ProbeCache(probe)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.result())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert probe.calls == 1
+    assert len(results) == 8 and all(result["ok"] for result in results)
+
+
+def test_who_am_i_reports_the_caller_and_org(monkeypatch):
+    sent = []
+
+    def request_json(client, method, path, **kwargs):
+        sent.append((method, path))
+        return {"UserId": "user-1", "OrganizationId": "org-1", "BusinessUnitId": "bu-1"}
+
+    monkeypatch.setattr(webapi, "request_json", request_json)
+
+    assert who_am_i(object()) == {"user_id": "user-1", "organization_id": "org-1"}
+    assert sent == [("get", "WhoAmI")]
+
+
+@pytest.fixture
+def probed(monkeypatch):
+    """Two configured orgs whose WhoAmI probes are in-memory fakes keyed by URL."""
+    registry = ClientRegistry(lambda url: None, {"dev": DEV, "prod": PROD}, default="dev")
+    fakes = {DEV: Probe(), PROD: Probe()}
+    caches = {url: ProbeCache(probe) for url, probe in fakes.items()}
+    monkeypatch.setattr(server, "_clients", lambda: registry)
+    monkeypatch.setattr(server, "_probe", lambda url: caches[url])
+    return SimpleNamespace(registry=registry, probes=fakes)
+
+
+def _call(route, **query):
+    response = route(SimpleNamespace(query_params=query))
+    return response.status_code, json.loads(response.body)
+
+
+def test_ready_probes_the_requested_environment(probed):
+    status, body = _call(server.readiness_check)
+    assert status == 200
+    assert body["ready"] is True and body["url"] == DEV
+    assert body["probe"]["organization_id"] == "org-1"
+
+    status, body = _call(server.readiness_check, environment="prod")
+    assert (status, body["url"]) == (200, PROD)
+    assert (probed.probes[DEV].calls, probed.probes[PROD].calls) == (1, 1)
+
+
+def test_ready_fails_when_the_probe_fails_or_the_environment_is_unknown(probed):
+    probed.probes[DEV].error = RuntimeError("AADSTS7000215: invalid client secret")
+
+    status, body = _call(server.readiness_check)
+    assert status == 503
+    assert body["ready"] is False
+    assert "AADSTS7000215" in body["probe"]["error"]
+
+    status, body = _call(server.readiness_check, environment="staging")
+    assert status == 503
+    assert body == {"ready": False, "error": body["error"]}
+    assert "Unknown Dataverse environment 'staging'" in body["error"]
+
+
+def test_deep_health_probes_the_default_and_active_environments(probed, monkeypatch):
+    snapshot = [
+        {"name": "dev", "url": DEV, "default": True, "active": False},
+        {"name": "prod", "url": PROD, "default": False, "active": False},
+    ]
+    monkeypatch.setattr(probed.registry, "snapshot", lambda: snapshot)
+
+    status, body = _call(server.deep_health_check)
+    assert status == 200 and body["status"] == "ok"
+    # An idle, non-default org is not woken up by a health check.
+    assert [environment["name"] for environment in body["environments"]] == ["dev"]
+    assert "budget" in body["environments"][0]["throttling"]
+    assert probed.probes[PROD].calls == 0
+
+    snapshot[1]["active"] = True
+    probed.probes[PROD].error = RuntimeError("connection reset")
+    status, body = _call(server.deep_health_check)
+    assert status == 503 and body["status"] == "degraded"
+    assert [(environment["name"], environment["probe"]["ok"]) for environment in body["environments"]] == [
+        ("dev", True),
+        ("prod", False),
+    ]
+
+
+def test_deep_health_reports_missing_configuration(monkeypatch):
+    def unconfigured():
+        raise ValueError("DATAVERSE_URL or DATAVERSE_ENVIRONMENTS must be set")
+
+    monkeypatch.setattr(server, "_clients", unconfigured)
+
+    status, body = _call(server.deep_health_check)
+    assert status == 503
+    assert body == {"status": "error", "error": "DATAVERSE_URL or DATAVERSE_ENVIRONMENTS must be set"}
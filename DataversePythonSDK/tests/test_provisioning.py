@@ -0,0 +1,125 @@
+from enum import IntEnum
+
+import pytest
+
+from dataverse_mcp_server import provisioning
+from dataverse_mcp_server.provisioning import apply_plan, parse_schema, plan_schema
+
+SCHEMA = {
+    "tables": [
+        {"name": "new_Project", "columns": {"new_Code": "string", "new_Budget": "money"}},
+        {
+            "name": "new_Task",
+            "columns": {"new_Hours": "decimal", "new_Stage": {"type": "choice", "options": {"Open": 1, "Done": 2}}},
+        },
+    ],
+    "relationships": [
+        {
+            "name": "new_project_task",
+            "referenced_table": "new_Project",
+            "referencing_table": "new_Task",
+            "lookup": "new_ProjectId",
+        },
+        {"name": "new_account_project", "referenced_table": "account", "referencing_table": "new_Project", "lookup": "new_AccountId"},
+    ],
+}
+
+
+def test_parse_schema_normalises_columns_and_relationships():
+    tables, relationships = parse_schema(SCHEMA)
+
+    assert [table.name for table in tables] == ["new_Project", "new_Task"]
+    stage = tables[1].columns["new_Stage"]
+    assert issubclass(stage, IntEnum) and stage["Done"] == 2
+    assert [relationship.cascade_delete for relationship in relationships] == ["RemoveLink", "RemoveLink"]
+
+
+@pytest.mark.parametrize(
+    "document, error",
+    [
+        ({}, "no tables or relationships"),
+        ({"tables": [{"name": "a"}, {"name": "A"}]}, "listed more than once"),
+        ({"tables": [{"name": "a", "columns": {"c": "blob"}}]}, "unsupported column type 'blob'"),
+        ({"tables": [{"name": "a", "columns": {"c": {"type": "choice"}}}]}, "non-empty options"),
+        ({"relationships": [{"name": "r", "lookup": "l"}]}, "missing referenced_table, referencing_table"),
+        (
+            {"relationships": [{"name": "r", "referenced_table": "a", "referencing_table": "b", "lookup": "l", "cascade_delete": "Nope"}]},
+            "cascade_delete must be one of",
+        ),
+    ],
+)
+def test_parse_schema_rejects_invalid_documents(document, error):
+    with pytest.raises(ValueError, match=error):
+        parse_schema(document)
+
+
+@pytest.fixture
+def org(monkeypatch):
+    """An org where new_project exists with new_code, and new_account_project already exists."""
+    requests = []
+
+    def request_json(client, method, path, params=None, **kwargs):
+        requests.append(path)
+        if path == "EntityDefinitions":
+            return {"value": [{"LogicalName": "new_project", "MetadataId": "m-1"}]}
+        if path == "EntityDefinitions(m-1)/Attributes":
+            return {"value": [{"LogicalName": "new_projectid"}, {"LogicalName": "new_code"}]}
+        if path == "RelationshipDefinitions":
+            return {"value": [{"SchemaName": "new_account_project"}]}
+        raise AssertionError(f"unexpected request {path}")
+
+    monkeypatch.setattr(provisioning.webapi, "request_json", request_json)
+    return requests
+
+
+def test_plan_schema_only_lists_what_is_missing(org):
+    plan = plan_schema(None, *parse_schema(SCHEMA))
+
+    assert plan.summary() == {
+        "create_tables": ["new_Task"],
+        "add_columns": {"new_Project": ["new_Budget"]},
+        "create_relationships": ["new_project_task"],
+        "existing_tables": ["new_Project"],
+        "existing_columns": 1,
+        "existing_relationships": ["new_account_project"],
+    }
+    assert org == ["EntityDefinitions", "EntityDefinitions(m-1)/Attributes", "RelationshipDefinitions"]
+
+
+def test_plan_schema_for_an_up_to_date_org_is_empty(org):
+    document = {"tables": [{"name": "new_Project", "columns": {"new_Code": "string"}}]}
+
+    assert plan_schema(None, *parse_schema(document)).empty
+
+
+class _Client:
+    def __init__(self, fail_tables=()):
+        self.fail_tables = set(fail_tables)
+        self.calls = []
+
+    def create_table(self, name, columns, solution, primary_column):
+        self.calls.append(("table", name))
+        if name in self.fail_tables:
+            raise RuntimeError("denied")
+
+    def create_columns(self, table, columns):
+        self.calls.append(("columns", table, sorted(columns)))
+
+
+def test_apply_plan_skips_relationships_whose_tables_failed(org, monkeypatch):
+    plan = plan_schema(None, *parse_schema(SCHEMA))
+    client = _Client(fail_tables={"new_Task"})
+    monkeypatch.setattr(provisioning.webapi, "request", lambda *args, **kwargs: pytest.fail("relationship sent"))
+
+    results = apply_plan(client, plan)
+
+    assert sorted(client.calls) == [("columns", "new_Project", ["new_Budget"]), ("table", "new_Task")]
+    by_name = {result["name"]: result for result in results}
+    assert by_name["new_Task"]["error"] == "RuntimeError: denied"
+    assert by_name["new_Project"]["succeeded"]
+    assert by_name["new_project_task"] == {
+        "kind": "relationship",
+        "name": "new_project_task",
+        "succeeded": False,
+        "error": "skipped because table creation failed for new_task",
+    }
@@ -0,0 +1,105 @@
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+from urllib.parse import quote
+
+import pytest
+
+from dataverse_mcp_server import query, server
+from dataverse_mcp_server.query import iter_fetchxml_pages
+
+FETCH = '<fetch><entity name="account"><attribute name="name" /></entity></fetch>'
+
+
+def cookie(last_id):
+    # The Web API URL-encodes the inner cookie twice inside the annotation's XML.
+    inner = f'<cookie page="1"><accountid last="{last_id}" /></cookie>'
+    return f'<cookie pagenumber="2" pagingcookie="{quote(quote(inner))}" istracking="False" />'
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """Serve FetchXML pages from a list and record each request's <fetch> element."""
+    served = []
+    sent = []
+
+    def request_json(client, method, path, params=None, headers=None, **kwargs):
+        sent.append(ET.fromstring(params["fetchXml"]))
+        return served.pop(0)
+
+    monkeypatch.setattr(query.webapi, "entity_set_name", lambda client, table: "accounts")
+    monkeypatch.setattr(query.webapi, "request_json", request_json)
+    return SimpleNamespace(served=served, sent=sent)
+
+
+def test_paging_cookie_is_handed_to_the_next_page(pages):
+    pages.served.extend(
+        [
+            {"value": [{"name": "a"}], query._MORE_RECORDS: True, query._PAGING_COOKIE: cookie("A1")},
+            {"value": [{"name": "b"}], query._MORE_RECORDS: False},
+        ]
+    )
+
+    assert list(iter_fetchxml_pages(None, "account", FETCH, page_size=1)) == [[{"name": "a"}], [{"name": "b"}]]
+    assert [(fetch.get("page"), fetch.get("count")) for fetch in pages.sent] == [("1", "1"), ("2", "1")]
+    assert pages.sent[0].get("paging-cookie") is None
+    assert pages.sent[1].get("paging-cookie") == '<cookie page="1"><accountid last="A1" /></cookie>'
+
+
+def test_paging_stops_when_morerecords_is_false_or_top_is_set(pages):
+    pages.served.append({"value": [{"name": "a"}], query._MORE_RECORDS: False})
+    assert len(list(iter_fetchxml_pages(None, "account", FETCH))) == 1
+    assert pages.sent[0].get("count") == "5000"
+
+    pages.served.append({"value": [{"name": "a"}], query._MORE_RECORDS: True})
+    top = FETCH.replace("<fetch>", '<fetch top="1">')
+    assert len(list(iter_fetchxml_pages(None, "account", top))) == 1
+    assert pages.sent[1].get("count") is None
+
+
+def test_fetchxml_must_have_a_fetch_root():
+    with pytest.raises(ValueError, match="<fetch> root"):
+        list(iter_fetchxml_pages(None, "account", "<entity />"))
+
+
+def _query(fetchxml=FETCH, max_rows=None, output_path=None, ids_only=False):
+    return server._query_records("account", None, None, None, fetchxml, 2, max_rows, ids_only, output_path)
+
+
+@pytest.fixture
+def endless(monkeypatch, fake_server):
+    """Every FetchXML page has two rows and more to come."""
+    monkeypatch.setattr(
+        server,
+        "iter_fetchxml_pages",
+        lambda client, table, fetchxml, page_size: iter([{"accountid": f"{page}-{row}"} for row in range(2)] for page in range(10_000)),
+    )
+
+
+def test_row_cap_truncates_mid_page(endless, monkeypatch):
+    monkeypatch.setenv("DATAVERSE_QUERY_MAX_ROWS", "5")
+
+    result = _query()
+
+    assert (result["count"], result["pages"], result["truncated"]) == (5, 3, True)
+    assert len(result["records"]) == 5
+
+
+def test_inline_results_are_capped(endless, monkeypatch):
+    monkeypatch.setenv("DATAVERSE_QUERY_INLINE_MAX_ROWS", "3")
+
+    result = _query()
+    assert (result["count"], result["truncated"], result["inline_limit"]) == (3, True, 3)
+
+    with pytest.raises(ValueError, match="exceeds the inline limit of 3 rows; set output_path"):
+        _query(max_rows=10)
+
+
+def test_output_path_lifts_the_inline_cap(endless, monkeypatch, tmp_path):
+    monkeypatch.setenv("DATAVERSE_QUERY_INLINE_MAX_ROWS", "3")
+    path = tmp_path / "rows.jsonl"
+
+    result = _query(max_rows=7, output_path=str(path))
+
+    assert (result["count"], result["truncated"]) == (7, True)
+    assert "records" not in result and "inline_limit" not in result
+    assert len(path.read_text().splitlines()) == 7
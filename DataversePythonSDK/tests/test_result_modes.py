@@ -0,0 +1,60 @@
+import json
+import uuid
+
+import pytest
+
+from dataverse_mcp_server.result_modes import COMPACT_ENCODING, decode_guids, encode_guids, shape_ids
+
+IDS = [str(uuid.UUID(int=index)) for index in range(1, 11)] + [str(uuid.uuid4()), str(uuid.uuid4())]
+
+
+def test_compact_encoding_round_trips():
+    encoded = encode_guids(IDS)
+
+    assert decode_guids(encoded) == IDS
+    assert len(encoded) <= 22 * len(IDS)
+    assert encode_guids([]) == "" and decode_guids("") == []
+
+
+def test_decode_rejects_truncated_payloads():
+    with pytest.raises(ValueError, match="multiple of 16"):
+        decode_guids(encode_guids(IDS[:1])[:-4])
+
+
+def test_ids_and_count_only():
+    assert shape_ids(IDS, "ids", "created_ids") == {"created_ids": IDS}
+    assert shape_ids(IDS, "count_only", "created_ids") == {"created_ids_count": 12}
+
+
+def test_compact_mode():
+    shaped = shape_ids(IDS, "compact", "created_ids")
+
+    assert shaped["id_encoding"] == COMPACT_ENCODING
+    assert decode_guids(shaped["created_ids_compact"]) == IDS
+
+
+def test_summary_never_repeats_ids():
+    shaped = shape_ids(IDS, "summary", "created_ids", summary_size=5)
+    assert (shaped["created_ids_first"], shaped["created_ids_last"]) == (IDS[:5], IDS[7:])
+
+    shaped = shape_ids(IDS[:7], "summary", "created_ids", summary_size=5)
+    assert (shaped["created_ids_first"], shaped["created_ids_last"]) == (IDS[:5], IDS[5:7])
+
+
+@pytest.mark.parametrize("name, expected_format", [("ids.jsonl", "jsonl"), ("ids.guids", "binary")])
+def test_file_mode(tmp_path, name, expected_format):
+    path = tmp_path / "out" / name
+
+    shaped = shape_ids(IDS, "file", "created_ids", output_path=str(path))
+
+    assert shaped == {"created_ids_count": 12, "created_ids_format": expected_format, "created_ids_path": str(path)}
+    if expected_format == "binary":
+        data = path.read_bytes()
+        assert [str(uuid.UUID(bytes=data[offset:offset + 16])) for offset in range(0, len(data), 16)] == IDS
+    else:
+        assert [json.loads(line) for line in path.read_text().splitlines()] == IDS
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="result_mode must be one of"):
+        shape_ids(IDS, "everything", "created_ids")
@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from dataverse_mcp_server import startup
+from dataverse_mcp_server.startup import StartupTimer
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Heavy dependencies the server must not import until a tool or probe needs them.
+DEFERRED = ("azure.identity", "PowerPlatform.Dataverse.client", "requests", "dataverse_mcp_server.clients")
+
+_PROBE = """
+import json, sys
+from dataverse_mcp_server import server
+
+loaded_at_import = [name for name in {deferred!r} if name in sys.modules]
+timings_at_import = server.STARTUP.snapshot()
+server._clients()
+server._build_credential()
+print(json.dumps({{
+    "loaded_at_import": loaded_at_import,
+    "timings_at_import": timings_at_import,
+    "loaded_after_use": [name for name in {deferred!r} if name in sys.modules],
+    "timings_after_use": server.STARTUP.snapshot(),
+}}))
+"""
+
+
+class Clock:
+    def __init__(self):
+        self.now = 10.0
+
+    def perf_counter(self):
+        return self.now
+
+
+def test_phases_are_timed_back_to_back(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(startup, "time", SimpleNamespace(perf_counter=clock.perf_counter))
+    timer = StartupTimer()
+
+    clock.now += 0.25
+    timer.mark("mcp_import")
+    clock.now += 0.0301
+    timer.mark("package_imports")
+    clock.now += 0.1
+    timer.health_served()
+    clock.now += 1
+    timer.health_served()
+
+    assert timer.snapshot() == {
+        "phases_ms": {"mcp_import": 250.0, "package_imports": 30.1},
+        "total_ms": 280.1,
+        "first_health_ms": 380.1,
+        "deferred_imports_ms": {},
+    }
+
+
+def test_deferred_imports_are_timed_on_first_use_only(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(startup, "time", SimpleNamespace(perf_counter=clock.perf_counter))
+    timer = StartupTimer()
+
+    with timer.deferred_import("azure.identity"):
+        clock.now += 0.2
+    with timer.deferred_import("azure.identity"):
+        clock.now += 5
+    with timer.deferred_import("PowerPlatform.Dataverse"):
+        clock.now += 0.05
+
+    assert timer.snapshot()["deferred_imports_ms"] == {"azure.identity": 200.0, "PowerPlatform.Dataverse": 50.0}
+    # Deferred imports happen after start-up, so they are not part of its total.
+    assert timer.snapshot()["total_ms"] == 0
+
+
+def test_server_import_defers_heavy_dependencies(tmp_path):
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])),
+        "DATAVERSE_DOTENV": "none",
+        "DATAVERSE_URL": "https://org.crm.dynamics.com",
+        "AZURE_TENANT_ID": "tenant",
+        "AZURE_CLIENT_ID": "client",
+        "AZURE_CLIENT_SECRET": "secret",
+        "DATAVERSE_JOB_DIR": str(tmp_path / "jobs"),
+        "DATAVERSE_IDEMPOTENCY_DB": str(tmp_path / "idempotency.sqlite3"),
+        "LOG_LEVEL": "WARNING",
+    }
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _PROBE.format(deferred=DEFERRED)],
+        env=env,
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert report["loaded_at_import"] == []
+    assert list(report["timings_at_import"]["phases_ms"]) == ["mcp_import", "package_imports", "dotenv", "app_setup"]
+    assert report["timings_at_import"]["deferred_imports_ms"] == {}
+    assert report["timings_at_import"]["total_ms"] <= (time.perf_counter() - started) * 1000
+
+    assert report["loaded_after_use"] == list(DEFERRED)
+    assert set(report["timings_after_use"]["deferred_imports_ms"]) == {"dataverse_mcp_server.clients", "azure.identity"}
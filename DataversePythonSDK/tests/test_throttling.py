@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from dataverse_mcp_server.server import _delete_records
+from dataverse_mcp_server.throttling import RateGovernor, is_throttle_error, retry_after_seconds
+
+
+def test_retry_after_and_throttle_detection(http_error):
+    assert retry_after_seconds(http_error(429, retry_after=7)) == 7.0
+    assert retry_after_seconds(http_error(400)) is None
+    assert retry_after_seconds(ValueError()) is None
+    assert is_throttle_error(http_error(429))
+    assert is_throttle_error(http_error(503))
+    assert not is_throttle_error(http_error(500))
+
+
+def test_invalid_budgets_are_rejected():
+    with pytest.raises(ValueError):
+        RateGovernor(initial_budget=8, max_budget=4)
+    with pytest.raises(ValueError):
+        RateGovernor(decrease_factor=1.0)
+
+
+def test_budget_grows_additively_on_success():
+    governor = RateGovernor(initial_budget=2, max_budget=3)
+    governor.call(lambda: None)
+    assert governor.budget == 2  # 2.5: one slot per budget's worth of successes
+    governor.call(lambda: None)
+    governor.call(lambda: None)
+    assert governor.budget == 3
+
+    for _ in range(10):
+        governor.call(lambda: None)
+    assert governor.budget == 3
+
+
+def test_throttle_halves_budget_and_retries(http_error):
+    governor = RateGovernor(initial_budget=8, max_budget=8)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise http_error(429)
+        return "done"
+
+    assert governor.call(flaky) == "done"
+    assert len(attempts) == 3
+    # Each throttle halves the budget (8 -> 4 -> 2); the final success adds back half a slot.
+    assert governor.budget == 2
+    snapshot = governor.snapshot()
+    assert (snapshot["throttled"], snapshot["retries"], snapshot["in_flight"]) == (2, 2, 0)
+
+
+def test_budget_never_drops_below_minimum(http_error):
+    governor = RateGovernor(initial_budget=2, min_budget=1, max_retries=3)
+
+    with pytest.raises(Exception) as raised:
+        governor.call(lambda: (_ for _ in ()).throw(http_error(429)))
+
+    assert raised.value.status_code == 429
+    assert governor.budget == 1
+    assert governor.snapshot()["retries"] == 3
+
+
+def test_non_throttle_errors_are_not_retried(http_error):
+    governor = RateGovernor()
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise http_error(400)
+
+    with pytest.raises(Exception):
+        governor.call(failing)
+    assert len(attempts) == 1
+    assert governor.snapshot()["in_flight"] == 0
+
+
+def test_in_flight_requests_are_bounded_by_budget():
+    governor = RateGovernor(initial_budget=2, max_budget=2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+
+    threads = [threading.Thread(target=governor.call, args=(work,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+
+
+class _DeletingClient:
+    def __init__(self, http_error, throttle_after_delete):
+        self.http_error = http_error
+        self.throttle_after_delete = set(throttle_after_delete)
+        self.deleted = []
+
+    def delete(self, table, record_id):
+        if record_id in self.deleted:
+            raise self.http_error(404, "Does Not Exist")
+        self.deleted.append(record_id)
+        if record_id in self.throttle_after_delete:
+            # The delete went through but the response was a throttle, e.g. a gateway timeout-and-retry.
+            self.throttle_after_delete.discard(record_id)
+            raise self.http_error(429)
+
+
+def test_delete_records_retries_only_the_throttled_record(http_error):
+    client = _DeletingClient(http_error, throttle_after_delete={"b"})
+
+    _delete_records(client, RateGovernor(), "account", ["a", "b", "c"])
+
+    assert client.deleted == ["a", "b", "c"]
+
+
+def test_delete_records_reports_a_404_on_the_first_attempt(http_error):
+    client = _DeletingClient(http_error, throttle_after_delete=())
+    client.deleted.append("gone")
+
+    with pytest.raises(Exception) as raised:
+        _delete_records(client, RateGovernor(), "account", ["gone"])
+    assert raised.value.status_code == 404
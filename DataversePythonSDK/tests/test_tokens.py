@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+from azure.core.credentials import AccessToken
+
+from dataverse_mcp_server.tokens import TokenBroker
+
+SCOPE = "https://org.crm.dynamics.com/.default"
+
+
+class Credential:
+    """Issues numbered tokens that live ``lifetime`` seconds; fails while ``failing`` is set."""
+
+    def __init__(self, lifetime=3600, delay=0.0):
+        self.lifetime = lifetime
+        self.delay = delay
+        self.failing = False
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes, **kwargs):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append((scopes, kwargs))
+            number = len(self.calls)
+        if self.failing:
+            raise RuntimeError("AADSTS50058: sign-in required")
+        return AccessToken(f"token-{number}", int(time.time() + self.lifetime))
+
+
+@pytest.fixture
+def make_broker():
+    brokers = []
+
+    def make(credential, **kwargs):
+        broker = TokenBroker(credential, **kwargs)
+        brokers.append(broker)
+        return broker
+
+    yield make
+    for broker in brokers:
+        broker.close()
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("condition not reached")
+        time.sleep(0.01)
+
+
+def test_tokens_are_cached_per_scope(make_broker):
+    credential = Credential()
+    broker = make_broker(credential)
+
+    assert broker.get_token(SCOPE).token == "token-1"
+    assert broker.get_token(SCOPE).token == "token-1"
+    assert broker.get_token("other/.default").token == "token-2"
+    stats = broker.describe(SCOPE)
+    assert (stats["refreshes"], stats["blocking_refreshes"], stats["cache_hits"]) == (1, 1, 1)
+
+
+def test_background_thread_refreshes_before_expiry(make_broker):
+    # A 4 s token is renewed halfway through its life, long before it expires.
+    credential = Credential(lifetime=4)
+    broker = make_broker(credential)
+    broker.get_token(SCOPE)
+
+    wait_until(lambda: len(credential.calls) >= 2)
+
+    assert broker.get_token(SCOPE).token == "token-2"
+    assert broker.describe(SCOPE)["blocking_refreshes"] == 1
+
+
+def test_concurrent_first_use_acquires_one_token(make_broker):
+    credential = Credential(delay=0.1)
+    broker = make_broker(credential)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(broker.get_token(SCOPE).token)) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["token-1"] * 10
+    assert len(credential.calls) == 1
+
+
+def test_recovers_after_a_failed_refresh(make_broker):
+    credential = Credential()
+    credential.failing = True
+    broker = make_broker(credential)
+
+    with pytest.raises(RuntimeError, match="sign-in required"):
+        broker.get_token(SCOPE)
+    assert broker.describe(SCOPE)["failures"] == 1
+
+    credential.failing = False
+    assert broker.get_token(SCOPE).token == "token-2"
+    stats = broker.describe(SCOPE)
+    assert (stats["failures"], stats["last_error"]) == (1, None)
+
+
+def test_background_refresh_failures_are_retried(make_broker):
+    credential = Credential(lifetime=2)
+    broker = make_broker(credential, retry_interval=0.05)
+    broker.get_token(SCOPE)
+    credential.failing = True
+
+    wait_until(lambda: broker.describe(SCOPE)["failures"] >= 2)
+    # The cached token is still valid, so callers keep getting it while refreshes fail.
+    assert broker.get_token(SCOPE).token == "token-1"
+
+    credential.failing = False
+    wait_until(lambda: broker.describe(SCOPE)["last_error"] is None)
+    assert broker.get_token(SCOPE).token != "token-1"
+
+
+def test_claims_bypass_the_cache_and_discard_forgets_a_scope(make_broker):
+    credential = Credential()
+    broker = make_broker(credential)
+    broker.get_token(SCOPE)
+
+    assert broker.get_token(SCOPE, claims='{"access_token": {}}').token == "token-2"
+    assert broker.get_token(SCOPE).token == "token-1"
+
+    broker.discard(SCOPE)
+    assert broker.describe(SCOPE) is None
+    assert broker.get_token(SCOPE).token == "token-3"
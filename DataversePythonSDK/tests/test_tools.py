@@ -0,0 +1,40 @@
+"""End-to-end tool calls over streamable-http against the benchmark's fake Web API."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from dataverse_mcp_server.benchmark.fake_dataverse import FaultProfile
+from dataverse_mcp_server.benchmark.harness import BenchmarkConfig, run_config
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+# The server runs in a subprocess; make the source tree importable there without an install.
+SERVER_ENV = {"PYTHONPATH": os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")]))}
+
+
+def run(tool, records=60, chunk_size=10, **faults):
+    config = BenchmarkConfig(tool, records, chunk_size, max_workers=4, iterations=1)
+    profile = FaultProfile(latency_ms=0, jitter_ms=0, per_record_ms=0, seed=7, **faults)
+    return run_config(config, profile, SERVER_ENV)
+
+
+@pytest.mark.parametrize("tool", ["create_multiple", "update_multiple", "delete_multiple"])
+def test_bulk_tools_survive_throttling(tool):
+    result = run(tool, throttle_rate=0.1, retry_after_seconds=0)
+
+    assert (result.calls, result.failed_calls) == (1, 0)
+    assert (result.records_succeeded, result.records_failed) == (60, 0)
+    assert result.fake_api["throttled"] > 0
+
+
+
+def test_repeated_and_concurrent_deletes_use_fresh_ids():
+    config = BenchmarkConfig("delete_multiple", 40, 10, max_workers=4, concurrency=2, iterations=2)
+    profile = FaultProfile(latency_ms=0, jitter_ms=0, per_record_ms=0)
+
+    result = run_config(config, profile, SERVER_ENV)
+
+    assert (result.calls, result.failed_calls) == (4, 0)
+    assert (result.records_succeeded, result.records_failed) == (160, 0)
+    assert "DELETE missing" not in result.fake_api["requests"]
@@ -0,0 +1,148 @@
+import pytest
+
+from dataverse_mcp_server import server, upsert, webapi
+from dataverse_mcp_server.upsert import group_rows, upsert_by_alternate_keys
+
+
+def test_rows_are_grouped_by_mode_and_field_set():
+    rows = [
+        {"id": "a", "fields": {"name": "A", "amount": 1}},
+        {"keys": {"accountnumber": "K-1"}, "fields": {"name": "B"}},
+        {"id": "c", "fields": {"Amount": 3, "Name": "C"}},
+        {"id": "d", "fields": {"name": "D"}},
+        {"keys": {"accountnumber": "K-2"}, "fields": {"NAME": "E"}},
+    ]
+
+    groups, rejected = group_rows(rows)
+
+    assert rejected == []
+    assert [(group.mode, group.fields, group.row_indexes) for group in groups] == [
+        # Field names compare case-insensitively, so rows 0 and 2 share a request.
+        ("id", ("amount", "name"), [0, 2]),
+        ("alternate_key", ("name",), [1, 4]),
+        ("id", ("name",), [3]),
+    ]
+    assert groups[1].rows == [rows[1], rows[4]]
+
+
+@pytest.mark.parametrize(
+    ("row", "reason"),
+    [
+        ({"id": "a"}, "non-empty 'fields'"),
+        ({"id": "a", "fields": {}}, "non-empty 'fields'"),
+        ({"id": "a", "fields": ["name"]}, "non-empty 'fields'"),
+        ("not a row", "non-empty 'fields'"),
+        ({"id": "a", "keys": {"accountnumber": "K"}, "fields": {"name": "A"}}, "either 'id' or 'keys'"),
+        ({"fields": {"name": "A"}}, "an 'id' or a non-empty 'keys'"),
+        ({"keys": {}, "fields": {"name": "A"}}, "an 'id' or a non-empty 'keys'"),
+        ({"keys": "K-1", "fields": {"name": "A"}}, "an 'id' or a non-empty 'keys'"),
+    ],
+)
+def test_invalid_rows_are_rejected_with_their_index(row, reason):
+    groups, rejected = group_rows([{"id": "ok", "fields": {"name": "ok"}}, row])
+
+    assert [group.row_indexes for group in groups] == [[0]]
+    assert len(rejected) == 1
+    assert rejected[0]["row_index"] == 1
+    assert reason in rejected[0]["reason"]
+
+
+def test_alternate_key_rows_become_one_upsert_multiple_request(monkeypatch):
+    sent = []
+    monkeypatch.setattr(webapi, "entity_set_name", lambda client, table: "accounts")
+
+    def request_json(client, method, path, **kwargs):
+        sent.append((method, path, kwargs["json"]))
+        return {"Ids": ["id-1", "id-2", None]}
+
+    monkeypatch.setattr(webapi, "request_json", request_json)
+    rows = [
+        {"keys": {"AccountNumber": "K-1", "region": 7}, "fields": {"Name": "O'Brien"}},
+        {"keys": {"accountnumber": "K-2", "region": 7}, "fields": {"name": "Smith", "active": True}},
+    ]
+
+    ids = upsert_by_alternate_keys(object(), "Account", rows)
+
+    assert ids == ["id-1", "id-2"]
+    [(method, path, body)] = sent
+    assert (method, path) == ("post", "accounts/Microsoft.Dynamics.CRM.UpsertMultiple")
+    assert body == {
+        "Targets": [
+            {
+                "name": "O'Brien",
+                "@odata.type": "Microsoft.Dynamics.CRM.account",
+                "@odata.id": "accounts(accountnumber='K-1',region=7)",
+            },
+            {
+                "name": "Smith",
+                "active": True,
+                "@odata.type": "Microsoft.Dynamics.CRM.account",
+                "@odata.id": "accounts(accountnumber='K-2',region=7)",
+            },
+        ]
+    }
+
+
+def test_upsert_tolerates_a_response_without_ids(monkeypatch):
+    monkeypatch.setattr(webapi, "entity_set_name", lambda client, table: "accounts")
+    monkeypatch.setattr(webapi, "request_json", lambda client, method, path, **kwargs: {})
+
+    assert upsert_by_alternate_keys(object(), "account", [{"keys": {"accountnumber": "K"}, "fields": {"name": "A"}}]) == []
+
+
+def test_update_records_routes_each_group(fake_server, monkeypatch):
+    updates = []
+
+    def update(table, ids, payloads):
+        if ids == ["e"]:
+            raise RuntimeError("update rejected")
+        updates.append((table, ids, payloads))
+
+    fake_server.client.update = update
+    upserts = []
+
+    def upsert_rows(client, table, rows):
+        upserts.append([row["keys"] for row in rows])
+        return [f"upserted-{row['keys']['accountnumber']}" for row in rows]
+
+    monkeypatch.setattr(server, "upsert_by_alternate_keys", upsert_rows)
+    rows = [
+        {"id": "a", "fields": {"name": "A"}},
+        {"keys": {"accountnumber": "K-1"}, "fields": {"name": "B"}},
+        {"id": "c", "fields": {"name": "C", "amount": 3}},
+        {"fields": {"name": "no address"}},
+        {"id": "e", "fields": {"name": "E"}},
+    ]
+
+    result = server._update_records("account", rows, chunk_size=1, max_workers=1)
+
+    assert (result["total"], result["succeeded"], result["failed"]) == (5, 3, 1)
+    assert [row["row_index"] for row in result["rejected"]] == [3]
+    assert result["upserted_ids"] == ["upserted-K-1"]
+    assert upserts == [[{"accountnumber": "K-1"}]]
+    assert sorted(updates) == [
+        ("account", ["a"], [{"name": "A"}]),
+        ("account", ["c"], [{"name": "C", "amount": 3}]),
+    ]
+    assert [(group["mode"], group["fields"], group["rows"]) for group in result["groups"]] == [
+        ("id", ["name"], 2),
+        ("alternate_key", ["name"], 1),
+        ("id", ["amount", "name"], 1),
+    ]
+    # A failed chunk points back at the caller's row indexes, not positions within the group.
+    assert result["groups"][0]["failed"] == 1
+    assert [chunk.get("row_indexes") for chunk in result["groups"][0]["chunks"]] == [None, [4]]
+
+
+def test_update_by_ids_passes_copies_of_each_payload():
+    calls = []
+
+    class Client:
+        def update(self, table, ids, payloads):
+            calls.append((table, ids, payloads))
+
+    fields = {"name": "A"}
+    upsert.update_by_ids(Client(), "account", [{"id": 1, "fields": fields}])
+
+    assert calls == [("account", ["1"], [{"name": "A"}])]
+    assert calls[0][2][0] is not fields
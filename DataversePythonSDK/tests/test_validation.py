@@ -0,0 +1,78 @@
+import pytest
+
+from dataverse_mcp_server.metadata import ColumnMetadata, TableMetadata
+from dataverse_mcp_server.validation import RecordValidator
+
+
+def column(name, attribute_type, required="None", create=True, update=True, **kwargs):
+    return ColumnMetadata(name, attribute_type, required, create, update, **kwargs)
+
+
+ACCOUNT = TableMetadata(
+    logical_name="account",
+    entity_set_name="accounts",
+    primary_id_attribute="accountid",
+    primary_name_attribute="name",
+    columns={
+        column_.logical_name: column_
+        for column_ in (
+            column("accountid", "Uniqueidentifier"),
+            column("name", "String", required="ApplicationRequired", max_length=10),
+            column("numberofemployees", "Integer"),
+            column("revenue", "Money"),
+            column("donotemail", "Boolean"),
+            column("industrycode", "Picklist"),
+            column("primarycontactid", "Lookup", required="ApplicationRequired"),
+            column("createdon", "DateTime", create=False, update=False),
+            column("revenue_base", "Money", required="ApplicationRequired", create=False, attribute_of="revenue"),
+        )
+    },
+    fetched_at=0.0,
+)
+
+VALID = {"name": "Contoso", "primarycontactid@odata.bind": "/contacts(00000000-0000-0000-0000-000000000001)"}
+
+
+def test_valid_record_has_no_errors():
+    record = {**VALID, "NumberOfEmployees": 5, "revenue": 1.5, "donotemail": False, "industrycode": "Retail"}
+    assert RecordValidator(ACCOUNT).errors(record) == []
+
+
+@pytest.mark.parametrize(
+    "field, value, error",
+    [
+        ("name", "a" * 11, "'name': length 11 exceeds max length 10"),
+        ("numberofemployees", True, "'numberofemployees': expected an integer"),
+        ("revenue", "1.5", "'revenue': expected a number"),
+        ("donotemail", 0, "'donotemail': expected a boolean"),
+        ("accountid", "not-a-guid", "'accountid': expected a GUID string"),
+        ("primarycontactid", "x", "'primarycontactid': set lookups with 'primarycontactid@odata.bind' instead of a raw value"),
+        ("createdon", "2024-01-01", "'createdon': column is not valid for create"),
+        ("nosuchcolumn", 1, "'nosuchcolumn': unknown column"),
+    ],
+)
+def test_field_errors(field, value, error):
+    assert RecordValidator(ACCOUNT).errors({**VALID, field: value}) == [error]
+
+
+def test_required_columns_are_only_enforced_on_create():
+    assert RecordValidator(ACCOUNT).errors({"name": None}) == [
+        "'name': required column is missing",
+        "'primarycontactid': required column is missing",
+    ]
+    assert RecordValidator(ACCOUNT, mode="update").errors({"numberofemployees": 3}) == []
+
+
+def test_non_object_and_bad_mode():
+    assert RecordValidator(ACCOUNT).errors(["name"]) == ["record must be an object"]
+    with pytest.raises(ValueError):
+        RecordValidator(ACCOUNT, mode="upsert")
+
+
+def test_split_keeps_input_positions():
+    result = RecordValidator(ACCOUNT).split([VALID, {"name": 1}, {**VALID, "name": "Fabrikam"}])
+
+    assert result.valid == [VALID, {**VALID, "name": "Fabrikam"}]
+    assert result.valid_indexes == [0, 2]
+    assert [row["row_index"] for row in result.rejected] == [1]
+    assert "'name': expected a string" in result.rejected[0]["reasons"]
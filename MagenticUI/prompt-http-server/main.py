@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
+import time
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator
 from urllib.parse import quote, urlparse
 
 import httpx
@@ -14,8 +18,12 @@ from fastapi.responses import JSONResponse
 
 load_dotenv(override=True)
 
+logger = logging.getLogger("prompt_http_server")
+
 GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
 GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+# Renew the cached Graph token this many seconds before it expires.
+TOKEN_REFRESH_MARGIN_SECONDS = 300
 
 
 @dataclass(frozen=True)
@@ -30,6 +38,7 @@ class Settings:
     prompt_text_field: str = "PromptText"
     host: str = "0.0.0.0"
     port: int = 8080
+    refresh_seconds: float = 60.0
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -57,6 +66,7 @@ class Settings:
             prompt_text_field=os.getenv("PROMPT_TEXT_FIELD", "PromptText"),
             host=os.getenv("HTTP_HOST", "0.0.0.0"),
             port=int(os.getenv("HTTP_PORT", "8080")),
+            refresh_seconds=float(os.getenv("PROMPT_REFRESH_SECONDS", "60")),
         )
 
 
@@ -65,48 +75,111 @@ class SharePointPromptClient:
         self.settings = settings
         self._site_id: str | None = None
         self._list_id: str | None = None
+        self._unfilterable_fields: set[str] = set()
+        self._http: httpx.AsyncClient | None = None
+        self._access_token: str | None = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
 
-    async def _get_access_token(self) -> str:
+    def _client(self) -> httpx.AsyncClient:
         """
-        Always fetch a fresh token.
-        This keeps the logic simple and avoids expired-token issues.
+        One pooled HTTP/2 client for both the token endpoint and Graph,
+        so lookups reuse open TLS connections instead of handshaking each time.
         """
-        token_url = (
-            "https://login.microsoftonline.com/"
-            f"{quote(self.settings.tenant_id)}/oauth2/v2.0/token"
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=120,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _token_is_fresh(self) -> bool:
+        return (
+            self._access_token is not None
+            and time.monotonic() < self._token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS
         )
-        data = {
-            "client_id": self.settings.client_id,
-            "client_secret": self.settings.client_secret,
-            "scope": GRAPH_SCOPE,
-            "grant_type": "client_credentials",
-        }
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(token_url, data=data)
+    async def _get_access_token(self) -> str:
+        """
+        Reuse the cached token until it is close to expiry.
+        Concurrent callers wait on one refresh instead of each requesting a token.
+        """
+        if self._token_is_fresh():
+            return self._access_token  # type: ignore[return-value]
+
+        async with self._token_lock:
+            if self._token_is_fresh():
+                return self._access_token  # type: ignore[return-value]
+
+            token_url = (
+                "https://login.microsoftonline.com/"
+                f"{quote(self.settings.tenant_id)}/oauth2/v2.0/token"
+            )
+            data = {
+                "client_id": self.settings.client_id,
+                "client_secret": self.settings.client_secret,
+                "scope": GRAPH_SCOPE,
+                "grant_type": "client_credentials",
+            }
+
+            requested_at = time.monotonic()
+            response = await self._client().post(token_url, data=data)
             response.raise_for_status()
             payload = response.json()
 
-        return payload["access_token"]
+            self._access_token = payload["access_token"]
+            self._token_expires_at = requested_at + float(payload.get("expires_in", 3599))
+            return self._access_token
+
+    def _invalidate_token(self, token: str) -> None:
+        if self._access_token == token:
+            self._access_token = None
+            self._token_expires_at = 0.0
 
     async def _graph_get(
-        self, path_or_url: str, params: dict[str, str] | None = None
+        self,
+        path_or_url: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
     ) -> dict[str, Any]:
-        token = await self._get_access_token()
         url = (
             path_or_url
             if path_or_url.startswith("https://")
             else f"{GRAPH_BASE_URL}{path_or_url}"
         )
-        headers = {
+
+        token = await self._get_access_token()
+        response = await self._send_get(url, token, params, headers)
+        if response.status_code == 401:
+            # The token was revoked or rotated early; fetch a new one and retry once.
+            self._invalidate_token(token)
+            response = await self._send_get(url, await self._get_access_token(), params, headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def _send_get(
+        self,
+        url: str,
+        token: str,
+        params: dict[str, str] | None,
+        headers: dict[str, str] | None,
+    ) -> httpx.Response:
+        request_headers = {
             "Authorization": f"Bearer {token}",
             "Accept": "application/json",
+            **(headers or {}),
         }
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await self._client().get(url, headers=request_headers, params=params)
 
     async def _get_site_id(self) -> str:
         if self._site_id:
@@ -147,10 +220,7 @@ class SharePointPromptClient:
         self._list_id = matches[0]["id"]
         return self._list_id
 
-    async def get_all_prompts(self) -> list[dict[str, Any]]:
-        list_id = await self._get_list_id()
-        site_id = await self._get_site_id()
-
+    def _fields_expand(self) -> str:
         select_fields = ",".join(
             {
                 self.settings.prompt_id_field,
@@ -158,10 +228,15 @@ class SharePointPromptClient:
                 self.settings.prompt_text_field,
             }
         )
+        return f"fields($select={select_fields})"
+
+    async def get_all_prompts(self) -> list[dict[str, Any]]:
+        list_id = await self._get_list_id()
+        site_id = await self._get_site_id()
 
         path_or_url = f"/sites/{site_id}/lists/{list_id}/items"
         params: dict[str, str] | None = {
-            "$expand": f"fields($select={select_fields})",
+            "$expand": self._fields_expand(),
             "$top": "200",
         }
 
@@ -174,6 +249,37 @@ class SharePointPromptClient:
 
         return prompts
 
+    async def get_prompt_changes(
+        self, delta_link: str | None = None
+    ) -> tuple[list[tuple[str, dict[str, Any] | None]], str | None]:
+        """
+        Return (item_id, prompt) pairs changed since delta_link, with prompt None for deleted items,
+        and the delta link to pass next time. Without delta_link every item is returned.
+        """
+        if delta_link:
+            path_or_url, params = delta_link, None
+        else:
+            list_id = await self._get_list_id()
+            site_id = await self._get_site_id()
+            path_or_url = f"/sites/{site_id}/lists/{list_id}/items/delta"
+            params = {"$expand": self._fields_expand(), "$top": "200"}
+
+        changes: list[tuple[str, dict[str, Any] | None]] = []
+        next_delta_link: str | None = None
+        while path_or_url:
+            payload = await self._graph_get(path_or_url, params)
+            for item in payload.get("value", []):
+                item_id = str(item.get("id"))
+                if "deleted" in item or "@removed" in item:
+                    changes.append((item_id, None))
+                else:
+                    changes.append((item_id, self._normalize_item(item)))
+            path_or_url = payload.get("@odata.nextLink")
+            next_delta_link = payload.get("@odata.deltaLink", next_delta_link)
+            params = None
+
+        return changes, next_delta_link
+
     def _normalize_item(self, item: dict[str, Any]) -> dict[str, Any]:
         fields = item.get("fields", {})
         return {
@@ -184,21 +290,157 @@ class SharePointPromptClient:
             "prompt_text": as_text(fields.get(self.settings.prompt_text_field)),
         }
 
+    async def _find_prompts(self, field: str, value: str) -> list[dict[str, Any]] | None:
+        """
+        Match field == value on the Graph side so only matching items are transferred.
+        Returns None when Graph rejects the filter (e.g. a non-indexed column on a large list,
+        or a non-text column), in which case the caller falls back to scanning the list.
+        """
+        if field in self._unfilterable_fields:
+            return None
+
+        list_id = await self._get_list_id()
+        site_id = await self._get_site_id()
+        path_or_url = f"/sites/{site_id}/lists/{list_id}/items"
+        params: dict[str, str] | None = {
+            "$expand": self._fields_expand(),
+            "$filter": f"fields/{field} eq '{odata_escape(value)}'",
+            "$top": "200",
+        }
+        # Lets Graph filter on columns that are not indexed. Lists above the 5000-item view
+        # threshold can still refuse it unless the column is indexed; that is the fallback case.
+        headers = {"Prefer": "HonorNonIndexedQueriesWarningMayFailRandomly"}
+
+        prompts: list[dict[str, Any]] = []
+        try:
+            while path_or_url:
+                payload = await self._graph_get(path_or_url, params, headers)
+                prompts.extend(self._normalize_item(item) for item in payload.get("value", []))
+                path_or_url = payload.get("@odata.nextLink")
+                params = None
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 400:
+                raise
+            self._unfilterable_fields.add(field)
+            return None
+
+        return prompts
+
     async def get_prompts_by_title(self, title: str) -> list[dict[str, Any]]:
         title_to_match = title.strip()
-        return [
-            prompt
-            for prompt in await self.get_all_prompts()
-            if prompt["title"] == title_to_match
-        ]
+        prompts = await self._find_prompts(self.settings.title_field, title_to_match)
+        if prompts is None:
+            prompts = await self.get_all_prompts()
+        # SharePoint compares case-insensitively; keep the exact-match semantics.
+        return [prompt for prompt in prompts if prompt["title"] == title_to_match]
 
     async def get_prompts_by_id(self, prompt_id: str) -> list[dict[str, Any]]:
         prompt_id_to_match = prompt_id.strip()
-        return [
-            prompt
-            for prompt in await self.get_all_prompts()
-            if prompt["prompt_id"] == prompt_id_to_match
-        ]
+        prompts = await self._find_prompts(self.settings.prompt_id_field, prompt_id_to_match)
+        if prompts is None:
+            prompts = await self.get_all_prompts()
+        return [prompt for prompt in prompts if prompt["prompt_id"] == prompt_id_to_match]
+
+
+class PromptIndex:
+    """
+    In-memory prompts keyed by SharePoint item id, with lookup tables by prompt id and title.
+    Loaded once, then kept current with Graph delta queries, so lookups never page the list.
+    """
+
+    def __init__(self, client: SharePointPromptClient, refresh_seconds: float) -> None:
+        self.client = client
+        self.refresh_seconds = refresh_seconds
+        self.synced_at: float | None = None
+        self._items: dict[str, dict[str, Any]] = {}
+        self._by_prompt_id: dict[str, dict[str, dict[str, Any]]] = {}
+        self._by_title: dict[str, dict[str, dict[str, Any]]] = {}
+        self._delta_link: str | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.synced_at is not None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _add(self, item_id: str, prompt: dict[str, Any]) -> None:
+        self._items[item_id] = prompt
+        self._by_prompt_id.setdefault(prompt["prompt_id"], {})[item_id] = prompt
+        self._by_title.setdefault(prompt["title"], {})[item_id] = prompt
+
+    def _remove(self, item_id: str) -> None:
+        prompt = self._items.pop(item_id, None)
+        if prompt is None:
+            return
+        for index, key in ((self._by_prompt_id, prompt["prompt_id"]), (self._by_title, prompt["title"])):
+            matches = index.get(key)
+            if matches is not None:
+                matches.pop(item_id, None)
+                if not matches:
+                    del index[key]
+
+    def _apply(self, changes: list[tuple[str, dict[str, Any] | None]], reset: bool) -> None:
+        # No awaits in here, so concurrent lookups never see a half-applied page of changes.
+        if reset:
+            self._items, self._by_prompt_id, self._by_title = {}, {}, {}
+        for item_id, prompt in changes:
+            self._remove(item_id)
+            if prompt is not None:
+                self._add(item_id, prompt)
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            await self._refresh_locked()
+
+    async def _refresh_locked(self) -> None:
+        reset = self._delta_link is None
+        try:
+            changes, delta_link = await self.client.get_prompt_changes(self._delta_link)
+        except httpx.HTTPStatusError as exc:
+            # 410 Gone means the delta link expired; start again from a full snapshot.
+            if reset or exc.response.status_code != 410:
+                raise
+            logger.warning("Prompt delta link expired; resyncing the full list.")
+            reset = True
+            changes, delta_link = await self.client.get_prompt_changes(None)
+
+        self._apply(changes, reset)
+        self._delta_link = delta_link
+        self.synced_at = time.time()
+
+    async def get_by_id(self, prompt_id: str) -> list[dict[str, Any]]:
+        if not self.loaded:
+            # Until the first load completes, ask Graph for just the matching items.
+            return await self.client.get_prompts_by_id(prompt_id)
+        return list(self._by_prompt_id.get(prompt_id.strip(), {}).values())
+
+    async def get_by_title(self, title: str) -> list[dict[str, Any]]:
+        if not self.loaded:
+            return await self.client.get_prompts_by_title(title)
+        return list(self._by_title.get(title.strip(), {}).values())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep serving the last good index; the next tick tries again.
+                logger.exception("Refreshing the prompt index failed.")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
 
 
 def as_text(value: Any) -> str:
@@ -213,8 +455,18 @@ def odata_escape(value: str) -> str:
 
 settings = Settings.from_env()
 sharepoint = SharePointPromptClient(settings)
+prompt_index = PromptIndex(sharepoint, settings.refresh_seconds)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    prompt_index.start()
+    yield
+    await prompt_index.stop()
+    await sharepoint.aclose()
+
 
-app = FastAPI(title="Prompt HTTP Server")
+app = FastAPI(title="Prompt HTTP Server", lifespan=lifespan)
 
 # Optional but recommended if your Magentic UI/browser calls this API from a different origin
 app.add_middleware(
@@ -241,8 +493,8 @@ async def lookup_prompts(
 
     try:
         if prompt_id:
-            return await sharepoint.get_prompts_by_id(prompt_id)
-        return await sharepoint.get_prompts_by_title(prompt_title or "")
+            return await prompt_index.get_by_id(prompt_id)
+        return await prompt_index.get_by_title(prompt_title or "")
     except httpx.HTTPStatusError as exc:
         detail = exc.response.text
         raise HTTPException(
@@ -272,8 +524,12 @@ async def prompt(
 
 
 @app.get("/health")
-async def health() -> dict[str, str]:
-    return {"status": "ok"}
+async def health() -> dict[str, Any]:
+    return {
+        "status": "ok",
+        "prompts_indexed": len(prompt_index),
+        "index_synced_at": prompt_index.synced_at,
+    }
 
 
 if __name__ == "__main__":
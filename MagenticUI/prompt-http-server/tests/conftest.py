@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+# main.py reads its settings at import time.
+os.environ.update(
+    {
+        "AZURE_TENANT_ID": "tenant",
+        "AZURE_CLIENT_ID": "client",
+        "AZURE_CLIENT_SECRET": "secret",
+        "SHAREPOINT_SITE_URL": "https://contoso.sharepoint.com/sites/Prompts",
+        "SHAREPOINT_LIST_NAME": "Prompt List",
+    }
+)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import main  # noqa: E402
+
+ITEMS_PATH = "/v1.0/sites/site-1/lists/list-1/items"
+
+
+class FakeGraph:
+    """
+    Just enough of the token endpoint and Graph list API for the server, served through httpx.MockTransport.
+    Every change bumps a version; delta links carry the version they were issued at.
+    """
+
+    def __init__(self) -> None:
+        self.items: dict[str, dict[str, Any]] = {}
+        self.versions: dict[str, int] = {}
+        self.version = 0
+        self.page_size = 200
+        self.unfilterable: set[str] = set()
+        # Graph answers a filter on an unfilterable column with this status.
+        self.filter_status = 400
+        self.revoked: set[str] = set()
+        self.expired_before = 0
+        self.expires_in = 3600
+        self.token_delay = 0.0
+        self.tokens_issued = 0
+        self.delta_gate: asyncio.Event | None = None
+        self.requests: list[httpx.Request] = []
+
+    def put(self, item_id: str, prompt_id: str, title: str, text: str = "") -> None:
+        self.version += 1
+        self.items[item_id] = {"PromptId": prompt_id, "Title": title, "PromptText": text}
+        self.versions[item_id] = self.version
+
+    def delete(self, item_id: str) -> None:
+        self.version += 1
+        del self.items[item_id]
+        self.versions[item_id] = self.version
+
+    def expire_delta_links(self) -> None:
+        self.expired_before = self.version + 1
+
+    def client(self) -> main.SharePointPromptClient:
+        client = main.SharePointPromptClient(main.settings)
+        client._http = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        return client
+
+    def filters(self) -> list[str | None]:
+        """The $filter of each list-items request, None for unfiltered scans."""
+        return [request.url.params.get("$filter") for request in self.requests if request.url.path == ITEMS_PATH]
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.host == "login.microsoftonline.com":
+            return await self._token()
+
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        if token in self.revoked:
+            return httpx.Response(401, json={"error": {"code": "InvalidAuthenticationToken"}})
+
+        path = request.url.path
+        if path == "/v1.0/sites/contoso.sharepoint.com:/sites/Prompts":
+            return httpx.Response(200, json={"id": "site-1"})
+        if path == "/v1.0/sites/site-1/lists":
+            return httpx.Response(200, json={"value": [{"id": "list-1", "displayName": "Prompt List"}]})
+        if path == ITEMS_PATH:
+            return self._list_items(request)
+        if path == f"{ITEMS_PATH}/delta":
+            if self.delta_gate is not None:
+                await self.delta_gate.wait()
+            return self._delta(request)
+        return httpx.Response(404, json={"error": {"code": "itemNotFound"}})
+
+    async def _token(self) -> httpx.Response:
+        if self.token_delay:
+            await asyncio.sleep(self.token_delay)
+        self.tokens_issued += 1
+        return httpx.Response(
+            200, json={"access_token": f"token-{self.tokens_issued}", "expires_in": self.expires_in}
+        )
+
+    def _item(self, item_id: str) -> dict[str, Any]:
+        return {"id": item_id, "webUrl": f"https://contoso.sharepoint.com/{item_id}", "fields": self.items[item_id]}
+
+    def _page(self, request: httpx.Request, values: list[dict[str, Any]], last: dict[str, Any]) -> httpx.Response:
+        skip = int(request.url.params.get("skip", 0))
+        end = skip + self.page_size
+        payload: dict[str, Any] = {"value": values[skip:end]}
+        if end < len(values):
+            payload["@odata.nextLink"] = str(request.url.copy_set_param("skip", str(end)))
+        else:
+            payload.update(last)
+        return httpx.Response(200, json=payload)
+
+    def _list_items(self, request: httpx.Request) -> httpx.Response:
+        item_ids = sorted(self.items)
+        odata_filter = request.url.params.get("$filter")
+        if odata_filter:
+            field, _, quoted = odata_filter.removeprefix("fields/").partition(" eq ")
+            if field in self.unfilterable:
+                return httpx.Response(self.filter_status, json={"error": {"code": "invalidRequest"}})
+            value = quoted[1:-1].replace("''", "'")
+            # SharePoint compares text case-insensitively.
+            item_ids = [item_id for item_id in item_ids if self.items[item_id][field].lower() == value.lower()]
+        return self._page(request, [self._item(item_id) for item_id in item_ids], {})
+
+    def _delta(self, request: httpx.Request) -> httpx.Response:
+        since = int(request.url.params.get("token", 0))
+        if since and since < self.expired_before:
+            return httpx.Response(410, json={"error": {"code": "resyncRequired"}})
+
+        values = []
+        for item_id, version in sorted(self.versions.items()):
+            if item_id in self.items and (since == 0 or version > since):
+                values.append(self._item(item_id))
+            elif item_id not in self.items and since and version > since:
+                values.append({"id": item_id, "deleted": {"state": "deleted"}})
+        delta_link = f"https://graph.microsoft.com{ITEMS_PATH}/delta?token={self.version}"
+        return self._page(request, values, {"@odata.deltaLink": delta_link})
+
+
+@pytest.fixture
+def graph() -> FakeGraph:
+    graph = FakeGraph()
+    graph.put("1", "11", "Login Prompt", "Log in.")
+    graph.put("2", "12", "Logout Prompt", "Log out.")
+    graph.put("3", "13", "login prompt", "Lower-case twin.")
+    return graph
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+
+import main
+
+
+def _ids(prompts) -> list[str]:
+    return sorted(prompt["item_id"] for prompt in prompts)
+
+
+async def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_first_refresh_loads_every_page(graph):
+    graph.page_size = 2
+
+    async def scenario():
+        index = main.PromptIndex(graph.client(), refresh_seconds=60)
+        try:
+            await index.refresh()
+            return index, await index.get_by_id(" 11 "), await index.get_by_title("login prompt")
+        finally:
+            await index.client.aclose()
+
+    index, by_id, by_title = asyncio.run(scenario())
+
+    assert index.loaded and len(index) == 3
+    assert _ids(by_id) == ["1"]
+    assert _ids(by_title) == ["3"]
+    delta_pages = [request for request in graph.requests if request.url.path.endswith("/delta")]
+    assert len(delta_pages) == 2
+
+
+def test_delta_refresh_applies_adds_updates_and_deletes(graph):
+    async def scenario():
+        index = main.PromptIndex(graph.client(), refresh_seconds=60)
+        try:
+            await index.refresh()
+            graph.put("4", "14", "Reset Prompt")
+            graph.put("1", "11", "Sign-in Prompt")
+            graph.put("3", "12", "login prompt")
+            graph.delete("2")
+            await index.refresh()
+            return index, {
+                "11": await index.get_by_id("11"),
+                "12": await index.get_by_id("12"),
+                "13": await index.get_by_id("13"),
+                "14": await index.get_by_id("14"),
+                "Login Prompt": await index.get_by_title("Login Prompt"),
+                "Sign-in Prompt": await index.get_by_title("Sign-in Prompt"),
+                "Logout Prompt": await index.get_by_title("Logout Prompt"),
+            }
+        finally:
+            await index.client.aclose()
+
+    index, found = asyncio.run(scenario())
+
+    assert len(index) == 3
+    assert {key: _ids(prompts) for key, prompts in found.items()} == {
+        "11": ["1"],
+        "12": ["3"],
+        "13": [],
+        "14": ["4"],
+        "Login Prompt": [],
+        "Sign-in Prompt": ["1"],
+        "Logout Prompt": [],
+    }
+    # Emptied keys are dropped rather than left as empty buckets.
+    assert "13" not in index._by_prompt_id and "Logout Prompt" not in index._by_title
+    # The second refresh followed the delta link instead of re-reading the list.
+    delta_requests = [request for request in graph.requests if request.url.path.endswith("/delta")]
+    assert [request.url.params.get("token") for request in delta_requests] == [None, "3"]
+
+
+def test_prompts_sharing_an_id_are_tracked_per_item(graph):
+    graph.put("4", "11", "Login Prompt (copy)")
+
+    async def scenario():
+        index = main.PromptIndex(graph.client(), refresh_seconds=60)
+        try:
+            await index.refresh()
+            both = await index.get_by_id("11")
+            graph.delete("1")
+            await index.refresh()
+            return both, await index.get_by_id("11")
+        finally:
+            await index.client.aclose()
+
+    both, remaining = asyncio.run(scenario())
+
+    assert _ids(both) == ["1", "4"]
+    assert _ids(remaining) == ["4"]
+
+
+def test_expired_delta_link_resyncs_the_full_list(graph):
+    async def scenario():
+        index = main.PromptIndex(graph.client(), refresh_seconds=60)
+        try:
+            await index.refresh()
+            # Changes made while the link was expired never arrive as delta entries.
+            graph.delete("3")
+            graph.put("5", "15", "Welcome Prompt")
+            graph.expire_delta_links()
+            await index.refresh()
+            return index, await index.get_by_id("13"), await index.get_by_id("15")
+        finally:
+            await index.client.aclose()
+
+    index, deleted, added = asyncio.run(scenario())
+
+    assert deleted == [] and _ids(added) == ["5"]
+    assert sorted(index._items) == ["1", "2", "5"]
+    delta_requests = [request for request in graph.requests if request.url.path.endswith("/delta")]
+    assert [request.url.params.get("token") for request in delta_requests] == [None, "3", None]
+    assert index._delta_link.endswith(f"token={graph.version}")
+
+
+def test_lookups_before_the_first_load_query_graph(graph):
+    async def scenario():
+        index = main.PromptIndex(graph.client(), refresh_seconds=60)
+        try:
+            return index, await index.get_by_title("Logout Prompt")
+        finally:
+            await index.client.aclose()
+
+    index, prompts = asyncio.run(scenario())
+
+    assert not index.loaded
+    assert _ids(prompts) == ["2"]
+    assert graph.filters() == ["fields/Title eq 'Logout Prompt'"]
+
+
+def test_lifespan_starts_the_refresh_loop_and_cancels_it_on_shutdown(graph, monkeypatch):
+    client = graph.client()
+    index = main.PromptIndex(client, refresh_seconds=3600)
+    monkeypatch.setattr(main, "sharepoint", client)
+    monkeypatch.setattr(main, "prompt_index", index)
+
+    async def scenario():
+        async with main.lifespan(main.app):
+            await _wait_for(lambda: index.loaded)
+            task = index._task
+            # The loop is now sleeping until the next tick.
+            assert task is not None and not task.done()
+        return task
+
+    task = asyncio.run(scenario())
+
+    assert task.cancelled()
+    assert index._task is None
+    assert client._http is None
+
+
+def test_stop_cancels_a_refresh_in_flight(graph):
+    async def scenario():
+        graph.delta_gate = asyncio.Event()
+        index = main.PromptIndex(graph.client(), refresh_seconds=3600)
+        try:
+            index.start()
+            await _wait_for(lambda: any(request.url.path.endswith("/delta") for request in graph.requests))
+            task = index._task
+            await asyncio.wait_for(index.stop(), timeout=5)
+            return index, task
+        finally:
+            await index.client.aclose()
+
+    index, task = asyncio.run(scenario())
+
+    assert task.cancelled()
+    assert not index.loaded and index._task is None
+    # Another refresh can still take the lock afterwards.
+    assert not index._lock.locked()
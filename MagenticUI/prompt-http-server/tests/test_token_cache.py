@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+import main
+
+
+def _bearer_tokens(graph) -> list[str]:
+    return [
+        request.headers["Authorization"].removeprefix("Bearer ")
+        for request in graph.requests
+        if request.url.host == "graph.microsoft.com"
+    ]
+
+
+def test_concurrent_requests_share_one_token_request(graph):
+    graph.token_delay = 0.05
+
+    async def scenario():
+        client = graph.client()
+        try:
+            return await asyncio.gather(*(client._get_access_token() for _ in range(10)))
+        finally:
+            await client.aclose()
+
+    tokens = asyncio.run(scenario())
+
+    assert tokens == ["token-1"] * 10
+    assert graph.tokens_issued == 1
+
+
+def test_cached_token_is_reused_across_lookups(graph):
+    async def scenario():
+        client = graph.client()
+        try:
+            await asyncio.gather(*(client.get_prompts_by_id(prompt_id) for prompt_id in ("11", "12", "13")))
+            await client.get_prompts_by_title("Login Prompt")
+        finally:
+            await client.aclose()
+
+    asyncio.run(scenario())
+
+    assert graph.tokens_issued == 1
+    assert set(_bearer_tokens(graph)) == {"token-1"}
+
+
+@pytest.mark.parametrize(
+    ("expires_in", "tokens_issued"),
+    [
+        (main.TOKEN_REFRESH_MARGIN_SECONDS + 60, 1),
+        # Inside the refresh margin the token is treated as expired straight away.
+        (main.TOKEN_REFRESH_MARGIN_SECONDS, 2),
+    ],
+)
+def test_token_is_renewed_within_the_refresh_margin(graph, expires_in, tokens_issued):
+    graph.expires_in = expires_in
+
+    async def scenario():
+        client = graph.client()
+        try:
+            await client._get_access_token()
+            return await client._get_access_token()
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(scenario()) == f"token-{tokens_issued}"
+    assert graph.tokens_issued == tokens_issued
+
+
+def test_401_invalidates_the_token_and_retries_once(graph):
+    async def scenario():
+        client = graph.client()
+        try:
+            await client.get_prompts_by_id("11")
+            graph.revoked.add("token-1")
+            return await client.get_prompts_by_id("12")
+        finally:
+            await client.aclose()
+
+    prompts = asyncio.run(scenario())
+
+    assert [prompt["item_id"] for prompt in prompts] == ["2"]
+    assert graph.tokens_issued == 2
+    assert _bearer_tokens(graph)[-2:] == ["token-1", "token-2"]
+
+
+def test_401_after_the_retry_is_raised(graph):
+    async def scenario():
+        client = graph.client()
+        try:
+            await client._get_access_token()
+            graph.revoked.update({"token-1", "token-2"})
+            with pytest.raises(httpx.HTTPStatusError) as failure:
+                await client.get_prompts_by_id("11")
+            return failure.value.response.status_code
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(scenario()) == 401
+    assert graph.tokens_issued == 2
+    assert _bearer_tokens(graph) == ["token-1", "token-2"]
+
+
+def test_concurrent_401s_fetch_a_single_replacement(graph):
+    graph.token_delay = 0.05
+
+    async def scenario():
+        client = graph.client()
+        try:
+            await client.get_prompts_by_id("11")
+            graph.revoked.add("token-1")
+            return await asyncio.gather(*(client.get_prompts_by_id(prompt_id) for prompt_id in ("11", "12", "13")))
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(scenario())
+
+    assert [[prompt["item_id"] for prompt in prompts] for prompts in results] == [["1"], ["2"], ["3"]]
+    # A caller holding the already-replaced token must not discard the new one.
+    assert graph.tokens_issued == 2
@@ -66,6 +66,7 @@ class SharePointPromptClient:
         self._access_token: str | None = None
         self._site_id: str | None = None
         self._list_id: str | None = None
+        self._unfilterable_fields: set[str] = set()
 
     async def _get_access_token(self) -> str:
         if self._access_token:
@@ -90,7 +91,10 @@ class SharePointPromptClient:
         return self._access_token
 
     async def _graph_get(
-        self, path_or_url: str, params: dict[str, str] | None = None
+        self,
+        path_or_url: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
     ) -> dict[str, Any]:
         token = await self._get_access_token()
         url = (
@@ -98,12 +102,13 @@ class SharePointPromptClient:
             if path_or_url.startswith("https://")
             else f"{GRAPH_BASE_URL}{path_or_url}"
         )
-        headers = {
+        request_headers = {
             "Authorization": f"Bearer {token}",
             "Accept": "application/json",
+            **(headers or {}),
         }
         async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, headers=headers, params=params)
+            response = await client.get(url, headers=request_headers, params=params)
             response.raise_for_status()
             return response.json()
 
@@ -145,9 +150,7 @@ class SharePointPromptClient:
         self._list_id = matches[0]["id"]
         return self._list_id
 
-    async def _get_all_prompts(self) -> list[dict[str, Any]]:
-        list_id = await self._get_list_id()
-        site_id = await self._get_site_id()
+    def _fields_expand(self) -> str:
         select_fields = ",".join(
             {
                 self.settings.prompt_id_field,
@@ -155,9 +158,14 @@ class SharePointPromptClient:
                 self.settings.prompt_text_field,
             }
         )
+        return f"fields($select={select_fields})"
+
+    async def _get_all_prompts(self) -> list[dict[str, Any]]:
+        list_id = await self._get_list_id()
+        site_id = await self._get_site_id()
         path_or_url = f"/sites/{site_id}/lists/{list_id}/items"
         params: dict[str, str] | None = {
-            "$expand": f"fields($select={select_fields})",
+            "$expand": self._fields_expand(),
             "$top": "200",
         }
 
@@ -180,21 +188,56 @@ class SharePointPromptClient:
             "prompt_text": as_text(fields.get(self.settings.prompt_text_field)),
         }
 
+    async def _find_prompts(self, field: str, value: str) -> list[dict[str, Any]] | None:
+        """
+        Match field == value on the Graph side so only matching items are transferred.
+        Returns None when Graph rejects the filter (e.g. a non-indexed column on a large list,
+        or a non-text column), in which case the caller falls back to scanning the list.
+        """
+        if field in self._unfilterable_fields:
+            return None
+
+        list_id = await self._get_list_id()
+        site_id = await self._get_site_id()
+        path_or_url = f"/sites/{site_id}/lists/{list_id}/items"
+        params: dict[str, str] | None = {
+            "$expand": self._fields_expand(),
+            "$filter": f"fields/{field} eq '{odata_escape(value)}'",
+            "$top": "200",
+        }
+        # Lets Graph filter on columns that are not indexed. Lists above the 5000-item view
+        # threshold can still refuse it unless the column is indexed; that is the fallback case.
+        headers = {"Prefer": "HonorNonIndexedQueriesWarningMayFailRandomly"}
+
+        prompts: list[dict[str, Any]] = []
+        try:
+            while path_or_url:
+                payload = await self._graph_get(path_or_url, params, headers)
+                prompts.extend(self._normalize_item(item) for item in payload.get("value", []))
+                path_or_url = payload.get("@odata.nextLink")
+                params = None
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 400:
+                raise
+            self._unfilterable_fields.add(field)
+            return None
+
+        return prompts
+
     async def get_prompts_by_title(self, title: str) -> list[dict[str, Any]]:
         title_to_match = title.strip()
-        return [
-            prompt
-            for prompt in await self._get_all_prompts()
-            if prompt["title"] == title_to_match
-        ]
+        prompts = await self._find_prompts(self.settings.title_field, title_to_match)
+        if prompts is None:
+            prompts = await self._get_all_prompts()
+        # SharePoint compares case-insensitively; keep the exact-match semantics.
+        return [prompt for prompt in prompts if prompt["title"] == title_to_match]
 
     async def get_prompts_by_id(self, prompt_id: str) -> list[dict[str, Any]]:
         prompt_id_to_match = prompt_id.strip()
-        return [
-            prompt
-            for prompt in await self._get_all_prompts()
-            if prompt["prompt_id"] == prompt_id_to_match
-        ]
+        prompts = await self._find_prompts(self.settings.prompt_id_field, prompt_id_to_match)
+        if prompts is None:
+            prompts = await self._get_all_prompts()
+        return [prompt for prompt in prompts if prompt["prompt_id"] == prompt_id_to_match]
 
 
 def as_text(value: Any) -> str:
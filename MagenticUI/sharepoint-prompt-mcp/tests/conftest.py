@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import functools
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+# main.py reads its settings at import time.
+os.environ.update(
+    {
+        "AZURE_TENANT_ID": "tenant",
+        "AZURE_CLIENT_ID": "client",
+        "AZURE_CLIENT_SECRET": "secret",
+        "SHAREPOINT_SITE_URL": "https://contoso.sharepoint.com/sites/Prompts",
+        "SHAREPOINT_LIST_NAME": "Prompt List",
+    }
+)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import main  # noqa: E402
+
+ITEMS_PATH = "/v1.0/sites/site-1/lists/list-1/items"
+
+
+class FakeGraph:
+    """Just enough of the token endpoint and Graph list API for the server, served through httpx.MockTransport."""
+
+    def __init__(self) -> None:
+        self.items: dict[str, dict[str, Any]] = {}
+        self.page_size = 200
+        self.unfilterable: set[str] = set()
+        # Graph answers a filter on an unfilterable column with this status.
+        self.filter_status = 400
+        self.requests: list[httpx.Request] = []
+
+    def put(self, item_id: str, prompt_id: str, title: str, text: str = "") -> None:
+        self.items[item_id] = {"PromptId": prompt_id, "Title": title, "PromptText": text}
+
+    def filters(self) -> list[str | None]:
+        """The $filter of each list-items request, None for unfiltered scans."""
+        return [request.url.params.get("$filter") for request in self.requests if request.url.path == ITEMS_PATH]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.host == "login.microsoftonline.com":
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+
+        path = request.url.path
+        if path == "/v1.0/sites/contoso.sharepoint.com:/sites/Prompts":
+            return httpx.Response(200, json={"id": "site-1"})
+        if path == "/v1.0/sites/site-1/lists":
+            return httpx.Response(200, json={"value": [{"id": "list-1", "displayName": "Prompt List"}]})
+        if path == ITEMS_PATH:
+            return self._list_items(request)
+        return httpx.Response(404, json={"error": {"code": "itemNotFound"}})
+
+    def _list_items(self, request: httpx.Request) -> httpx.Response:
+        item_ids = sorted(self.items)
+        odata_filter = request.url.params.get("$filter")
+        if odata_filter:
+            field, _, quoted = odata_filter.removeprefix("fields/").partition(" eq ")
+            if field in self.unfilterable:
+                return httpx.Response(self.filter_status, json={"error": {"code": "invalidRequest"}})
+            value = quoted[1:-1].replace("''", "'")
+            # SharePoint compares text case-insensitively.
+            item_ids = [item_id for item_id in item_ids if self.items[item_id][field].lower() == value.lower()]
+
+        skip = int(request.url.params.get("skip", 0))
+        end = skip + self.page_size
+        payload: dict[str, Any] = {
+            "value": [
+                {"id": item_id, "webUrl": f"https://contoso.sharepoint.com/{item_id}", "fields": self.items[item_id]}
+                for item_id in item_ids[skip:end]
+            ]
+        }
+        if end < len(item_ids):
+            payload["@odata.nextLink"] = str(request.url.copy_set_param("skip", str(end)))
+        return httpx.Response(200, json=payload)
+
+
+@pytest.fixture
+def graph(monkeypatch) -> FakeGraph:
+    graph = FakeGraph()
+    graph.put("1", "11", "Login Prompt", "Log in.")
+    graph.put("2", "12", "Logout Prompt", "Log out.")
+    graph.put("3", "13", "login prompt", "Lower-case twin.")
+    # The server opens a client per request; route every one of them to the fake.
+    monkeypatch.setattr(
+        main.httpx,
+        "AsyncClient",
+        functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(graph.handle)),
+    )
+    return graph
+
+
+@pytest.fixture
+def sharepoint(graph) -> main.SharePointPromptClient:
+    return main.SharePointPromptClient(main.settings)
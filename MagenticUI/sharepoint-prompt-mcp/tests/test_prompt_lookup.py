@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+
+def test_lookup_filters_on_graph_and_keeps_exact_match(graph, sharepoint):
+    prompts = asyncio.run(sharepoint.get_prompts_by_title(" Login Prompt "))
+
+    # Graph matched both casings; only the exact title is returned.
+    assert prompts == [
+        {
+            "item_id": "1",
+            "web_url": "https://contoso.sharepoint.com/1",
+            "prompt_id": "11",
+            "title": "Login Prompt",
+            "prompt_text": "Log in.",
+        }
+    ]
+    assert graph.filters() == ["fields/Title eq 'Login Prompt'"]
+    filtered = next(request for request in graph.requests if request.url.path.endswith("/list-1/items"))
+    assert filtered.headers["Prefer"] == "HonorNonIndexedQueriesWarningMayFailRandomly"
+
+
+def test_rejected_filter_falls_back_to_scanning_the_list(graph, sharepoint):
+    graph.unfilterable.add("PromptId")
+    graph.page_size = 1
+
+    async def scenario():
+        return (
+            await sharepoint.get_prompts_by_id("12"),
+            await sharepoint.get_prompts_by_id("13"),
+            await sharepoint.get_prompts_by_title("Logout Prompt"),
+        )
+
+    first, second, by_title = asyncio.run(scenario())
+
+    assert [prompt["item_id"] for prompt in first] == ["2"]
+    assert [prompt["item_id"] for prompt in second] == ["3"]
+    assert [prompt["item_id"] for prompt in by_title] == ["2"]
+    # The 400 is remembered: the second id lookup scans without retrying the filter,
+    # and other columns are still filtered on Graph.
+    assert graph.filters() == [
+        "fields/PromptId eq '12'",
+        None, None, None,
+        None, None, None,
+        "fields/Title eq 'Logout Prompt'",
+    ]
+
+
+def test_other_graph_errors_are_not_swallowed(graph, sharepoint):
+    graph.unfilterable.add("PromptId")
+    graph.filter_status = 503
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(sharepoint.get_prompts_by_id("12"))
+    # Only a 400 marks the column unfilterable; the next lookup tries the filter again.
+    assert sharepoint._unfilterable_fields == set()